@@ -4,6 +4,8 @@ from redbaron.redbaron import *
 from redbaron.utils import *
 from redbaron.base_nodes import *
 from redbaron.nodes import *
+from redbaron.parallel import *
+from redbaron.cache import *
 
 from redbaron import nodes
 
@@ -5,20 +5,25 @@ import os
 import sys
 import ast
 import inspect
+import bisect
+import tempfile
 import itertools
 
-from fnmatch import fnmatch
+from fnmatch import translate as fnmatch_translate
+from contextlib import contextmanager
+from collections import OrderedDict
 
 import baron
 import baron.path
-from baron.utils import python_version, string_instance
+import baron.render
+from baron.utils import python_version, string_instance, split_on_newlines, is_newline
 from baron.render import nodes_rendering_order
 
 import redbaron
 
 from redbaron.utils import redbaron_classname_to_baron_type, baron_type_to_redbaron_classname, log, in_a_shell, indent, \
     truncate
-from redbaron.private_config import runned_from_ipython
+from redbaron.private_config import runned_from_ipython, compact_nodes, fragment_cache_size
 from redbaron.syntax_highlight import help_highlight, python_highlight, python_html_highlight
 
 if python_version == 3:
@@ -42,6 +47,702 @@ def display_property_atttributeerror_exceptions(function):
     return wrapper
 
 
+def is_rendered(value):
+    """
+    Tell if a value used as a rendering condition in nodes_rendering_order
+    allows the dependent key to be rendered, the same way baron does it on
+    the fst.
+    """
+    if isinstance(value, ProxyList):
+        value = value.node_list
+
+    if isinstance(value, Node):
+        # Node defines __len__, but as fst it is a non empty dict
+        return True
+
+    return bool(value)
+
+
+def nodes_of(value):
+    """
+    Return the nodes held by an attribute value: a node, a node list, a proxy
+    list or a plain list of them.
+    """
+    if isinstance(value, Node):
+        return [value]
+    if isinstance(value, ProxyList):
+        return value.node_list.data
+    if isinstance(value, NodeList):
+        return value.data
+    if isinstance(value, (list, tuple)):
+        return value
+    return []
+
+
+def iter_subtree(nodes):
+    """
+    Iterate over the given nodes and all their descendants (in no particular
+    order). The lists that a lazy construction left as fst aren't built, their
+    nodes are skipped.
+    """
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, Node):
+            continue
+
+        yield node
+
+        for key in node._dict_keys:
+            stack.append(getattr(node, key))
+        for key in node._list_keys:
+            if node._unmaterialized(key) is None:
+                stack.extend(nodes_of(getattr(node, key)))
+
+
+def build_positions(nodes):
+    """
+    Return the positions of nodes by id: a dict of the first position of
+    every node and a dict of the last position of the nodes present several
+    times.
+    """
+    first = {}
+    last = {}
+    for position, node in enumerate(nodes):
+        if id(node) in first:
+            last[id(node)] = position
+        else:
+            first[id(node)] = position
+    return first, last
+
+
+def copy_fst(fst):
+    """
+    Copy a fst (nested dicts and lists of strings, booleans and numbers),
+    faster than copy.deepcopy.
+    """
+    if type(fst) is dict:
+        return dict([(key, copy_fst(value)) for key, value in fst.items()])
+    if type(fst) is list:
+        return [copy_fst(x) for x in fst]
+    return fst
+
+
+def fst_as_built(fst):
+    """
+    Return the fst that the nodes built from a fst node would give back (see
+    Node._generate_fst) without building them: only the keys of the type and
+    no node is None but an empty dict.
+    """
+    plan = get_construction_plan(fst["type"])
+    to_return = {}
+    for key in plan.str_keys:
+        to_return[key] = fst[key]
+    for key in plan.list_keys:
+        to_return[key] = [fst_as_built(x) for x in fst[key]]
+    for key in plan.dict_keys:
+        to_return[key] = fst_as_built(fst[key]) if fst[key] else {}
+    if fst["type"] == "int":
+        # see IntNode.fst
+        to_return["section"] = "number"
+    return to_return
+
+
+def render_fst_to(fst, write):
+    """
+    Render a fst node or a list of them by calling write() on every string
+    fragment, like Node._render_to does on the nodes (baron.dumps gives the
+    same result, more slowly).
+    """
+    if type(fst) is list:
+        for node in fst:
+            render_fst_to(node, write)
+        return
+
+    for kind, key, dependent in nodes_rendering_order[fst["type"]]:
+        if not dependent:
+            continue
+
+        if dependent is not True:
+            if isinstance(dependent, string_instance):
+                if not fst.get(dependent):
+                    continue
+            elif not all(fst.get(x) for x in dependent):
+                continue
+
+        if kind == "constant":
+            write(key)
+
+        elif kind == "string":
+            write(fst[key])
+
+        elif kind == "key":
+            if fst[key]:
+                render_fst_to(fst[key], write)
+
+        elif kind in ("list", "formatting"):
+            for node in fst[key]:
+                render_fst_to(node, write)
+
+
+def fst_types_mask(fst):
+    """
+    Return the bitmask of the classes (see NodeType) of the nodes of a fst, a
+    node or a list of them, without building them.
+    """
+    types = set()
+    stack = [fst]
+    while stack:
+        value = stack.pop()
+        if type(value) is list:
+            stack.extend(value)
+        elif value:
+            types.add(value["type"])
+            plan = get_construction_plan(value["type"])
+            for key in plan.list_keys:
+                stack.extend(value[key])
+            for key in plan.dict_keys:
+                stack.append(value[key])
+
+    mask = 0
+    for node_type in types:
+        mask |= node_class_of(node_type)._type_bit
+    return mask
+
+
+class FragmentCache(object):
+    """
+    LRU cache of the fst of the fragments parsed by parse_fragment, by
+    source: the template filled with the string, so the same string given to
+    different templates gives different entries. hits and misses count the
+    lookups. A maxsize of 0 disables the cache.
+
+    Only the sources of at most max_length characters are cached: the small
+    pieces of code that are set again and again, not whole code blocks, which
+    would keep a lot of memory and pay a copy of their fst for nothing.
+
+    The fst stored are never given out, only copies of them.
+    """
+
+    def __init__(self, maxsize, max_length=200):
+        self.maxsize = maxsize
+        self.max_length = max_length
+        self.hits = 0
+        self.misses = 0
+        self._fragments = OrderedDict()
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def __repr__(self):
+        return "<FragmentCache %d/%d, hits=%d, misses=%d>" % (len(self), self.maxsize, self.hits, self.misses)
+
+    def accepts(self, source):
+        return self.maxsize > 0 and len(source) <= self.max_length
+
+    def get(self, source):
+        if not self.accepts(source):
+            return None
+
+        fst = self._fragments.pop(source, None)
+        if fst is None:
+            self.misses += 1
+            return None
+
+        # move it to the end, the most recently used one
+        self._fragments[source] = fst
+        self.hits += 1
+        return fst
+
+    def add(self, source, fst):
+        if not self.accepts(source):
+            return
+
+        self._fragments[source] = fst
+        while len(self._fragments) > self.maxsize:
+            self._fragments.popitem(last=False)
+
+    def resize(self, maxsize):
+        """
+        Change the maximum number of fragments kept, 0 disables the cache.
+        """
+        self.maxsize = maxsize
+        while len(self._fragments) > self.maxsize:
+            self._fragments.popitem(last=False)
+
+    def clear(self):
+        self._fragments.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+fragment_cache = FragmentCache(fragment_cache_size)
+
+# source -> fst of the fragments parsed during a bulk_setattr(), see
+# parse_fragment
+_shared_fragments = None
+
+# the versions given to the trees, see GenericNodesUtils._get_tree_version
+_tree_versions = itertools.count(1)
+
+
+def parse_fragment(source):
+    """
+    Parse a piece of code built to convert a string into nodes (a template
+    like "a = %s" filled with the string). This is the same as baron.parse
+    except that the fst of the recently parsed small sources are kept in
+    fragment_cache, and that during a bulk_setattr() each distinct source is
+    only parsed once. Every call gets its own copy of the fst.
+    """
+    fst = None
+    if _shared_fragments is not None:
+        fst = _shared_fragments.get(source)
+
+    if fst is None:
+        fst = fragment_cache.get(source)
+
+    if fst is None:
+        fst = baron.parse(source)
+        fragment_cache.add(source, fst)
+
+        if _shared_fragments is None and not fragment_cache.accepts(source):
+            # kept nowhere, no need to copy it
+            return fst
+
+    if _shared_fragments is not None:
+        _shared_fragments[source] = fst
+
+    return copy_fst(fst)
+
+
+def bulk_setattr(edits):
+    """
+    Do setattr(node, attribute, value) for every (node, attribute, value) of
+    edits, the values being strings of code most of the time, but parse the
+    pieces of code built from those strings only once: a codemod setting the
+    same string (like "None" or "self") on many nodes only pays one parse.
+    """
+    global _shared_fragments
+
+    outermost = _shared_fragments is None
+    if outermost:
+        _shared_fragments = {}
+
+    try:
+        for node, attribute, value in edits:
+            setattr(node, attribute, value)
+    finally:
+        if outermost:
+            _shared_fragments = None
+
+
+class TypeIndex(object):
+    """
+    Index of the nodes of a tree by node class, kept up to date on every
+    modification of the tree. It is used by find/find_all of the root when
+    the identifier is a plain node name: only the nodes of the matching
+    classes are tested instead of walking the whole tree.
+
+    The bodies that a lazy construction left as fst aren't indexed until they
+    are built: a query builds the ones that can hold the nodes it is looking
+    for (see Node._subtree_types), the others stay as fst.
+    """
+
+    def __init__(self, node_list):
+        # class -> {node: number of times the node is in the tree}
+        self.nodes_by_class = {}
+        # per class list of the nodes in rendering order, computed on demand
+        self.ordered = {}
+        # node -> {key of a list left as fst: mask of the classes in it}
+        self.unbuilt = {}
+        self.update(new=node_list.data)
+
+    def update(self, old=(), new=()):
+        self.ordered.clear()
+
+        # a node can be referenced at several places of a tree (this happens
+        # with the endl nodes of the root), so this works with counts
+        counts = {}
+        for node in old:
+            counts[id(node)] = counts.get(id(node), 0) - 1
+        for node in new:
+            counts[id(node)] = counts.get(id(node), 0) + 1
+
+        for node in old:
+            while counts[id(node)] < 0:
+                counts[id(node)] += 1
+                for i in iter_subtree([node]):
+                    nodes = self.nodes_by_class.get(i.__class__, {})
+                    if nodes.get(i, 0) > 1:
+                        nodes[i] -= 1
+                    else:
+                        nodes.pop(i, None)
+                        self.unbuilt.pop(i, None)
+
+        for node in new:
+            while counts[id(node)] > 0:
+                counts[id(node)] -= 1
+                for i in iter_subtree([node]):
+                    nodes = self.nodes_by_class.setdefault(i.__class__, {})
+                    nodes[i] = nodes.get(i, 0) + 1
+                    if i._lazy_fst is not None:
+                        self.unbuilt[i] = dict((key, fst_types_mask(fst)) for key, fst in i._lazy_fst.items())
+
+    def built(self, node, key):
+        """
+        To be called when the list attribute key of node, left as fst by a
+        lazy construction, has been built: its nodes are added to the index.
+        """
+        keys = self.unbuilt.get(node)
+        if keys is None or keys.pop(key, None) is None:
+            return
+        if not keys:
+            del self.unbuilt[node]
+        self.update(new=nodes_of(getattr(node, key)))
+
+    def build(self, mask):
+        """
+        Build the lists left as fst that can hold nodes of the classes of
+        mask (see NodeType).
+        """
+        while True:
+            matching = [(node, key) for node, keys in self.unbuilt.items()
+                        for key, key_mask in keys.items() if key_mask & mask]
+            if not matching:
+                return
+            for node, key in matching:
+                if node._unmaterialized(key) is not None:
+                    # calls built()
+                    node._materialize(key)
+                else:
+                    self.built(node, key)
+
+    def candidates(self, query):
+        """
+        Return the nodes whose class can match query in rendering order, or
+        None if the index can't answer (the query identifier isn't a plain node
+        name or some nodes are referenced several times in the tree).
+        """
+        if not isinstance(query, Query):
+            query = Query(query)
+
+        if not query.is_plain_identifier():
+            return None
+
+        classes = classes_of_identifier(query.identifier)
+        if not classes:
+            return None
+
+        if self.unbuilt:
+            self.build(query.types_mask())
+
+        result = []
+        for klass in classes:
+            nodes = self.ordered_nodes(klass)
+            if nodes is None:
+                return None
+            result.extend(nodes)
+
+        if len(classes) > 1:
+            positions = {}
+            result.sort(key=lambda x: rendering_order_key(x, positions))
+
+        return result
+
+    def ordered_nodes(self, klass):
+        if klass not in self.ordered:
+            nodes = self.nodes_by_class.get(klass, {})
+            if any(count > 1 for count in nodes.values()):
+                self.ordered[klass] = None
+            else:
+                positions = {}
+                self.ordered[klass] = sorted(nodes, key=lambda x: rendering_order_key(x, positions))
+
+        return self.ordered[klass]
+
+
+class PositionIndex(baron.render.RenderWalker):
+    """
+    Index of the positions of a rendered fst, built in one walk over it.
+
+    It records the (line, column) intervals of every piece of text with the
+    baron path rendering it, sorted, to find the path at a position with a
+    binary search, and the bounding box of every baron path of the tree. It
+    answers exactly like baron.path.position_to_path and
+    baron.path.path_to_bounding_box on the same fst, which walk the whole
+    tree at every call.
+    """
+
+    def __init__(self, fst):
+        super(PositionIndex, self).__init__()
+        # (line, column) where each piece of text starts, in rendering order,
+        # with the column where it ends (excluded) and its path
+        self.starts = []
+        self.ends = []
+        self.paths = []
+        # path -> (line, column) of its top left and bottom right corners
+        self.top_lefts = {}
+        self.bottom_rights = {}
+
+        self.current_path = ()
+        self.line, self.column = 1, 1
+        self.left_of_current = (1, 0)
+        self.walk(fst)
+
+    def path_at(self, position):
+        """
+        Return the baron path (a tuple) of what is rendered at position (line,
+        column), or None.
+        """
+        line, column = position[0], position[1]
+        i = bisect.bisect_right(self.starts, (line, column)) - 1
+        if i < 0 or self.starts[i][0] != line or column >= self.ends[i]:
+            return None
+        return self.paths[i]
+
+    def bounding_box(self, path):
+        """
+        Return the bounding box of the node at path (a list or a tuple), or
+        None if nothing is rendered at this path.
+        """
+        path = tuple(path)
+        top_left = self.top_lefts.get(path)
+        bottom_right = self.bottom_rights.get(path)
+        if not path and top_left is None and bottom_right is None:
+            return baron.path.BoundingBox(((1, 1), self.left_of_current))
+        if top_left is None:
+            return None
+        return baron.path.BoundingBox((top_left, bottom_right))
+
+    def before(self, key_type, item, render_key):
+        if render_key is not None:
+            self.current_path += (render_key,)
+
+        self.top_lefts[self.current_path] = (self.line, self.column)
+
+        if key_type in ("constant", "string"):
+            for text in split_on_newlines(item):
+                if is_newline(text):
+                    self.line, self.column = self.line + 1, 1
+                    self.left_of_current = (self.line, 0)
+                elif text:
+                    self.starts.append((self.line, self.column))
+                    self.ends.append(self.column + len(text))
+                    self.paths.append(self.current_path)
+                    self.column += len(text)
+                    self.left_of_current = (self.line, self.column - 1)
+
+    def after(self, key_type, item, render_key):
+        if self.current_path not in self.bottom_rights:
+            self.bottom_rights[self.current_path] = self.left_of_current
+
+        if render_key is not None:
+            self.current_path = self.current_path[:-1]
+
+
+_node_classes_list = []
+_identifiers_classes = {}
+
+
+def node_classes():
+    """
+    Return the list of the node classes of redbaron.
+    """
+    if not _node_classes_list:
+        for name in dir(redbaron.nodes):
+            klass = getattr(redbaron.nodes, name)
+            if isinstance(klass, type) and issubclass(klass, Node) and klass.__module__ == "redbaron.nodes":
+                _node_classes_list.append(klass)
+
+    return _node_classes_list
+
+
+def classes_of_identifier(identifier):
+    """
+    Return the list of node classes that answer to identifier.
+    """
+    if not _identifiers_classes:
+        for klass in node_classes():
+            for i in klass._identifiers:
+                _identifiers_classes.setdefault(i, []).append(klass)
+
+    return _identifiers_classes.get(identifier)
+
+
+def rendering_order_key(node, positions):
+    """
+    Return a key that sorts the nodes of a tree in rendering order, which is
+    the order in which find_iter visits them. positions is a cache of the
+    positions of the nodes in the lists of the tree, to share between the
+    calls done for one sort.
+    """
+    def position_in(node_list, node):
+        if id(node_list) not in positions:
+            positions[id(node_list)] = dict((id(x), i) for i, x in enumerate(node_list.data))
+        return positions[id(node_list)][id(node)]
+
+    key = []
+    current = node
+    while current.parent is not None:
+        parent = current.parent
+
+        if isinstance(parent, ProxyList):
+            key.append(position_in(parent.node_list, current))
+            break
+
+        if isinstance(parent, NodeList):
+            key.append(position_in(parent, current))
+            current = parent
+            continue
+
+        if isinstance(current, Node):
+            value = getattr(parent, current.on_attribute)
+            if value is not current:
+                key.append(position_in(value.node_list if isinstance(value, ProxyList) else value, current))
+
+        key.append(get_construction_plan(parent.type).render_positions[current.on_attribute])
+        current = parent
+
+    key.reverse()
+    return key
+
+
+def compile_attribute_test(query):
+    """
+    Turn a query value of find (a string, a "re:" or "g:" string, a compiled
+    regex, a list/tuple or a callable) into a function that tests an
+    attribute.
+    """
+    if isinstance(query, string_instance) and query.startswith("re:"):
+        return re.compile(query[3:]).match
+
+    if callable(query):
+        return query
+
+    if isinstance(query, string_instance) and query.startswith("g:"):
+        pattern = re.compile(fnmatch_translate(os.path.normcase(query[2:])))
+        return lambda attribute: pattern.match(os.path.normcase(attribute))
+
+    if isinstance(query, RE_PATTERN_FIELD):
+        return query.match
+
+    if isinstance(query, (list, tuple)):
+        return lambda attribute: attribute in query
+
+    return lambda attribute: attribute == query
+
+
+class Query(object):
+    """
+    A query of find/find_all compiled once.
+
+    Query(identifier, *args, **kwargs) takes the same arguments as .find()
+    and can be passed as identifier to .find(), .find_all() and .find_iter()
+    of any node, of as many trees as needed: the regexes and globs are
+    compiled once and the node classes that answer to the identifier are
+    only resolved once.
+    """
+
+    def __init__(self, identifier, *args, **kwargs):
+        if isinstance(identifier, string_instance) and not identifier.startswith("re:"):
+            identifier = identifier.lower()
+
+        self.identifier = identifier
+        self.identifier_test = compile_attribute_test(identifier)
+        self.plain_identifier = self.is_plain_identifier()
+        # class -> does it answer to the identifier, filled on demand
+        self.class_matches = {}
+        self.types_mask_cache = 0
+        self.types_mask_size = 0
+
+        self.default_test = None
+        if args and isinstance(args[0], (string_instance, RE_PATTERN_FIELD, list, tuple)):
+            self.default_test = compile_attribute_test(args[0])
+            args = args[1:]
+
+        self.callables = args
+        self.attribute_tests = [(key, compile_attribute_test(value)) for key, value in kwargs.items()]
+
+    @classmethod
+    def from_arguments(klass, identifier, args, kwargs):
+        if isinstance(identifier, Query):
+            if args or kwargs:
+                raise ValueError("arguments can't be added to an already compiled Query")
+            return identifier
+
+        return klass(identifier, *args, **kwargs)
+
+    def is_plain_identifier(self):
+        return isinstance(self.identifier, string_instance) and not self.identifier.startswith(("re:", "g:"))
+
+    # plain identifier -> (number of node classes, mask), shared by all the
+    # queries since find() builds a new query at each call
+    _plain_types_masks = {}
+
+    def types_mask(self):
+        """
+        Return the bitmask of the node classes (see NodeType) that answer to
+        the identifier of this query.
+        """
+        if self.types_mask_size != len(NodeType.node_classes):
+            # new node classes have been defined since the last computation
+            size, mask = Query._plain_types_masks.get(self.identifier, (None, 0)) if self.plain_identifier else (None, 0)
+
+            if size != len(NodeType.node_classes):
+                mask = 0
+                for klass in NodeType.node_classes:
+                    if self.match_class(klass):
+                        mask |= klass._type_bit
+                if self.plain_identifier:
+                    Query._plain_types_masks[self.identifier] = (len(NodeType.node_classes), mask)
+
+            self.types_mask_cache = mask
+            self.types_mask_size = len(NodeType.node_classes)
+        return self.types_mask_cache
+
+    @property
+    def classes(self):
+        """
+        The node classes that answer to the identifier of this query.
+        """
+        return frozenset(x for x in node_classes() if self.match_class(x))
+
+    def match_class(self, klass):
+        # NodeList doesn't have identifiers
+        identifiers = getattr(klass, "_identifiers", frozenset())
+
+        if self.plain_identifier:
+            return self.identifier in identifiers
+
+        matches = self.class_matches.get(klass)
+        if matches is None:
+            matches = self.class_matches[klass] = any(self.identifier_test(x) for x in identifiers)
+        return matches
+
+    def match(self, node):
+        if not self.match_class(node.__class__):
+            return False
+
+        if self.default_test is not None and not self.default_test(getattr(node, node._default_test_value)):
+            return False
+
+        for test in self.callables:
+            if not test(node):
+                return False
+
+        for key, test in self.attribute_tests:
+            if key not in node._str_keys and key not in node._list_keys and key not in node._dict_keys:
+                return False
+
+            if not test(getattr(node, key)):
+                return False
+
+        return True
+
+    def __repr__(self):
+        return "<%s %r>" % (self.__class__.__name__, self.identifier)
+
+
 class Path(object):
     """Holds the path to a FST node
 
@@ -59,14 +760,19 @@ class Path(object):
     def __init__(self, node):
         self.node = node
 
-        parent = node
+        # one step per level: the holder is looked up once and the key in it
+        # comes from caches (positions of the node lists, construction plan
+        # of the node types), so this is proportional to the depth of node
+        current = node
         path = []
-        while parent is not None:
-            key = Path.get_holder_on_attribute(parent)
+        while current is not None:
+            holder = Path.get_holder(current)
+            key = Path._key_in_holder(current, holder)
             if key is not None:
-                path.insert(0, key)
-            parent = Path.get_holder(parent)
+                path.append(key)
+            current = holder
 
+        path.reverse()
         self.path = path
 
     @classmethod
@@ -125,7 +831,10 @@ class Path(object):
 
     @classmethod
     def get_holder_on_attribute(class_, node):
-        parent = Path.get_holder(node)
+        return Path._key_in_holder(node, Path.get_holder(node))
+
+    @staticmethod
+    def _key_in_holder(node, parent):
         if parent is None:
             return None
 
@@ -140,16 +849,31 @@ class Path(object):
             pos = parent.index(item)
             return pos
 
+        # the keys of the parent are looked up in the construction plan of
+        # its type instead of scanning its rendering order, and only its
+        # real attributes are read: getattr on anything else is a find()
+        render_positions = get_construction_plan(parent.type).render_positions
+
         if isinstance(node, NodeList):
-            return next((key for (_, key, _) in parent._render() if
-                         getattr(parent, key, None) is node or getattr(getattr(parent, key, None), "node_list",
-                                                                       None) is node), None)
+            key = node.on_attribute
+            if key in render_positions and Path._holds(parent, key, node):
+                return key
 
-        to_return = next((key for (_, key, _) in parent._render() if key == node.on_attribute), None)
-        return to_return
+            return next((key for key in render_positions if Path._holds(parent, key, node)), None)
+
+        return node.on_attribute if node.on_attribute in render_positions else None
+
+    @staticmethod
+    def _holds(parent, key, node_list):
+        if key not in parent._str_keys and key not in parent._dict_keys and key not in parent._list_keys:
+            return False
+        value = getattr(parent, key)
+        return value is node_list or getattr(value, "node_list", None) is node_list
 
 
 class LiteralyEvaluable(object):
+    __slots__ = ()
+
     def to_python(self):
         try:
             return ast.literal_eval(self.dumps().strip())
@@ -164,11 +888,12 @@ class GenericNodesUtils(object):
     """
     Mixen top class for Node and NodeList that contains generic methods that are used by both.
     """
+    __slots__ = ()
 
     def _convert_input_to_node_object(self, value, parent, on_attribute, generic=False):
         if isinstance(value, string_instance):
             if generic:
-                return Node.from_fst(baron.parse(value)[0], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment(value)[0], parent=parent, on_attribute=on_attribute)
             else:
                 return self._string_to_node(value, parent=parent, on_attribute=on_attribute)
         elif isinstance(value, dict):
@@ -181,7 +906,7 @@ class GenericNodesUtils(object):
         raise NotImplementedError
 
     def _string_to_node(self, string, parent, on_attribute):
-        return Node.from_fst(baron.parse(string)[0], parent=parent, on_attribute=on_attribute)
+        return Node.from_fst(parse_fragment(string)[0], parent=parent, on_attribute=on_attribute)
 
     def _convert_input_to_node_object_list(self, value, parent, on_attribute):
         if isinstance(value, string_instance):
@@ -224,10 +949,45 @@ class GenericNodesUtils(object):
     @display_property_atttributeerror_exceptions
     def absolute_bounding_box(self):
         path = self.path().to_baron_path()
-        return baron.path.path_to_bounding_box(self.root.fst(), path)
+        return self.root._bounding_box_of_path(path)
+
+    def _bounding_box_of_path(self, path):
+        # the bounding box of the node at path in the tree of this node (its
+        # root), from the position index of the tree when there is one
+        position_index = self._get_position_index()
+        bounding_box = position_index.bounding_box(path) if position_index is not None else None
+        if bounding_box is None:
+            return baron.path.path_to_bounding_box(self.fst(), path)
+        return bounding_box
+
+    def _get_position_index(self):
+        """
+        Return the PositionIndex of the tree of this node, built on first use
+        and rebuilt after a modification of the tree, or None if the tree
+        doesn't have a node list as root.
+        """
+        root = self._get_render_root()
+        if not isinstance(root, NodeList) or root.parent is not None:
+            return None
+
+        if root._position_index is None or root._position_index[0] != root._tree_version:
+            root._position_index = (root._tree_version, PositionIndex(root.fst()))
+        return root._position_index[1]
 
     def find_by_position(self, position):
-        path = Path.from_baron_path(self, baron.path.position_to_path(self.fst(), position))
+        root = self._get_render_root()
+        if self is root or (isinstance(self, ProxyList) and self.node_list is root):
+            # positions in the whole tree
+            position_index = self._get_position_index()
+        else:
+            position_index = None
+
+        if position_index is not None:
+            path = position_index.path_at(position)
+        else:
+            path = baron.path.position_to_path(self.fst(), position)
+
+        path = Path.from_baron_path(self, path)
         return path.node if path else None
 
     def at(self, line_no):
@@ -245,7 +1005,7 @@ class GenericNodesUtils(object):
             return node
 
         elif node is not None and hasattr(node, 'next_rendered'):
-            return list(self._iter_in_rendering_order(node.next_rendered))[0]
+            return next(self._iter_in_rendering_order(node.next_rendered))
 
         elif node.parent is None:
             node = node.data[0][0]
@@ -258,7 +1018,169 @@ class GenericNodesUtils(object):
         return node
 
     def _string_to_node_list(self, string, parent, on_attribute):
-        return NodeList.from_fst(baron.parse(string), parent=parent, on_attribute=on_attribute)
+        return NodeList.from_fst(parse_fragment(string), parent=parent, on_attribute=on_attribute)
+
+    def dump_to(self, target, atomic=False, chunk_size=64 * 1024):
+        """
+        Write the source code of this node to target, a file object or a
+        path. The code is written in chunks of about chunk_size characters
+        while the tree is rendered instead of being built in memory first.
+
+        With atomic=True (target has to be a path) the code is written to a
+        temporary file in the same directory which is then renamed to target,
+        so target is never left half written.
+        """
+        if hasattr(target, "write"):
+            if atomic:
+                raise ValueError("atomic writing needs a path, not a file object")
+
+            self._write_chunks(target.write, chunk_size)
+            return
+
+        if not atomic:
+            with open(target, "w") as file_object:
+                self._write_chunks(file_object.write, chunk_size)
+            return
+
+        directory, name = os.path.split(os.path.abspath(target))
+        file_descriptor, temporary_path = tempfile.mkstemp(prefix="." + name + ".", suffix=".tmp", dir=directory)
+
+        try:
+            with os.fdopen(file_descriptor, "w") as file_object:
+                self._write_chunks(file_object.write, chunk_size)
+
+            # mkstemp creates the file readable by its owner only, give it
+            # the permissions the file would have had with a plain open()
+            if os.path.exists(target):
+                mode = os.stat(target).st_mode & 0o7777
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+            os.chmod(temporary_path, mode)
+
+            # os.rename doesn't overwrite existing files on windows
+            getattr(os, "replace", os.rename)(temporary_path, target)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    def _write_chunks(self, write, chunk_size):
+        chunk = []
+        chunk_length = [0]
+
+        def buffered_write(fragment):
+            chunk.append(fragment)
+            chunk_length[0] += len(fragment)
+            if chunk_length[0] >= chunk_size:
+                write("".join(chunk))
+                del chunk[:]
+                chunk_length[0] = 0
+
+        self._render_to(buffered_write)
+
+        if chunk:
+            write("".join(chunk))
+
+    def _invalidate_render_cache(self):
+        """
+        Drop the rendering (dumps/fst) and the summary of the node types
+        cached on this node and on all its ancestors. It has to be called after
+        every modification of the tree.
+
+        Return the root of the tree.
+        """
+        current = self
+        while True:
+            if isinstance(current, ProxyList):
+                current = current.node_list
+            object.__setattr__(current, "_dumps_cache", None)
+            object.__setattr__(current, "_fst_cache", None)
+            if isinstance(current, Node):
+                object.__setattr__(current, "_types_cache", None)
+                # the nodes of a list attribute have the node holding it as
+                # parent, the walk doesn't go through the list itself
+                in_list = current._get_held_list()
+                if in_list is not None:
+                    object.__setattr__(in_list, "_dumps_cache", None)
+                    object.__setattr__(in_list, "_fst_cache", None)
+            if current.parent is None:
+                if isinstance(current, NodeList):
+                    # invalidates the indentation cached on the nodes
+                    current._tree_version = next(_tree_versions)
+                return current
+            current = current.parent
+
+    def _get_render_root(self):
+        current = self
+        while current.parent is not None:
+            current = current.parent
+        if isinstance(current, ProxyList):
+            current = current.node_list
+        return current
+
+    def _get_root_type_index(self):
+        root = self._get_render_root()
+        return root._type_index if isinstance(root, NodeList) else None
+
+    def _get_tree_version(self):
+        """
+        Return the version of the tree of this node, which changes on every
+        modification of the tree, or None if it doesn't have a node list as
+        root (a node without parent).
+
+        Versions are unique among all the trees: a node moved to another tree
+        can't take a version stamped in its previous tree for one of the new
+        tree.
+        """
+        root = self._get_render_root()
+        if not isinstance(root, NodeList):
+            return None
+        if not root._tree_version:
+            root._tree_version = next(_tree_versions)
+        return root._tree_version
+
+    def _tree_modified(self, old=(), new=()):
+        """
+        To be called after a structural modification below this node: the
+        nodes of old (nodes, node lists or proxy lists) have been replaced by
+        the nodes of new.
+
+        Drop the cached renderings and keep the type index of the root up to
+        date.
+        """
+        root = self._invalidate_render_cache()
+        type_index = root._type_index if isinstance(root, NodeList) else None
+        if type_index is not None and self._is_attached():
+            type_index.update(nodes_of(old), nodes_of(new))
+
+    def _is_attached(self):
+        """
+        Tell if this node is really part of the tree of its root: nodes and
+        lists being built (by parse_code_block for example) already point to
+        their future parent while it doesn't hold them yet.
+        """
+        current = self
+        while current.parent is not None:
+            parent = current.parent
+
+            if isinstance(parent, ProxyList):
+                held = parent.node_list
+            elif isinstance(parent, Node) and current.on_attribute in parent._dict_keys:
+                held = getattr(parent, current.on_attribute)
+            elif isinstance(parent, Node) and current.on_attribute in parent._list_keys:
+                held = getattr(parent, current.on_attribute)
+                if isinstance(held, ProxyList):
+                    held = held.node_list
+            else:
+                held = parent
+
+            if held is not current and not (isinstance(held, NodeList) and any(x is current for x in held.data)):
+                return False
+
+            current = parent
+
+        return True
 
     def parse_decorators(self, string, parent, on_attribute):
         indentation = self.indentation
@@ -275,7 +1197,7 @@ class GenericNodesUtils(object):
         # it is inside a call and outside to detect the good '@' since @ will
         # probably be a new operator in python in the futur)
         string = re.sub(" *@", "@", string)
-        fst = baron.parse("%s\ndef a(): pass" % string.strip())[0]["decorators"]
+        fst = parse_fragment("%s\ndef a(): pass" % string.strip())[0]["decorators"]
         fst[-1]["indent"] = indentation
         result = NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
         if indentation:
@@ -293,12 +1215,20 @@ class GenericNodesUtils(object):
             current = current.parent
         return current
 
-    def _iter_in_rendering_order(self, node):
+    def _iter_in_rendering_order(self, node, reverse=False):
         if not isinstance(node, (Node, NodeList)):
             return
-        if not (isinstance(node, Node) and node.type == "endl"):
+        yield_node = not (isinstance(node, Node) and node.type == "endl")
+        if yield_node and not reverse:
             yield node
-        for kind, key, display in node._render():
+        items = node._render()
+        for i in self._iter_rendering_items(node, reversed(items) if reverse else items, reverse):
+            yield i
+        if yield_node and reverse:
+            yield node
+
+    def _iter_rendering_items(self, node, items, reverse=False):
+        for kind, key, display in items:
             if isinstance(display, string_instance) and not getattr(node, display):
                 continue
             if kind == "constant":
@@ -307,16 +1237,79 @@ class GenericNodesUtils(object):
                 if isinstance(getattr(node, key), string_instance):
                     yield node
             elif kind == "key":
-                for i in self._iter_in_rendering_order(getattr(node, key)):
+                for i in self._iter_in_rendering_order(getattr(node, key), reverse):
                     yield i
             elif kind in ("list", "formatting"):
                 target = getattr(node, key)
                 if isinstance(target, ProxyList):
                     target = target.node_list
-                for i in target:
-                    for j in self._iter_in_rendering_order(i):
+                for i in (reversed(target) if reverse else target):
+                    for j in self._iter_in_rendering_order(i, reverse):
                         yield j
 
+    def _locate_in_parent(self, last=False):
+        """
+        Return where this node is rendered in its parent: a tuple of the
+        parent, the position of the rendering item holding this node in
+        parent._render() (None if the parent is a node list), the node list
+        holding it (or None) and its position in this list (the last one if
+        last is True).
+
+        Return None if the parent doesn't render this node.
+        """
+        parent = self.parent
+        if isinstance(parent, ProxyList):
+            parent = parent.node_list
+
+        if isinstance(parent, NodeList):
+            position = parent._position_of(self, last)
+            return (parent, None, parent, position) if position is not None else None
+
+        if not isinstance(parent, Node):
+            return None
+
+        for number, (kind, key, display) in enumerate(parent._render()):
+            if key == self.on_attribute and kind in ("key", "list", "formatting"):
+                break
+        else:
+            return None
+
+        if isinstance(display, string_instance) and not getattr(parent, display):
+            return None
+
+        value = getattr(parent, key)
+        if kind == "key":
+            return (parent, number, None, None) if value is self else None
+
+        if isinstance(value, ProxyList):
+            value = value.node_list
+        position = value._position_of(self, last) if isinstance(value, NodeList) else None
+        return (parent, number, value, position) if position is not None else None
+
+    def _iter_rendered_around(self, location, reverse=False):
+        """
+        Iterate, in rendering order (backward if reverse is True), over what
+        the parent renders after (before) the node found at location, see
+        _locate_in_parent.
+        """
+        parent, number, in_list, position = location
+
+        if in_list is not None:
+            positions = range(position - 1, -1, -1) if reverse else range(position + 1, len(in_list.data))
+            for i in positions:
+                for j in self._iter_in_rendering_order(in_list.data[i], reverse):
+                    yield j
+
+        if number is None:
+            return
+
+        items = parent._render()
+        for i in self._iter_rendering_items(parent, reversed(items[:number]) if reverse else items[number + 1:], reverse):
+            yield i
+
+        if reverse and parent.type != "endl":
+            yield parent
+
 
 class NodeList(UserList, GenericNodesUtils):
     # NodeList doesn't have a previous nor a next
@@ -324,21 +1317,66 @@ class NodeList(UserList, GenericNodesUtils):
     next = None
     previous = None
 
+    _dumps_cache = None
+    _fst_cache = None
+    _type_index = None
+    _positions_cache = None
+    _position_index = None
+    _tree_version = 0
+
     def __init__(self, initlist=None, parent=None, on_attribute=None):
         super(NodeList, self).__init__(initlist)
         self.parent = parent
         self.on_attribute = on_attribute
 
     @classmethod
-    def from_fst(klass, node_list, parent=None, on_attribute=None):
-        return klass(map(lambda x: Node.from_fst(x, parent=parent, on_attribute=on_attribute), node_list),
+    def from_fst(klass, node_list, parent=None, on_attribute=None, lazy=False):
+        return klass([Node.from_fst(x, parent=parent, on_attribute=on_attribute, lazy=lazy) for x in node_list],
                      parent=parent, on_attribute=on_attribute)
 
+    @classmethod
+    def _of_clones(klass, node_list, parent, on_attribute):
+        """
+        Return a NodeList of copies of the nodes of node_list, see
+        Node._clone. It is built without going through __init__, there can be
+        a lot of them.
+        """
+        clone = klass.__new__(klass)
+        clone.data = [x._clone(parent, on_attribute) for x in node_list.data]
+        clone.parent = parent
+        clone.on_attribute = on_attribute
+        return clone
+
     def find(self, identifier, *args, **kwargs):
-        for i in self.data:
-            candidate = i.find(identifier, *args, **kwargs)
-            if candidate is not None:
-                return candidate
+        return next(self.find_iter(identifier, *args, **kwargs), None)
+
+    def _position_of(self, node, last=False):
+        """
+        Return the position of node (compared by identity) in this list, the
+        last one if last is True, or None if it isn't in it.
+
+        The positions are cached until the list is modified.
+        """
+        if self._positions_cache is not None:
+            first, duplicated = self._positions_cache
+            position = duplicated.get(id(node), first.get(id(node))) if last else first.get(id(node))
+            if position is not None and position < len(self.data) and self.data[position] is node:
+                return position
+
+        # unknown node or stale positions (.data has been modified directly)
+        self._positions_cache = build_positions(self.data)
+        first, duplicated = self._positions_cache
+        return duplicated.get(id(node), first.get(id(node))) if last else first.get(id(node))
+
+    def index(self, item, *args):
+        position = self._position_of(item) if not args else None
+        if position is None:
+            return self.data.index(item, *args)
+        return position
+
+    def _tree_modified(self, old=(), new=()):
+        self._positions_cache = None
+        super(NodeList, self)._tree_modified(old, new)
 
     def __getattr__(self, key):
         if key not in redbaron.ALL_IDENTIFIERS:
@@ -348,13 +1386,77 @@ class NodeList(UserList, GenericNodesUtils):
 
         return self.find(key)
 
+    def _snapshot(self):
+        # the previous content is only needed to update a type index
+        return self.data[:] if self._get_root_type_index() is not None else ()
+
     def __setitem__(self, key, value):
+        old = self._snapshot()
         self.data[key] = self._convert_input_to_node_object(value, parent=self.parent, on_attribute=self.on_attribute)
+        self._tree_modified(old, self.data)
+
+    def __delitem__(self, key):
+        old = self._snapshot()
+        super(NodeList, self).__delitem__(key)
+        self._tree_modified(old, self.data)
+
+    def __iadd__(self, other):
+        old = self._snapshot()
+        result = super(NodeList, self).__iadd__(other)
+        self._tree_modified(old, self.data)
+        return result
+
+    def __imul__(self, n):
+        old = self._snapshot()
+        result = super(NodeList, self).__imul__(n)
+        self._tree_modified(old, self.data)
+        return result
+
+    def append(self, item):
+        old = self._snapshot()
+        super(NodeList, self).append(item)
+        self._tree_modified(old, self.data)
+
+    def insert(self, i, item):
+        old = self._snapshot()
+        super(NodeList, self).insert(i, item)
+        self._tree_modified(old, self.data)
+
+    def pop(self, i=-1):
+        old = self._snapshot()
+        result = super(NodeList, self).pop(i)
+        self._tree_modified(old, self.data)
+        return result
+
+    def remove(self, item):
+        old = self._snapshot()
+        super(NodeList, self).remove(item)
+        self._tree_modified(old, self.data)
+
+    def reverse(self):
+        super(NodeList, self).reverse()
+        self._tree_modified()
+
+    def sort(self, *args, **kwargs):
+        super(NodeList, self).sort(*args, **kwargs)
+        self._tree_modified()
+
+    def extend(self, other):
+        old = self._snapshot()
+        super(NodeList, self).extend(other)
+        self._tree_modified(old, self.data)
 
     def find_iter(self, identifier, *args, **kwargs):
-        for node in self.data:
-            for matched_node in node.find_iter(identifier, *args, **kwargs):
-                yield matched_node
+        recursive = kwargs.get("recursive", True)
+        kwargs = dict((key, value) for key, value in kwargs.items() if key != "recursive")
+        query = Query.from_arguments(identifier, args, kwargs)
+
+        if self._type_index is not None and recursive:
+            candidates = self._type_index.candidates(query)
+            if candidates is not None:
+                return (node for node in candidates if query.match(node))
+
+        return (matched_node for node in self.data for matched_node in node._find_iter(query, recursive))
 
     def find_all(self, identifier, *args, **kwargs):
         return NodeList(list(self.find_iter(identifier, *args, **kwargs)))
@@ -370,10 +1472,25 @@ class NodeList(UserList, GenericNodesUtils):
         return Path(self)
 
     def fst(self):
-        return [x.fst() for x in self.data]
+        # see Node.fst, the result is cached and must not be modified
+        if self._fst_cache is None:
+            self._fst_cache = [x.fst() for x in self.data]
+        return self._fst_cache
 
     def dumps(self):
-        return baron.dumps(self.fst())
+        if self._dumps_cache is None:
+            fragments = []
+            self._render_to(fragments.append)
+            self._dumps_cache = "".join(fragments)
+        return self._dumps_cache
+
+    def _render_to(self, write):
+        if self._dumps_cache is not None:
+            write(self._dumps_cache)
+            return
+
+        for node in self.data:
+            node._render_to(write)
 
     def __repr__(self):
         if in_a_shell():
@@ -425,8 +1542,7 @@ class NodeList(UserList, GenericNodesUtils):
         return [x.__help__(deep=deep, with_formatting=with_formatting) for x in self.data]
 
     def copy(self):
-        # XXX not very optimised but at least very simple
-        return NodeList(map(Node.from_fst, self.fst()))
+        return NodeList._of_clones(self, parent=None, on_attribute=None)
 
     def next_generator(self):
         # similary, NodeList will never have next items
@@ -467,7 +1583,7 @@ class NodeList(UserList, GenericNodesUtils):
         if index >= len(self.data) or index < 0:
             raise IndexError()
         path = self.path().to_baron_path() + [index]
-        return baron.path.path_to_bounding_box(self.root.fst(), path)
+        return self.root._bounding_box_of_path(path)
 
     def increase_indentation(self, number_of_spaces):
         previous = None
@@ -479,55 +1595,262 @@ class NodeList(UserList, GenericNodesUtils):
                     done.add(previous)
                 previous = node
 
-    def decrease_indentation(self, number_of_spaces):
-        previous = None
-        done = set()
-        for i in self.data:
-            for node in i._generate_nodes_in_rendering_order():
-                if node.type != "endl" and previous is not None and previous.type == "endl" and previous not in done:
-                    previous.indent = previous.indent[number_of_spaces:]
-                    done.add(previous)
-                previous = node
+    def decrease_indentation(self, number_of_spaces):
+        previous = None
+        done = set()
+        for i in self.data:
+            for node in i._generate_nodes_in_rendering_order():
+                if node.type != "endl" and previous is not None and previous.type == "endl" and previous not in done:
+                    previous.indent = previous.indent[number_of_spaces:]
+                    done.add(previous)
+                previous = node
+
+
+class ConstructionPlan(object):
+    """
+    Precompiled description of how to build a node of a given baron type.
+
+    It is computed once per type from baron's nodes_rendering_order: steps
+    is the list of (kind, key) to fill, kind being normalised to "key",
+    "string" or "list", and the *_keys lists are the tables that every
+    instance of the type shares. render_positions gives the position of each
+    key in the rendering order.
+    """
+
+    def __init__(self, node_type):
+        self.type = node_type
+        self.steps = []
+        self.str_keys = ["type"]
+        self.list_keys = []
+        self.dict_keys = []
+        self.render_positions = {}
+
+        for position, (kind, key, _) in enumerate(nodes_rendering_order[node_type]):
+            if kind == "constant":
+                continue
+
+            self.render_positions.setdefault(key, position)
+
+            if kind == "key":
+                self.steps.append(("key", key))
+                self.dict_keys.append(key)
+
+            elif kind in ("bool", "string"):
+                self.steps.append(("string", key))
+                self.str_keys.append(key)
+
+            elif kind in ("list", "formatting"):
+                self.steps.append(("list", key))
+                self.list_keys.append(key)
+
+            else:
+                raise Exception(str((node_type, kind, key)))
+
+
+_construction_plans = {}
+_node_classes = {}
+
+
+def get_construction_plan(node_type):
+    plan = _construction_plans.get(node_type)
+    if plan is None:
+        plan = _construction_plans[node_type] = ConstructionPlan(node_type)
+    return plan
+
+
+def node_class_of(node_type):
+    """
+    Return the node class of redbaron for a baron type.
+    """
+    node_class = _node_classes.get(node_type)
+    if node_class is None:
+        node_class = _node_classes[node_type] = getattr(redbaron.nodes, baron_type_to_redbaron_classname(node_type))
+    return node_class
+
+
+class NodeType(type):
+    """
+    Metaclass of the nodes.
+
+    In compact mode (see redbaron.private_config.compact_nodes) it gives
+    __slots__ to every node class defined by redbaron, generated from the
+    keys of its type in baron's nodes_rendering_order, so nodes don't carry
+    a __dict__ anymore.
+
+    It also computes once per class the frozenset of the identifiers that
+    find() accepts for this class (see Node.generate_identifiers) and gives
+    every node class its own bit, used to summarize the node types present in
+    a subtree (see Node._subtree_types).
+    """
+
+    node_classes = []
+
+    def __new__(metaclass, name, bases, attributes):
+        if compact_nodes and "__slots__" not in attributes and \
+                attributes.get("__module__") in ("redbaron.base_nodes", "redbaron.nodes"):
+            attributes["__slots__"] = metaclass.generate_slots(name, bases)
+
+        return super(NodeType, metaclass).__new__(metaclass, name, bases, attributes)
+
+    def __init__(klass, name, bases, attributes):
+        super(NodeType, klass).__init__(name, bases, attributes)
+        if hasattr(klass, "_other_identifiers"):
+            klass._identifiers = NodeType.generate_identifiers_set(klass)
+            klass._type_bit = 1 << len(NodeType.node_classes)
+            NodeType.node_classes.append(klass)
+
+    @staticmethod
+    def generate_identifiers_set(klass):
+        baron_type = redbaron_classname_to_baron_type(klass.__name__)
+        return frozenset(map(lambda x: x.lower(), [
+            baron_type,
+            klass.__name__,
+            klass.__name__.replace("Node", ""),
+            baron_type + "_"
+        ] + klass._other_identifiers))
+
+    @staticmethod
+    def generate_slots(name, bases):
+        node_type = redbaron_classname_to_baron_type(name)
+        if node_type not in nodes_rendering_order:
+            # abstract classes like CodeBlockNode
+            return ()
 
+        inherited = set()
+        for base in bases:
+            for klass in base.__mro__:
+                inherited.update(klass.__dict__.get("__slots__", ()))
 
-class Node(GenericNodesUtils):
-    _other_identifiers = []
-    _default_test_value = "value"
+        plan = get_construction_plan(node_type)
+        return tuple(key for key in plan.str_keys + plan.list_keys + plan.dict_keys if key not in inherited)
 
-    def __init__(self, fst, parent=None, on_attribute=None):
-        self.init = True
-        self.parent = parent
-        self.on_attribute = on_attribute
-        self._str_keys = ["type"]
-        self._list_keys = []
-        self._dict_keys = []
-        self.type = fst["type"]
 
-        for kind, key, _ in filter(lambda x: x[0] != "constant", self._render()):
+_NodeBase = NodeType("_NodeBase", (GenericNodesUtils,), {"__slots__": ()})
+
+
+class Node(_NodeBase):
+    if compact_nodes:
+        __slots__ = ("init", "parent", "on_attribute", "type", "_dumps_cache", "_fst_cache", "_types_cache",
+                     "_indentation_cache", "_lazy_fst")
+    else:
+        _dumps_cache = None
+        _fst_cache = None
+        _types_cache = None
+        _indentation_cache = None
+        _lazy_fst = None
+
+    _other_identifiers = []
+    _default_test_value = "value"
+    _construction_plan = None
+    # list attributes that a lazy construction leaves as fst until they are
+    # accessed, see _materialize
+    _lazy_keys = ()
+
+    def __init__(self, fst, parent=None, on_attribute=None, lazy=False):
+        # attributes are set with object.__setattr__ during the
+        # construction: there is nothing to convert, the values are coming
+        # straight from baron
+        object.__setattr__(self, "init", True)
+        object.__setattr__(self, "parent", parent)
+        object.__setattr__(self, "on_attribute", on_attribute)
+        object.__setattr__(self, "type", fst["type"])
+        if compact_nodes:
+            # slots can't have a class level default
+            object.__setattr__(self, "_dumps_cache", None)
+            object.__setattr__(self, "_fst_cache", None)
+            object.__setattr__(self, "_types_cache", None)
+            object.__setattr__(self, "_indentation_cache", None)
+            object.__setattr__(self, "_lazy_fst", None)
+
+        plan = self._get_construction_plan(fst["type"])
+        if self._construction_plan is not plan:
+            object.__setattr__(self, "_str_keys", plan.str_keys)
+            object.__setattr__(self, "_list_keys", plan.list_keys)
+            object.__setattr__(self, "_dict_keys", plan.dict_keys)
+
+        for kind, key in plan.steps:
             if kind == "key":
                 if fst[key]:
-                    setattr(self, key, Node.from_fst(fst[key], parent=self, on_attribute=key))
+                    object.__setattr__(self, key, Node.from_fst(fst[key], parent=self, on_attribute=key, lazy=lazy))
                 else:
-                    setattr(self, key, None)
-                self._dict_keys.append(key)
+                    object.__setattr__(self, key, None)
 
-            elif kind in ("bool", "string"):
-                setattr(self, key, fst[key])
-                self._str_keys.append(key)
+            elif kind == "string":
+                object.__setattr__(self, key, fst[key])
 
-            elif kind in ("list", "formatting"):
-                setattr(self, key, NodeList.from_fst(fst[key], parent=self, on_attribute=key))
-                self._list_keys.append(key)
+            elif lazy and key in self._lazy_keys:
+                # the attribute stays unset, __getattr__ builds it
+                if self._lazy_fst is None:
+                    object.__setattr__(self, "_lazy_fst", {})
+                self._lazy_fst[key] = fst[key]
 
             else:
-                raise Exception(str((fst["type"], kind, key)))
+                # lists still go through setattr so subclasses can wrap them
+                # in their proxy lists
+                setattr(self, key, NodeList.from_fst(fst[key], parent=self, on_attribute=key, lazy=lazy))
+
+        object.__setattr__(self, "init", False)
 
-        self.init = False
+    @classmethod
+    def _get_construction_plan(klass, node_type):
+        """
+        Return the construction plan for node_type and bind its key tables
+        (_str_keys, _list_keys, _dict_keys) to the class the first time it is
+        used.
+
+        The tables are only bound to the class that matches node_type, nodes
+        built with a foreign type (for example a DotNode holding an "endl")
+        reference the tables of the plan on the instance instead.
+        """
+        plan = klass.__dict__.get("_construction_plan")
+        if plan is not None and plan.type == node_type:
+            return plan
+
+        plan = get_construction_plan(node_type)
+
+        if "_construction_plan" not in klass.__dict__ and redbaron_classname_to_baron_type(klass.__name__) == node_type:
+            klass._construction_plan = plan
+            klass._str_keys = plan.str_keys
+            klass._list_keys = plan.list_keys
+            klass._dict_keys = plan.dict_keys
+
+        return plan
 
     @classmethod
-    def from_fst(klass, node, parent=None, on_attribute=None):
-        class_name = baron_type_to_redbaron_classname(node["type"])
-        return getattr(redbaron.nodes, class_name)(node, parent=parent, on_attribute=on_attribute)
+    def from_fst(klass, node, parent=None, on_attribute=None, lazy=False):
+        node_class = _node_classes.get(node["type"])
+        if node_class is None:
+            node_class = node_class_of(node["type"])
+        return node_class(node, parent=parent, on_attribute=on_attribute, lazy=lazy)
+
+    def _unmaterialized(self, key):
+        """
+        Return the fst of the list attribute key if a lazy construction left
+        it unbuilt, None otherwise.
+        """
+        if self._lazy_fst is None:
+            return None
+        return self._lazy_fst.get(key)
+
+    def _materialize(self, key):
+        """
+        Build the list attribute key that a lazy construction left as fst
+        (its own lists are left as fst in turn).
+        """
+        lazy_fst = dict(self._lazy_fst)
+        fst = lazy_fst.pop(key)
+        # the dict is replaced, not modified: the copies of this node share it
+        object.__setattr__(self, "_lazy_fst", lazy_fst or None)
+
+        init = self.init
+        object.__setattr__(self, "init", True)
+        setattr(self, key, NodeList.from_fst(fst, parent=self, on_attribute=key, lazy=True))
+        object.__setattr__(self, "init", init)
+
+        type_index = self._get_root_type_index()
+        if type_index is not None:
+            type_index.built(self, key)
+        return getattr(self, key)
 
     @property
     @display_property_atttributeerror_exceptions
@@ -537,8 +1860,11 @@ class Node(GenericNodesUtils):
         if in_list is None:
             return None
 
-        next_node = list(itertools.dropwhile(lambda x: x is not self, in_list))[1:]
-        return next_node[0] if next_node else None
+        position = in_list._position_of(self)
+        if position is None or position + 1 >= len(in_list.data):
+            return None
+
+        return in_list.data[position + 1]
 
     @property
     @display_property_atttributeerror_exceptions
@@ -553,6 +1879,53 @@ class Node(GenericNodesUtils):
     @property
     @display_property_atttributeerror_exceptions
     def next_rendered(self):
+        render = self._render()
+
+        # positions of the rendering items that render this node itself, -1
+        # for the node yielded before its items
+        own_renderings = [] if self.type == "endl" else [-1]
+        for number, (kind, key, display) in enumerate(render):
+            if isinstance(display, string_instance) and not getattr(self, display):
+                continue
+            if kind == "constant" or (kind == "string" and isinstance(getattr(self, key), string_instance)):
+                own_renderings.append(number)
+
+        if not own_renderings:
+            return self._next_rendered_by_walk()
+
+        # after the last time this node is rendered, its children can follow
+        following = next(self._iter_rendering_items(self, render[own_renderings[-1] + 1:]), None)
+        if following is not None:
+            return following
+
+        location = self._locate_in_parent(last=True)
+        if location is None:
+            return self._next_rendered_by_walk()
+
+        following = next(self._iter_rendered_around(location), None)
+        if following is not None:
+            return following
+
+        # this node ends the rendering of its parent: what follows an earlier
+        # rendering of this node is used then
+        for number in reversed(own_renderings[:-1]):
+            following = next((x for x in self._iter_rendering_items(self, render[number + 1:]) if x is not self), None)
+            if following is not None:
+                return following
+
+        target = location[0]
+        while target.parent is not None:
+            location = target._locate_in_parent(last=True)
+            if location is None:
+                return self._next_rendered_by_walk()
+
+            following = next(self._iter_rendered_around(location), None)
+            if following is not None:
+                return following
+
+            target = location[0]
+
+    def _next_rendered_by_walk(self):
         previous = None
         target = self.parent
         while target is not None:
@@ -580,9 +1953,11 @@ class Node(GenericNodesUtils):
         if in_list is None:
             return None
 
-        generator = itertools.dropwhile(lambda x: x is not self, in_list)
-        next(generator)
-        return generator
+        position = in_list._position_of(self)
+        if position is None:
+            raise StopIteration()
+
+        return itertools.islice(in_list, position + 1, None)
 
     @property
     @display_property_atttributeerror_exceptions
@@ -592,8 +1967,11 @@ class Node(GenericNodesUtils):
         if in_list is None:
             return None
 
-        next_node = list(itertools.dropwhile(lambda x: x is not self, reversed(in_list)))[1:]
-        return next_node[0] if next_node else None
+        position = in_list._position_of(self, last=True)
+        if not position:
+            return None
+
+        return in_list.data[position - 1]
 
     @property
     @display_property_atttributeerror_exceptions
@@ -622,6 +2000,25 @@ class Node(GenericNodesUtils):
     @property
     @display_property_atttributeerror_exceptions
     def previous_rendered(self):
+        # the formatting of an endl node is rendered before it
+        previous = None
+        for i in self._iter_in_rendering_order(self):
+            if i is self:
+                break
+            previous = i
+        else:
+            return self._previous_rendered_by_walk()
+
+        if previous is not None:
+            return previous
+
+        location = self._locate_in_parent()
+        if location is None:
+            return self._previous_rendered_by_walk()
+
+        return next(self._iter_rendered_around(location, reverse=True), None)
+
+    def _previous_rendered_by_walk(self):
         previous = None
         target = self.parent
         while target is not None:
@@ -648,22 +2045,41 @@ class Node(GenericNodesUtils):
         if in_list is None:
             return None
 
-        generator = itertools.dropwhile(lambda x: x is not self, reversed(in_list))
-        next(generator)
-        return generator
+        position = in_list._position_of(self, last=True)
+        if position is None:
+            raise StopIteration()
+
+        return itertools.islice(reversed(in_list), len(in_list) - position, None)
 
     def get_indentation_node(self):
         if self.type == "endl":
             # by convention, an endl node will always have this indentation
             return None
 
-        if self.previous_rendered is None:
-            return None
+        # the result is cached on every node walked through, with the version
+        # of the tree it is valid for
+        version = self._get_tree_version()
+        walked = []
+        node = self
+        while True:
+            cache = node._indentation_cache
+            if version is not None and cache is not None and cache[0] == version:
+                result = cache[1]
+                break
+
+            walked.append(node)
+            previous = node.previous_rendered
+            if previous is None or previous.type == "endl":
+                result = previous
+                break
+            node = previous
 
-        if self.previous_rendered.type == "endl":
-            return self.previous_rendered
+        if version is not None:
+            cache = (version, result)
+            for node in walked:
+                object.__setattr__(node, "_indentation_cache", cache)
 
-        return self.previous_rendered.get_indentation_node()
+        return result
 
     @property
     @display_property_atttributeerror_exceptions
@@ -677,6 +2093,26 @@ class Node(GenericNodesUtils):
 
         return False
 
+    def _get_held_list(self):
+        """
+        Return the node list of the list attribute of the parent node that
+        holds this node, or None if it isn't in one.
+        """
+        parent = self.parent
+        if not isinstance(parent, Node) or self.on_attribute not in parent._list_keys:
+            return None
+
+        try:
+            # not getattr: a list being built or left as fst by a lazy
+            # construction doesn't hold this node
+            in_list = object.__getattribute__(parent, self.on_attribute)
+        except AttributeError:
+            return None
+
+        if isinstance(in_list, ProxyList):
+            in_list = in_list.node_list
+        return in_list if isinstance(in_list, NodeList) else None
+
     def _get_list_attribute_is_member_off(self):
         """
         Return the list attribute of the parent from which this node is a
@@ -706,6 +2142,9 @@ class Node(GenericNodesUtils):
         return in_list
 
     def __getattr__(self, key):
+        if key in self._lazy_keys and self._unmaterialized(key) is not None:
+            return self._materialize(key)
+
         if key.endswith("_") and key[:-1] in self._dict_keys + self._list_keys + self._str_keys:
             return getattr(self, key[:-1])
 
@@ -773,7 +2212,14 @@ class Node(GenericNodesUtils):
         else:
             recursive = True
 
-        if self._node_match_query(self, identifier, *args, **kwargs):
+        return self._find_iter(Query.from_arguments(identifier, args, kwargs), recursive)
+
+    def _find_iter(self, query, recursive=True):
+        if recursive and not self._subtree_types() & query.types_mask():
+            # nothing in this subtree can match
+            return
+
+        if query.match(self):
             yield self
 
         if recursive:
@@ -782,16 +2228,42 @@ class Node(GenericNodesUtils):
                     node = getattr(self, key)
                     if not isinstance(node, Node):
                         continue
-                    for matched_node in node.find_iter(identifier, *args, **kwargs):
+                    for matched_node in node._find_iter(query):
                         yield matched_node
                 elif kind in ("list", "formatting"):
                     nodes = getattr(self, key)
                     if isinstance(nodes, ProxyList):
                         nodes = nodes.node_list
                     for node in nodes:
-                        for matched_node in node.find_iter(identifier, *args, **kwargs):
+                        for matched_node in node._find_iter(query):
                             yield matched_node
 
+    def _subtree_types(self):
+        """
+        Return the bitmask of the classes (see NodeType) of this node and of
+        all the nodes below it. It is cached and dropped on modification like
+        the rendering.
+        """
+        if self._types_cache is None:
+            mask = self._type_bit
+            for (kind, key, _) in self._render():
+                if kind == "key":
+                    node = getattr(self, key)
+                    if isinstance(node, Node):
+                        mask |= node._subtree_types()
+                elif kind in ("list", "formatting"):
+                    lazy_fst = self._unmaterialized(key)
+                    if lazy_fst is not None:
+                        mask |= fst_types_mask(lazy_fst)
+                        continue
+                    nodes = getattr(self, key)
+                    if isinstance(nodes, ProxyList):
+                        nodes = nodes.node_list
+                    for node in nodes:
+                        mask |= node._subtree_types()
+            object.__setattr__(self, "_types_cache", mask)
+        return self._types_cache
+
     def find(self, identifier, *args, **kwargs):
         return next(self.find_iter(identifier, *args, **kwargs), None)
 
@@ -802,71 +2274,18 @@ class Node(GenericNodesUtils):
     __call__ = find_all
 
     def parent_find(self, identifier, *args, **kwargs):
+        query = Query.from_arguments(identifier, args, kwargs)
+
         current = self
         while current.parent and current.on_attribute != 'root':
-            if self._node_match_query(current.parent, identifier, *args, **kwargs):
+            if query.match(current.parent):
                 return current.parent
 
             current = current.parent
         return None
 
     def _node_match_query(self, node, identifier, *args, **kwargs):
-        if not self._attribute_match_query(node.generate_identifiers(), identifier.lower() if isinstance(identifier,
-                                                                                                         string_instance) and not identifier.startswith(
-            "re:") else identifier):
-            return False
-
-        all_my_keys = node._str_keys + node._list_keys + node._dict_keys
-
-        if args and isinstance(args[0], (string_instance, RE_PATTERN_FIELD, list, tuple)):
-            if not self._attribute_match_query([getattr(node, node._default_test_value)], args[0]):
-                return False
-            args = args[1:]
-
-        for arg in args:
-            if not arg(node):
-                return False
-
-        for key, value in kwargs.items():
-            if key not in all_my_keys:
-                return False
-
-            if not self._attribute_match_query([getattr(node, key)], value):
-                return False
-
-        return True
-
-    def _attribute_match_query(self, attribute_names, query):
-        """
-        Take a list/tuple of attributes that can match and a query, return True
-        if any of the attributes match the query.
-        """
-        assert isinstance(attribute_names, (list, tuple))
-
-        if isinstance(query, string_instance) and query.startswith("re:"):
-            query = re.compile(query[3:])
-
-        for attribute in attribute_names:
-            if callable(query):
-                if query(attribute):
-                    return True
-
-            elif isinstance(query, string_instance) and query.startswith("g:"):
-                if fnmatch(attribute, query[2:]):
-                    return True
-
-            elif isinstance(query, RE_PATTERN_FIELD):
-                if query.match(attribute):
-                    return True
-
-            elif isinstance(query, (list, tuple)):
-                if attribute in query:
-                    return True
-            else:
-                if attribute == query:
-                    return True
-
-        return False
+        return Query.from_arguments(identifier, args, kwargs).match(node)
 
     def find_by_path(self, path):
         path = Path(self, path).node
@@ -877,18 +2296,14 @@ class Node(GenericNodesUtils):
 
     @classmethod
     def generate_identifiers(klass):
-        return sorted(set(map(lambda x: x.lower(), [
-            redbaron_classname_to_baron_type(klass.__name__),
-            klass.__name__,
-            klass.__name__.replace("Node", ""),
-            redbaron_classname_to_baron_type(klass.__name__) + "_"
-        ] + klass._other_identifiers)))
+        return sorted(klass._identifiers)
 
     def _get_helpers(self):
         not_helpers = set([
             'at',
             'copy',
             'decrease_indentation',
+            'dump_to',
             'dumps',
             'edit',
             'find',
@@ -931,12 +2346,25 @@ class Node(GenericNodesUtils):
                 not x.startswith("_") and x not in not_helpers and inspect.ismethod(getattr(self, x))]
 
     def fst(self):
+        """
+        Return the fst of this node.
+
+        The fst is cached on the node (and on every node of its subtree) until
+        the next modification, it is shared and must not be modified.
+        """
+        if self._fst_cache is None:
+            object.__setattr__(self, "_fst_cache", self._generate_fst())
+        return self._fst_cache
+
+    def _generate_fst(self):
         to_return = {}
         for key in self._str_keys:
             to_return[key] = getattr(self, key)
         for key in self._list_keys:
+            if self._unmaterialized(key) is not None:
+                to_return[key] = [fst_as_built(x) for x in self._unmaterialized(key)]
             # Proxy Lists overload __iter__ for a better user interface
-            if isinstance(getattr(self, key), ProxyList):
+            elif isinstance(getattr(self, key), ProxyList):
                 to_return[key] = [node.fst() for node in getattr(self, key).node_list]
             else:
                 to_return[key] = [node.fst() for node in getattr(self, key)]
@@ -948,7 +2376,53 @@ class Node(GenericNodesUtils):
         return to_return
 
     def dumps(self):
-        return baron.dumps(self.fst())
+        if self._dumps_cache is None:
+            fragments = []
+            self._render_to(fragments.append)
+            object.__setattr__(self, "_dumps_cache", "".join(fragments))
+        return self._dumps_cache
+
+    def _render_to(self, write):
+        """
+        Render this node by calling write() on every string fragment, in
+        order. The tree is walked directly following nodes_rendering_order,
+        like baron.dumps does on the fst, without building the fst.
+        """
+        if self._dumps_cache is not None:
+            write(self._dumps_cache)
+            return
+
+        for kind, key, dependent in self._render():
+            if not dependent:
+                continue
+
+            if dependent is not True:
+                if isinstance(dependent, string_instance):
+                    if not is_rendered(getattr(self, dependent)):
+                        continue
+                elif not all(is_rendered(getattr(self, x)) for x in dependent):
+                    continue
+
+            if kind == "constant":
+                write(key)
+
+            elif kind == "string":
+                write(getattr(self, key))
+
+            elif kind == "key":
+                value = getattr(self, key)
+                if value is not None:
+                    value._render_to(write)
+
+            elif kind in ("list", "formatting"):
+                if self._unmaterialized(key) is not None:
+                    render_fst_to(self._unmaterialized(key), write)
+                    continue
+                value = getattr(self, key)
+                if isinstance(value, ProxyList):
+                    value = value.node_list
+                for node in value:
+                    node._render_to(write)
 
     def help(self, deep=2, with_formatting=False):
         if runned_from_ipython():
@@ -1025,8 +2499,62 @@ class Node(GenericNodesUtils):
         return self._bytes_repr_html_().decode("Utf-8")
 
     def copy(self):
-        # XXX not very optimised but at least very simple
-        return Node.from_fst(self.fst())
+        """
+        Return a copy of this node (and of its subtree) without parent.
+        """
+        return self._clone(parent=None, on_attribute=None)
+
+    def _clone(self, parent, on_attribute):
+        """
+        Build a copy of this node by copying its attributes directly instead
+        of going through its fst, this is what Node.__init__ does from a fst
+        minus the fst.
+        """
+        clone = self.__class__.__new__(self.__class__)
+
+        if compact_nodes:
+            object.__setattr__(clone, "init", True)
+            object.__setattr__(clone, "parent", parent)
+            object.__setattr__(clone, "on_attribute", on_attribute)
+            object.__setattr__(clone, "type", self.type)
+            # the rendering of a node only depends on its subtree, the copy
+            # can reuse it, but its indentation depends on where it is put
+            object.__setattr__(clone, "_dumps_cache", self._dumps_cache)
+            object.__setattr__(clone, "_fst_cache", self._fst_cache)
+            object.__setattr__(clone, "_types_cache", self._types_cache)
+            object.__setattr__(clone, "_indentation_cache", None)
+            object.__setattr__(clone, "_lazy_fst", self._lazy_fst)
+            for key in self._str_keys:
+                object.__setattr__(clone, key, getattr(self, key))
+
+        else:
+            # strings, key tables and caches in one go, the nodes and lists
+            # are replaced by copies below
+            attributes = dict(self.__dict__)
+            attributes.pop("_indentation_cache", None)
+            attributes["init"] = True
+            attributes["parent"] = parent
+            attributes["on_attribute"] = on_attribute
+            object.__setattr__(clone, "__dict__", attributes)
+
+        for key in self._dict_keys:
+            value = getattr(self, key)
+            object.__setattr__(clone, key, value._clone(clone, key) if value is not None else None)
+
+        for key in self._list_keys:
+            if self._unmaterialized(key) is not None:
+                # the fst is shared, the copy builds its own nodes from it
+                continue
+            value = getattr(self, key)
+            if isinstance(value, ProxyList):
+                # like in __init__, let the subclass wrap the list in its proxy
+                # list
+                setattr(clone, key, NodeList._of_clones(value.node_list, clone, key))
+            else:
+                object.__setattr__(clone, key, NodeList._of_clones(value, clone, key))
+
+        object.__setattr__(clone, "init", False)
+        return clone
 
     def __setattr__(self, name, value):
         if name == "init" or self.init:
@@ -1037,8 +2565,13 @@ class Node(GenericNodesUtils):
             name = name[:-1]
 
         # FIXME I'm pretty sure that Bool should also be put in the isinstance for cases like with_parenthesis/as
-        if name in self._str_keys and not isinstance(value, (string_instance, int)):
-            value = str(value)
+        if name in self._str_keys:
+            if not isinstance(value, (string_instance, int)):
+                value = str(value)
+
+            super(Node, self).__setattr__(name, value)
+            self._invalidate_render_cache()
+            return
 
         elif name in self._dict_keys:
             value = self._convert_input_to_node_object(value, self, name)
@@ -1046,15 +2579,114 @@ class Node(GenericNodesUtils):
         elif name in self._list_keys:
             value = self._convert_input_to_node_object_list(value, self, name)
 
-        return super(Node, self).__setattr__(name, value)
+        else:
+            return super(Node, self).__setattr__(name, value)
+
+        old = getattr(self, name, None)
+        super(Node, self).__setattr__(name, value)
+        self._tree_modified(old, value)
 
     def _render(self):
         return nodes_rendering_order[self.type]
 
     def replace(self, new_node):
-        new_node = self._convert_input_to_node_object(new_node, parent=None, on_attribute=None, generic=True)
-        self.__class__ = new_node.__class__  # YOLO
-        self.__init__(new_node.fst(), parent=self.parent, on_attribute=self.on_attribute)
+        """
+        Replace this node in place by another one and return the node that
+        now holds the place, which is this very node except in compact mode
+        where nodes of different types can't be converted into each other: the
+        new node takes this node's place in its parent instead.
+        """
+        if isinstance(new_node, Node):
+            # the given node stays independent from this one, like when it
+            # was rebuilt from its fst
+            new_node = new_node._clone(parent=None, on_attribute=None)
+        else:
+            new_node = self._convert_input_to_node_object(new_node, parent=None, on_attribute=None, generic=True)
+
+        type_index = self._get_root_type_index()
+        if type_index is not None and self._is_attached():
+            type_index.update(old=[self])
+        else:
+            type_index = None
+
+        try:
+            self.__class__ = new_node.__class__  # YOLO
+        except TypeError:
+            # compact nodes of different types don't share the same memory layout
+            if type_index is not None:
+                type_index.update(new=[self])
+            return self._replace_in_parent(new_node)
+
+        self._transplant(new_node)
+        self._tree_modified(new=[self])
+        return self
+
+    def _transplant(self, new_node):
+        """
+        Take the content of new_node, a node of the class of this one, which
+        gets its children: they aren't rebuilt from their fst.
+        """
+        parent, on_attribute = self.parent, self.on_attribute
+
+        if compact_nodes:
+            # a slot can't be copied as unset, the lazy lists are built first
+            for key in list(new_node._lazy_fst or ()):
+                new_node._materialize(key)
+            for klass in self.__class__.__mro__:
+                for slot in klass.__dict__.get("__slots__", ()):
+                    object.__setattr__(self, slot, getattr(new_node, slot))
+            # computed in the tree of new_node
+            object.__setattr__(self, "_indentation_cache", None)
+        else:
+            attributes = dict(new_node.__dict__)
+            attributes.pop("_indentation_cache", None)
+            object.__setattr__(self, "__dict__", attributes)
+
+        object.__setattr__(self, "parent", parent)
+        object.__setattr__(self, "on_attribute", on_attribute)
+
+        for key in self._dict_keys:
+            child = getattr(self, key)
+            if child is not None and child.parent is new_node:
+                object.__setattr__(child, "parent", self)
+
+        for key in self._list_keys:
+            if self._unmaterialized(key) is not None:
+                continue
+            node_list = getattr(self, key)
+            if isinstance(node_list, ProxyList):
+                node_list = node_list.node_list
+            if node_list.parent is new_node:
+                node_list.parent = self
+            for child in node_list.data:
+                if child.parent is new_node:
+                    object.__setattr__(child, "parent", self)
+
+    def _replace_in_parent(self, new_node):
+        new_node.parent = self.parent
+        new_node.on_attribute = self.on_attribute
+
+        in_list = self._get_list_attribute_is_member_off()
+
+        if in_list is None:
+            if self.parent is not None and self.on_attribute is not None:
+                object.__setattr__(self.parent, self.on_attribute, new_node)
+                self.parent._tree_modified([self], [new_node])
+            return new_node
+
+        in_list.data = [new_node if x is self else x for x in in_list.data]
+        in_list._tree_modified([self], [new_node])
+
+        holder = self.parent.parent if isinstance(self.parent, NodeList) else self.parent
+        container = holder if self.on_attribute == "root" else getattr(holder, self.on_attribute)
+        if isinstance(container, ProxyList):
+            for entry in container.data:
+                if entry[0] is self:
+                    entry[0] = new_node
+                if entry[1]:
+                    entry[1] = [new_node if x is self else x for x in entry[1]]
+
+        return new_node
 
     def edit(self, editor=None):
         if editor is None:
@@ -1121,7 +2753,7 @@ class Node(GenericNodesUtils):
         if not self.has_render_key(attribute):
             raise KeyError()
         path = self.path().to_baron_path() + [attribute]
-        return baron.path.path_to_bounding_box(self.root.fst(), path)
+        return self.root._bounding_box_of_path(path)
 
     def increase_indentation(self, number_of_spaces):
         self.get_indentation_node().indent += number_of_spaces * " "
@@ -1158,7 +2790,7 @@ class CodeBlockNode(Node):
             clean_string = "    " + "\n    ".join(clean_string.split("\n"))
             clean_string = clean_string.rstrip()
 
-        fst = baron.parse("def a():\n%s\n" % clean_string)[0]["value"]
+        fst = parse_fragment("def a():\n%s\n" % clean_string)[0]["value"]
 
         result = NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
@@ -1262,7 +2894,7 @@ class ElseAttributeNode(CodeBlockNode):
                 string = re.sub("(\r?\n)%s" % (" " * indentation), "\\1", string)
                 string = string.lstrip()
 
-            node = Node.from_fst(baron.parse("try: pass\nexcept: pass\n%s" % string)[0][indented_type], parent=parent,
+            node = Node.from_fst(parse_fragment("try: pass\nexcept: pass\n%s" % string)[0][indented_type], parent=parent,
                                  on_attribute=on_attribute)
             node.value = self.parse_code_block(node.value.dumps(), parent=node, on_attribute="value")
 
@@ -1334,14 +2966,30 @@ class ElseAttributeNode(CodeBlockNode):
 
 
 class ProxyList(object):
+    # the separator node is only built when it is needed, from this fst, to
+    # avoid having one per proxy list of the tree
+    _middle_separator_fst = {"type": "comma", "first_formatting": [], "second_formatting": [{"type": "space", "value": " "}]}
+    _middle_separator = None
+    _positions_cache = None
+    _batch_depth = 0
+    _batch_modified = False
+
     def __init__(self, node_list, on_attribute="value"):
         self.node_list = node_list
         self.heading_formatting = []
         self.data = self._build_inner_list(node_list)
-        self.middle_separator = redbaron.nodes.CommaNode(
-            {"type": "comma", "first_formatting": [], "second_formatting": [{"type": "space", "value": " "}]})
         self.on_attribute = on_attribute
 
+    @property
+    def middle_separator(self):
+        if self._middle_separator is None:
+            self._middle_separator = Node.from_fst(self._middle_separator_fst)
+        return self._middle_separator
+
+    @middle_separator.setter
+    def middle_separator(self, value):
+        self._middle_separator = value
+
     def _build_inner_list(self, node_list):
         result = []
 
@@ -1372,10 +3020,17 @@ class ProxyList(object):
         else:
             return NodeList([self._convert_input_to_node_object(x, parent, on_attribute) for x in value])
 
-    def _generate_expected_list(self):
-        expected_list = self.heading_formatting[:]
+    def _generate_expected_list(self, start=0, stop=None):
+        """
+        Generate the content of node_list from self.data, or only the part of
+        it that renders self.data[start:stop] (the heading formatting is only
+        part of it if start is 0).
+        """
+        expected_list = self.heading_formatting[:] if start == 0 else []
+        stop = len(self.data) if stop is None else stop
 
-        for position, i in enumerate(self.data):
+        for position in range(start, stop):
+            i = self.data[position]
             is_last = position == len(self.data) - 1
             expected_list.append(i[0])
             # XXX this will need refactoring...
@@ -1406,32 +3061,154 @@ class ProxyList(object):
 
         return expected_list
 
-    def _synchronise(self):
-        self.node_list.data = self._generate_expected_list()[:]
-        self.data = self._build_inner_list(self.node_list.data)
+    def _synchronise(self, start=None, stop=None):
+        """
+        Regenerate node_list from self.data after a modification.
+
+        If the modification only touched self.data[start:stop] (stop == start
+        for a deletion), only the nodes rendering those entries and their
+        neighbours are regenerated when the list allows it (see
+        _synchronisation_window), instead of the whole list.
+        """
+        if self._batch_depth:
+            # see batch(), the whole list is regenerated at its end
+            self._batch_modified = True
+            return
+
+        window = self._synchronisation_window(start, stop) if start is not None else None
+
+        if window is None:
+            old = self.node_list.data
+            self.node_list.data = self._generate_expected_list()[:]
+            self.node_list._tree_modified(old, self.node_list.data)
+            self.data = self._build_inner_list(self.node_list.data)
+            self._positions_cache = None
+            return
+
+        start, stop = window
+
+        # the entries around the window haven't changed, they delimit the
+        # part of node_list to regenerate
+        previous_node, previous_formatting = self.data[start - 1]
+        begin = self.node_list._position_of(previous_node) + 1 + len(previous_formatting)
+        end = self.node_list._position_of(self.data[stop][0]) if stop < len(self.data) else len(self.node_list.data)
+
+        old = self.node_list.data[begin:end]
+        new = self._generate_expected_list(start, stop)
+        self.node_list.data[begin:end] = new
+        self.node_list._tree_modified(old, new)
+        self.data[start:stop] = self._build_inner_list(new)
+        self._positions_cache = None
+
+    def _synchronisation_window(self, start, stop):
+        """
+        Return the (start, stop) entries of self.data to regenerate after a
+        modification of self.data[start:stop], or None if the whole list has
+        to be regenerated.
+
+        The entries before and after the modified ones are regenerated too:
+        their separators depend on their neighbours.
+        """
+        start, stop = start - 1, stop + 1
+
+        while start > 0 and self._depends_on_previous_entry(self.data[start]):
+            start -= 1
+        while stop < len(self.data) and self._depends_on_previous_entry(self.data[stop]):
+            stop += 1
+
+        if start < 1:
+            # the heading formatting is only handled by a full regeneration
+            return None
+
+        return start, min(stop, len(self.data))
+
+    def _depends_on_previous_entry(self, entry):
+        return False
 
     def __len__(self):
         return len(self.data)
 
+    def _normalize_index(self, index):
+        # like list.insert does with an index out of the list
+        if index < 0:
+            index += len(self.data)
+        return min(max(index, 0), len(self.data))
+
     def insert(self, index, value):
         value = self._convert_input_to_node_object(value, parent=self.node_list, on_attribute=self.on_attribute)
+        index = self._normalize_index(index)
         self.data.insert(index, [value, None])
-        self._synchronise()
+        self._synchronise(index, index + 1)
 
     def append(self, value):
         self.insert(len(self), value)
 
     def extend(self, values):
+        start = len(self.data)
         self.data.extend(map(lambda x: [x, None], self._convert_input_to_node_object_list(values, parent=self.node_list,
                                                                                           on_attribute=self.on_attribute)))
+        self._synchronise(start, len(self.data))
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager to do several modifications of the list at once: the
+        underlying node list is only regenerated once, at the end of the
+        block, instead of after each modification.
+
+        Inside of the block, the list itself (len, indexing, iteration...) is
+        up to date but its rendering (.dumps(), .node_list, .fst()...) isn't.
+        For line proxy lists, the positions are the ones of the list modified
+        in the block: the blank lines that the regeneration would have moved
+        in between are not there yet.
+
+            with red[0].value.batch() as proxy_list:
+                for i in range(1000):
+                    proxy_list.append(str(i))
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_modified:
+                self._batch_modified = False
+                self._synchronise()
+
+    def bulk_insert(self, positions_and_values):
+        """
+        Insert several values at once, positions_and_values is an iterable of
+        (position, value) where position is the index in the list before the
+        insertions (values inserted at the same position keep their order).
+        The underlying node list is only regenerated once.
+        """
+        insertions = {}
+        for position, value in positions_and_values:
+            value = self._convert_input_to_node_object(value, parent=self.node_list, on_attribute=self.on_attribute)
+            insertions.setdefault(self._normalize_index(position), []).append([value, None])
+
+        if not insertions:
+            return
+
+        data = []
+        for position, entry in enumerate(self.data):
+            data.extend(insertions.get(position, ()))
+            data.append(entry)
+        data.extend(insertions.get(len(self.data), ()))
+
+        self.data = data
         self._synchronise()
 
     def pop(self, index=None):
-        if index is not None:
-            self.data.pop(index)
-        else:
-            self.data.pop()
-        self._synchronise()
+        # the position of the entry in the list before it is removed
+        if index is None:
+            index = len(self.data) - 1
+        elif index < 0:
+            index += len(self.data)
+        if not 0 <= index < len(self.data):
+            raise IndexError("pop index out of range")
+        self.data.pop(index)
+        self._synchronise(index, index)
 
     def remove(self, value):
         self.pop(self.index(value))
@@ -1443,8 +3220,23 @@ class ProxyList(object):
             self.pop(index)
 
     def index(self, value, *args):
-        # XXX would be better if I iterate other the list
-        return [x[0] for x in self.data].index(value, *args)
+        position = self._position_of(value) if not args else None
+        if position is None:
+            return [x[0] for x in self.data].index(value, *args)
+        return position
+
+    def _position_of(self, node):
+        """
+        Return the position of node (compared by identity) among the values
+        of this proxy list or None, see NodeList._position_of.
+        """
+        if self._positions_cache is not None:
+            position = self._positions_cache[0].get(id(node))
+            if position is not None and position < len(self.data) and self.data[position][0] is node:
+                return position
+
+        self._positions_cache = build_positions(x[0] for x in self.data)
+        return self._positions_cache[0].get(id(node))
 
     def __getitem__(self, index):
         if isinstance(index, slice):
@@ -1467,16 +3259,20 @@ class ProxyList(object):
         else:
             self.data[key][0] = self._convert_input_to_node_object(value, parent=self.node_list,
                                                                    on_attribute=self.on_attribute)
-        self._synchronise()
+            key = key + len(self.data) if key < 0 else key
+            self._synchronise(key, key + 1)
 
     def __setslice__(self, i, j, value):
-        self.data[i:j] = map(lambda x: [x, None], self._convert_input_to_node_object_list(value, parent=self.node_list,
-                                                                                          on_attribute=self.on_attribute))
-        self._synchronise()
+        new_entries = list(map(lambda x: [x, None], self._convert_input_to_node_object_list(value, parent=self.node_list,
+                                                                                            on_attribute=self.on_attribute)))
+        i, j, _ = slice(i, j).indices(len(self.data))
+        self.data[i:j] = new_entries
+        self._synchronise(i, i + len(new_entries))
 
     def __delslice__(self, i, j):
+        i, j, _ = slice(i, j).indices(len(self.data))
         del self.data[i:j]
-        self._synchronise()
+        self._synchronise(i, i)
 
     def __getslice__(self, i, j):
         to_return = map(lambda x: x[0], self.data[i:j])
@@ -1531,7 +3327,7 @@ class ProxyList(object):
 class CommaProxyList(ProxyList):
     def __init__(self, node_list, on_attribute="value"):
         super(CommaProxyList, self).__init__(node_list, on_attribute=on_attribute)
-        self.style = "indented" if any(self.node_list('comma', recursive=False).map(lambda x: x('endl'))) else "flat"
+        self.style = "indented" if any(x.type == "comma" and x.find("endl") is not None for x in self.node_list.data) else "flat"
 
         # XXX will likely break if the user modify the formatting of the list,
         # I don't like that
@@ -1545,7 +3341,15 @@ class CommaProxyList(ProxyList):
         return redbaron.nodes.CommaNode(
             {"type": "comma", "first_formatting": [], "second_formatting": [{"type": "space", "value": " "}]})
 
-    def _generate_expected_list(self):
+    def _synchronisation_window(self, start, stop):
+        # the separators of an indented list are fixed according to the
+        # whole list and an empty list modifies its parent
+        if self.style == "indented" or not self.data:
+            return None
+
+        return super(CommaProxyList, self)._synchronisation_window(start, stop)
+
+    def _generate_expected_list(self, start=0, stop=None):
         def generate_separator():
             separator = self._get_middle_separator()
             separator.parent = self.node_list
@@ -1559,8 +3363,10 @@ class CommaProxyList(ProxyList):
             return []
 
         expected_list = []
+        stop = len(self.data) if stop is None else stop
 
-        for position, i in enumerate(self.data):
+        for position in range(start, stop):
+            i = self.data[position]
             is_last = position == len(self.data) - 1
             expected_list.append(i[0])
             # XXX this will need refactoring...
@@ -1592,9 +3398,10 @@ class CommaProxyList(ProxyList):
                     expected_list.append(generate_separator())
                 elif self.has_trailing:
                     expected_list.append(generate_separator())
-                    expected_list[-1].second_formatting[0].indent = ""
+                    if expected_list[-1].second_formatting[0].type == "endl":
+                        expected_list[-1].second_formatting[0].indent = ""
 
-        if expected_list and self.has_trailing and self.style == "indented":
+        if expected_list and stop == len(self.data) and self.has_trailing and self.style == "indented":
             if not expected_list[-1].second_formatting.endl:
                 raise Exception(
                     "It appears that you have indentation in your CommaList, for now RedBaron doesn't know how to handle this situation (which requires a lot of work), sorry about that. You can find more information here https://github.com/PyCQA/redbaron/issues/100")
@@ -1605,11 +3412,12 @@ class CommaProxyList(ProxyList):
 
 
 class DotProxyList(ProxyList):
+    _middle_separator_fst = {"type": "dot", "first_formatting": [], "second_formatting": []}
+
     def __init__(self, node_list, on_attribute="value"):
         # XXX this will have its limitations, users will probably wants to be
         # able to modify those, DotProxyList should be reconsidered for that
         super(DotProxyList, self).__init__(node_list, on_attribute=on_attribute)
-        self.middle_separator = redbaron.nodes.DotNode({"type": "dot", "first_formatting": [], "second_formatting": []})
 
     def _build_inner_list(self, node_list):
         # XXX to merge with parent, behavior is the same only formatting nodes changes
@@ -1626,10 +3434,16 @@ class DotProxyList(ProxyList):
 
         return result
 
-    def _generate_expected_list(self):
-        expected_list = self.heading_formatting[:]
+    def _depends_on_previous_entry(self, entry):
+        # calls and getitems remove the dot before them
+        return entry[0].type in ("call", "getitem")
 
-        for position, i in enumerate(self.data):
+    def _generate_expected_list(self, start=0, stop=None):
+        expected_list = self.heading_formatting[:] if start == 0 else []
+        stop = len(self.data) if stop is None else stop
+
+        for position in range(start, stop):
+            i = self.data[position]
             if expected_list and i[0].type in ("call", "getitem"):
                 expected_list.pop()
 
@@ -1673,17 +3487,22 @@ class DotProxyList(ProxyList):
 
 
 class LineProxyList(ProxyList):
+    _middle_separator_fst = {"type": "endl", "formatting": [], "value": "\n", "indent": "    "}
+
     def __init__(self, node_list, on_attribute="value"):
         self.first_blank_lines = []
         super(LineProxyList, self).__init__(node_list, on_attribute=on_attribute)
-        self.middle_separator = redbaron.nodes.DotNode(
-            {"type": "endl", "formatting": [], "value": "\n", "indent": "    "})
 
-    def _synchronise(self):
+    def _synchronise(self, start=None, stop=None):
         log("Before synchronise, self.data = '%s' + '%s'", self.first_blank_lines, self.node_list)
-        super(LineProxyList, self)._synchronise()
+        super(LineProxyList, self)._synchronise(start, stop)
         log("After synchronise, self.data = '%s' + '%s'", self.first_blank_lines, self.node_list)
 
+    def _synchronisation_window(self, start, stop):
+        # the indentation of the lines and the blank lines are computed on the
+        # whole list, it is always regenerated
+        return None
+
     def _build_inner_list(self, node_list):
         result = []
         self.first_blank_lines = []
@@ -1726,6 +3545,11 @@ class LineProxyList(ProxyList):
 
         log("Detect indentation has %s", indentation.__repr__())
 
+        def log_result(expected_list):
+            # rendering the list is expensive, only do it when it is printed
+            if redbaron.DEBUG:
+                log("-- current result: %s", ["".join(map(lambda x: x.dumps(), expected_list))])
+
         def generate_separator():
             separator = self.middle_separator.copy()
             separator.parent = self.node_list
@@ -1768,7 +3592,7 @@ class LineProxyList(ProxyList):
                     CodeBlockNode, redbaron.nodes.IfelseblockNode)):
                 log(">> Previous line has content and current needs to be indented, append separator to indent it")
                 expected_list.append(generate_separator())
-                log("-- current result: %s", ["".join(map(lambda x: x.dumps(), expected_list))])
+                log_result(expected_list)
                 previous = expected_list[-1]
                 might_need_separator = False
 
@@ -1787,7 +3611,7 @@ class LineProxyList(ProxyList):
             is_last = position == len(self.data) - 1
             log(">> Append node to expected_list: '%s'", [i[0]])
             expected_list.append(i[0])
-            log("-- current result: %s", ["".join(map(lambda x: x.dumps(), expected_list))])
+            log_result(expected_list)
 
             if previous and previous.type == "endl" and i[0].type != "endl" and previous.indentation != indentation:
                 log("Previous is endl and current isn't endl and identation isn't correct, fix it")
@@ -1816,7 +3640,7 @@ class LineProxyList(ProxyList):
                 else:
                     log(">> Append formatting to expected_list: %s", i[1])
                     expected_list += i[1]
-                    log("-- current result: %s", ["".join(map(lambda x: x.dumps(), expected_list))])
+                    log_result(expected_list)
             else:
                 log("current HAS None for formatting")
                 # here we generate the new expected formatting
@@ -1829,7 +3653,7 @@ class LineProxyList(ProxyList):
                     log(">> Current is not last and not endl, append a separator")
                     has_added_separator = True
                     expected_list.append(generate_separator())
-                    log("-- current result: %s", ["".join(map(lambda x: x.dumps(), expected_list))])
+                    log_result(expected_list)
                 elif i[0].type == "endl":
                     log(">> Current is endl, don't do anything")
                 elif is_last:
@@ -1853,7 +3677,7 @@ class LineProxyList(ProxyList):
                 ">> List is empty or last node is not a CodeBlockNode or EndlNode, append a separator to it and set identation to it")
             expected_list.append(generate_separator())
             expected_list[-1].indent = last_indentation
-            log("-- current result: %s", ["".join(map(lambda x: x.dumps(), expected_list))])
+            log_result(expected_list)
         else:
             if isinstance(expected_list[-1], CodeBlockNode):
                 # In this case, the last \n is owned by the node
@@ -1872,7 +3696,7 @@ class LineProxyList(ProxyList):
             raise IndexError()
         index = self[index].index_on_parent_raw
         path = self.path().to_baron_path() + [index]
-        return baron.path.path_to_bounding_box(self.root.fst(), path)
+        return self.root._bounding_box_of_path(path)
 
 
 class DecoratorsLineProxyList(LineProxyList):
@@ -0,0 +1,250 @@
+from __future__ import absolute_import
+
+import os
+import sys
+import time
+import zlib
+import errno
+import pickle
+import hashlib
+import tempfile
+
+import baron
+
+from redbaron.private_config import parse_cache_directory, parse_cache_size
+
+
+__all__ = ["ParseCache", "parse_cache"]
+
+
+class ParseCache(object):
+    """
+    Cache on disk of the fst of the parsed source codes, see parse(). Each
+    entry is a file of directory named after the hash of the source code, of
+    the versions of baron, redbaron and python and of the modification times
+    of the code of baron and redbaron, holding the compressed pickle of its
+    fst: only use a directory that nobody else can write to.
+
+    Several processes can use the same directory at the same time: entries
+    are written to a temporary file then renamed, and an entry removed by
+    another process is only a miss.
+
+    When the entries take more than maxsize bytes, the least recently used
+    ones are removed. A directory of None or a maxsize of 0 disables the
+    cache. hits and misses count the lookups of this process.
+    """
+
+    # once over maxsize, entries are removed down to this fraction of it, not
+    # to have to do it again at the next write
+    eviction_ratio = 0.9
+
+    # temporary files older than this (in seconds) were left by a process
+    # that died while writing them
+    stale_temporary_age = 3600
+
+    def __init__(self, directory=None, maxsize=256 * 1024 * 1024):
+        self.directory = directory
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # estimation of the size of the entries, None until they are counted
+        self._size = None
+        self._key_prefix = None
+
+    def __repr__(self):
+        return "<ParseCache %s, maxsize=%d, hits=%d, misses=%d>" % (self.directory, self.maxsize, self.hits,
+                                                                    self.misses)
+
+    @property
+    def enabled(self):
+        return self.directory is not None and self.maxsize > 0
+
+    def configure(self, directory, maxsize=None):
+        """
+        Use another directory (None disables the cache) and, if given,
+        another maxsize in bytes.
+        """
+        self.directory = directory
+        if maxsize is not None:
+            self.maxsize = maxsize
+        self._size = None
+
+    def parse(self, source):
+        """
+        Return baron.parse(source), from the cache if it holds it. Every call
+        gets its own fst.
+        """
+        if not self.enabled:
+            return baron.parse(source)
+
+        path = self._path(source)
+        fst = self._read(path)
+        if fst is not None:
+            self.hits += 1
+            return fst
+
+        self.misses += 1
+        fst = baron.parse(source)
+        self._write(path, fst)
+        return fst
+
+    def clear(self):
+        """
+        Remove all the entries and reset hits and misses.
+        """
+        self.hits = 0
+        self.misses = 0
+        if self.directory is None:
+            return
+
+        for path, _, _ in self._entries():
+            _remove(path)
+        self._size = 0
+
+    def _path(self, source):
+        if self._key_prefix is None:
+            self._key_prefix = ("baron %s %s, redbaron %s %s, python %d.%d\n" % (
+                _version("baron"), _fingerprint(baron.__file__), _version("redbaron"), _fingerprint(__file__),
+                sys.version_info[0], sys.version_info[1])).encode("utf-8")
+
+        if not isinstance(source, bytes):
+            source = source.encode("utf-8", "surrogatepass")
+
+        return os.path.join(self.directory, hashlib.sha1(self._key_prefix + source).hexdigest() + ".fst")
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as file_object:
+                data = file_object.read()
+        except (IOError, OSError):
+            return None
+
+        try:
+            fst = pickle.loads(zlib.decompress(data))
+        except Exception:
+            # not written by this version of the cache
+            _remove(path)
+            return None
+
+        try:
+            # the modification time of the entries is their last use
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        return fst
+
+    def _write(self, path, fst):
+        data = zlib.compress(pickle.dumps(fst, pickle.HIGHEST_PROTOCOL))
+
+        # the cache failing (full disk, read only directory...) mustn't
+        # prevent parsing
+        try:
+            try:
+                os.makedirs(self.directory)
+            except OSError as exception:
+                if exception.errno != errno.EEXIST:
+                    raise
+
+            file_descriptor, temporary_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=self.directory)
+            try:
+                with os.fdopen(file_descriptor, "wb") as file_object:
+                    file_object.write(data)
+
+                # os.rename doesn't overwrite existing files on windows
+                getattr(os, "replace", os.rename)(temporary_path, path)
+            except BaseException:
+                _remove(temporary_path)
+                raise
+        except (IOError, OSError):
+            return
+
+        if self._size is None:
+            self._size = sum(size for _, _, size in self._entries())
+        else:
+            self._size += len(data)
+
+        if self._size > self.maxsize:
+            self._evict()
+
+    def _entries(self):
+        """
+        Return the (path, modification time, size) of the entries, removing
+        the stale temporary files on the way.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+
+        entries = []
+        now = time.time()
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # removed by another process
+                continue
+
+            if name.endswith(".fst"):
+                entries.append((path, stat.st_mtime, stat.st_size))
+            elif name.endswith(".tmp") and now - stat.st_mtime > self.stale_temporary_age:
+                _remove(path)
+
+        return entries
+
+    def _evict(self):
+        # the size is counted again since other processes write entries too
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        self._size = sum(size for _, _, size in entries)
+
+        for path, _, size in entries:
+            if self._size <= self.maxsize * self.eviction_ratio:
+                break
+            _remove(path)
+            self._size -= size
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        # already removed by another process
+        pass
+
+
+def _version(package):
+    try:
+        from importlib.metadata import version
+    except ImportError:
+        try:
+            from pkg_resources import get_distribution
+        except ImportError:
+            return "unknown"
+
+        def version(name):
+            return get_distribution(name).version
+
+    try:
+        return version(package)
+    except Exception:
+        return "unknown"
+
+
+def _fingerprint(module_path):
+    """
+    Return the directory of the package of the module at module_path with the
+    last modification time of its python files: the version of a package
+    used from a checkout (or an editable install) doesn't change with its
+    code.
+    """
+    directory = os.path.dirname(os.path.abspath(module_path))
+    modification_time = 0
+    for name in os.listdir(directory):
+        if name.endswith(".py"):
+            modification_time = max(modification_time, os.path.getmtime(os.path.join(directory, name)))
+    return "%s:%r" % (directory, modification_time)
+
+
+parse_cache = ParseCache(parse_cache_directory, parse_cache_size)
@@ -2,17 +2,16 @@ from __future__ import absolute_import
 
 import re
 
-import baron
 from baron.utils import string_instance
 
-from redbaron.base_nodes import Node, NodeList, LiteralyEvaluable, CodeBlockNode, DotProxyList, CommaProxyList, LineProxyList, IfElseBlockSiblingNode, ElseAttributeNode
+from redbaron.base_nodes import Node, NodeList, LiteralyEvaluable, CodeBlockNode, DotProxyList, CommaProxyList, LineProxyList, IfElseBlockSiblingNode, ElseAttributeNode, parse_fragment
 from redbaron.syntax_highlight import python_html_highlight
 
 
 class ArgumentGeneratorComprehensionNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "generators":
-            fst = baron.parse("(x %s)" % string)[0]["generators"]
+            fst = parse_fragment("(x %s)" % string)[0]["generators"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         else:
@@ -20,7 +19,7 @@ class ArgumentGeneratorComprehensionNode(Node):
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "result":
-            return Node.from_fst(baron.parse("(%s for x in x)" % string)[0]["result"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("(%s for x in x)" % string)[0]["result"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -29,12 +28,12 @@ class ArgumentGeneratorComprehensionNode(Node):
 class AssertNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("assert %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("assert %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "message":
             if string:
                 self.third_formatting = [Node.from_fst({"type": "space", "value": " "}, on_attribute=on_attribute, parent=parent)]
-                return Node.from_fst(baron.parse("assert plop, %s" % string)[0]["message"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("assert plop, %s" % string)[0]["message"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -58,10 +57,10 @@ class AssignmentNode(Node):
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "target":
-            return Node.from_fst(baron.parse("%s = a" % string)[0]["target"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("%s = a" % string)[0]["target"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "value":
-            return Node.from_fst(baron.parse("a = %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("a = %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "annotation":
             if not string.strip():
@@ -76,7 +75,7 @@ class AssignmentNode(Node):
                 if not self.annotation_second_formatting:
                     self.annotation_second_formatting = [Node.from_fst({"type": "space", "value": " "}, on_attribute="return_annotation_first_formatting", parent=self)]
 
-                return Node.from_fst(baron.parse("a: %s = a" % string)[0]["annotation"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("a: %s = a" % string)[0]["annotation"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -85,7 +84,7 @@ class AssignmentNode(Node):
 class AssociativeParenthesisNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("(%s)" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("(%s)" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -94,7 +93,7 @@ class AssociativeParenthesisNode(Node):
 class AtomtrailersNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return NodeList.from_fst(baron.parse("(%s)" % string)[0]["value"]["value"], parent=parent, on_attribute=on_attribute)
+            return NodeList.from_fst(parse_fragment("(%s)" % string)[0]["value"]["value"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -109,7 +108,7 @@ class AtomtrailersNode(Node):
 class AwaitNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("await %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("await %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -118,7 +117,7 @@ class AwaitNode(Node):
 class BinaryNode(Node, LiteralyEvaluable):
     def __setattr__(self, key, value):
         if key == "value" and isinstance(value, string_instance):
-            assert baron.parse(value)[0]["type"] == "binary"
+            assert parse_fragment(value)[0]["type"] == "binary"
 
         return super(BinaryNode, self).__setattr__(key, value)
 
@@ -126,16 +125,16 @@ class BinaryNode(Node, LiteralyEvaluable):
 class BinaryOperatorNode(Node):
     def __setattr__(self, key, value):
         if key == "value" and isinstance(value, string_instance):
-            assert baron.parse("a %s b" % value)[0]["type"] == "binary_operator"
+            assert parse_fragment("a %s b" % value)[0]["type"] == "binary_operator"
 
         return super(BinaryOperatorNode, self).__setattr__(key, value)
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "first":
-            return Node.from_fst(baron.parse("%s + b" % string)[0]["first"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("%s + b" % string)[0]["first"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "second":
-            return Node.from_fst(baron.parse("bb + %s" % string)[0]["second"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("bb + %s" % string)[0]["second"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -152,16 +151,16 @@ class BinaryRawStringNode(Node, LiteralyEvaluable):
 class BooleanOperatorNode(Node):
     def __setattr__(self, key, value):
         if key == "value" and isinstance(value, string_instance):
-            assert baron.parse("a %s b" % value)[0]["type"] == "boolean_operator"
+            assert parse_fragment("a %s b" % value)[0]["type"] == "boolean_operator"
 
         return super(BooleanOperatorNode, self).__setattr__(key, value)
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "first":
-            return Node.from_fst(baron.parse("%s and b" % string)[0]["first"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("%s and b" % string)[0]["first"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "second":
-            return Node.from_fst(baron.parse("bb and %s" % string)[0]["second"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("bb and %s" % string)[0]["second"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -174,7 +173,7 @@ class BreakNode(Node):
 class CallNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return NodeList.from_fst(baron.parse("a(%s)" % string)[0]["value"][1]["value"], parent=parent, on_attribute=on_attribute)
+            return NodeList.from_fst(parse_fragment("a(%s)" % string)[0]["value"][1]["value"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -189,10 +188,10 @@ class CallNode(Node):
 class CallArgumentNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("a(%s)" % string)[0]["value"][1]["value"][0]["value"], parent=parent, on_attribute=on_attribute) if string else ""
+            return Node.from_fst(parse_fragment("a(%s)" % string)[0]["value"][1]["value"][0]["value"], parent=parent, on_attribute=on_attribute) if string else ""
 
         elif on_attribute == "target":
-            return Node.from_fst(baron.parse("a(%s=b)" % string)[0]["value"][1]["value"][0]["target"], parent=parent, on_attribute=on_attribute) if string else ""
+            return Node.from_fst(parse_fragment("a(%s=b)" % string)[0]["value"][1]["value"][0]["target"], parent=parent, on_attribute=on_attribute) if string else ""
 
         else:
             raise Exception("Unhandled case")
@@ -200,6 +199,7 @@ class CallArgumentNode(Node):
 
 class ClassNode(CodeBlockNode):
     _default_test_value = "name"
+    _lazy_keys = ("value",)
 
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "decorators":
@@ -211,7 +211,7 @@ class ClassNode(CodeBlockNode):
             else:
                 self.parenthesis = False
 
-            return NodeList.from_fst(baron.parse("class a(%s): pass" % string)[0]["inherit_from"], parent=parent, on_attribute=on_attribute)
+            return NodeList.from_fst(parse_fragment("class a(%s): pass" % string)[0]["inherit_from"], parent=parent, on_attribute=on_attribute)
 
         else:
             return super(ClassNode, self)._string_to_node_list(string, parent, on_attribute)
@@ -233,19 +233,19 @@ class CommentNode(Node):
 class ComparisonNode(Node):
     def __setattr__(self, key, value):
         if key == "value" and isinstance(value, string_instance):
-            assert baron.parse("a %s b" % value)[0]["type"] == "comparison"
+            assert parse_fragment("a %s b" % value)[0]["type"] == "comparison"
 
         return super(ComparisonNode, self).__setattr__(key, value)
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "first":
-            return Node.from_fst(baron.parse("%s > b" % string)[0]["first"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("%s > b" % string)[0]["first"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "value":
-            return Node.from_fst(baron.parse("a %s b" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("a %s b" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "second":
-            return Node.from_fst(baron.parse("bb > %s" % string)[0]["second"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("bb > %s" % string)[0]["second"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -262,7 +262,7 @@ class ComplexNode(Node):
 class ComprehensionIfNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("[x for x in x if %s]" % string)[0]["generators"][0]["ifs"][0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("[x for x in x if %s]" % string)[0]["generators"][0]["ifs"][0]["value"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -271,17 +271,17 @@ class ComprehensionIfNode(Node):
 class ComprehensionLoopNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "ifs":
-            return NodeList.from_fst(baron.parse("[x for x in x %s]" % string)[0]["generators"][0]["ifs"], parent=parent, on_attribute=on_attribute)
+            return NodeList.from_fst(parse_fragment("[x for x in x %s]" % string)[0]["generators"][0]["ifs"], parent=parent, on_attribute=on_attribute)
 
         else:
             return super(ClassNode, self)._string_to_node_list(string, parent, on_attribute)
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "iterator":
-            return Node.from_fst(baron.parse("[x for %s in x]" % string)[0]["generators"][0]["iterator"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("[x for %s in x]" % string)[0]["generators"][0]["iterator"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "target":
-            return Node.from_fst(baron.parse("[x for s in %s]" % string)[0]["generators"][0]["target"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("[x for s in %s]" % string)[0]["generators"][0]["target"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -294,11 +294,11 @@ class ContinueNode(Node):
 class DecoratorNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("@%s()\ndef a(): pass" % string)[0]["decorators"][0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("@%s()\ndef a(): pass" % string)[0]["decorators"][0]["value"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "call":
             if string:
-                return Node.from_fst(baron.parse("@a%s\ndef a(): pass" % string)[0]["decorators"][0]["call"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("@a%s\ndef a(): pass" % string)[0]["decorators"][0]["call"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -307,6 +307,7 @@ class DecoratorNode(Node):
 class DefNode(CodeBlockNode):
     _other_identifiers = ["funcdef", "funcdef_"]
     _default_test_value = "name"
+    _lazy_keys = ("value",)
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "return_annotation":
@@ -316,7 +317,7 @@ class DefNode(CodeBlockNode):
                 return ""
 
             else:
-                fst = baron.parse("def a() -> %s: pass" % string)[0]["return_annotation"]
+                fst = parse_fragment("def a() -> %s: pass" % string)[0]["return_annotation"]
 
                 if not self.return_annotation_first_formatting:
                     self.return_annotation_first_formatting = [Node.from_fst({"type": "space", "value": " "}, on_attribute="return_annotation_first_formatting", parent=self)]
@@ -330,7 +331,7 @@ class DefNode(CodeBlockNode):
 
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "arguments":
-            fst = baron.parse("def a(%s): pass" % string)[0]["arguments"]
+            fst = parse_fragment("def a(%s): pass" % string)[0]["arguments"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "decorators":
@@ -352,10 +353,10 @@ class DefNode(CodeBlockNode):
 class DefArgumentNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("def a(b=%s): pass" % string)[0]["arguments"][0]["value"], parent=parent, on_attribute=on_attribute) if string else ""
+            return Node.from_fst(parse_fragment("def a(b=%s): pass" % string)[0]["arguments"][0]["value"], parent=parent, on_attribute=on_attribute) if string else ""
 
         elif on_attribute == "target":
-            return Node.from_fst(baron.parse("def a(%s=b): pass" % string)[0]["arguments"][0]["target"], parent=parent, on_attribute=on_attribute) if string else ""
+            return Node.from_fst(parse_fragment("def a(%s=b): pass" % string)[0]["arguments"][0]["target"], parent=parent, on_attribute=on_attribute) if string else ""
 
         elif on_attribute == "annotation":
             if not self.annotation_first_formatting:
@@ -364,7 +365,7 @@ class DefArgumentNode(Node):
             if not self.annotation_second_formatting:
                 self.annotation_second_formatting = [Node.from_fst({"type": "space", "value": " "}, on_attribute="annotation_second_formatting", parent=self)]
 
-            return Node.from_fst(baron.parse("def a(a:%s=b): pass" % string)[0]["arguments"][0]["annotation"], parent=parent, on_attribute=on_attribute) if string else ""
+            return Node.from_fst(parse_fragment("def a(a:%s=b): pass" % string)[0]["arguments"][0]["annotation"], parent=parent, on_attribute=on_attribute) if string else ""
 
         else:
             raise Exception("Unhandled case")
@@ -373,7 +374,7 @@ class DefArgumentNode(Node):
 class DelNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("del %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("del %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -382,7 +383,7 @@ class DelNode(Node):
 class DictArgumentNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("a(**%s)" % string)[0]["value"][1]["value"][0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("a(**%s)" % string)[0]["value"][1]["value"][0]["value"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "annotation":
             if not self.annotation_first_formatting:
@@ -391,7 +392,7 @@ class DictArgumentNode(Node):
             if not self.annotation_second_formatting:
                 self.annotation_second_formatting = [Node.from_fst({"type": "space", "value": " "}, on_attribute="annotation_second_formatting", parent=self)]
 
-            return Node.from_fst(baron.parse("def a(a:%s=b): pass" % string)[0]["arguments"][0]["annotation"], parent=parent, on_attribute=on_attribute) if string else ""
+            return Node.from_fst(parse_fragment("def a(a:%s=b): pass" % string)[0]["arguments"][0]["annotation"], parent=parent, on_attribute=on_attribute) if string else ""
 
         else:
             raise Exception("Unhandled case")
@@ -400,10 +401,10 @@ class DictArgumentNode(Node):
 class DictitemNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("{a: %s}" % string)[0]["value"][0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("{a: %s}" % string)[0]["value"][0]["value"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "key":
-            return Node.from_fst(baron.parse("{%s: a}" % string)[0]["value"][0]["key"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("{%s: a}" % string)[0]["value"][0]["key"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -411,7 +412,7 @@ class DictitemNode(Node):
 
 class DictNode(Node, LiteralyEvaluable):
     def _string_to_node_list(self, string, parent, on_attribute):
-        fst = baron.parse("{%s}" % string)[0]["value"]
+        fst = parse_fragment("{%s}" % string)[0]["value"]
         return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
     def __setattr__(self, key, value):
@@ -424,7 +425,7 @@ class DictNode(Node, LiteralyEvaluable):
 class DictComprehensionNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "generators":
-            fst = baron.parse("{x %s}" % string)[0]["generators"]
+            fst = parse_fragment("{x %s}" % string)[0]["generators"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         else:
@@ -432,7 +433,7 @@ class DictComprehensionNode(Node):
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "result":
-            return Node.from_fst(baron.parse("{%s for x in x}" % string)[0]["result"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("{%s for x in x}" % string)[0]["result"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -459,7 +460,7 @@ class DottedAsNameNode(Node):
 
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "value":
-            fst = baron.parse("import %s" % string)[0]["value"][0]["value"]
+            fst = parse_fragment("import %s" % string)[0]["value"][0]["value"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         else:
@@ -473,7 +474,7 @@ class DottedNameNode(Node):
 class ElifNode(IfElseBlockSiblingNode):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "test":
-            return Node.from_fst(baron.parse("if %s: pass" % string)[0]["value"][0]["test"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("if %s: pass" % string)[0]["value"][0]["test"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -513,7 +514,7 @@ class ElseNode(IfElseBlockSiblingNode):
 
 class EndlNode(Node):
     def __repr__(self):
-        return repr(baron.dumps([self.fst()]))
+        return repr(self.dumps())
 
     def _bytes_repr_html_(self):
         return python_html_highlight(self.__repr__())
@@ -562,7 +563,7 @@ class ExceptNode(CodeBlockNode):
         if on_attribute == "exception":
             if string:
                 self.first_formatting = [Node.from_fst({"type": "space", "value": " "}, on_attribute=on_attribute, parent=parent)]
-                return Node.from_fst(baron.parse("try: pass\nexcept %s: pass" % string)[0]["excepts"][0]["exception"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("try: pass\nexcept %s: pass" % string)[0]["excepts"][0]["exception"], parent=parent, on_attribute=on_attribute)
             else:
                 self.first_formatting = []
                 self.delimiter = ""
@@ -577,7 +578,7 @@ class ExceptNode(CodeBlockNode):
                 self.delimiter = "as"
                 self.second_formatting = [Node.from_fst({"type": "space", "value": " "}, on_attribute=on_attribute, parent=parent)]
                 self.third_formatting = [Node.from_fst({"type": "space", "value": " "}, on_attribute=on_attribute, parent=parent)]
-                return Node.from_fst(baron.parse("try: pass\nexcept a as %s: pass" % string)[0]["excepts"][0]["target"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("try: pass\nexcept a as %s: pass" % string)[0]["excepts"][0]["target"], parent=parent, on_attribute=on_attribute)
 
             else:
                 self.delimiter = ""
@@ -592,13 +593,13 @@ class ExceptNode(CodeBlockNode):
 class ExecNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("exec %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("exec %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "globals":
             if string:
                 self.second_formatting = [{"type": "space", "value": " "}]
                 self.third_formatting = [{"type": "space", "value": " "}]
-                return Node.from_fst(baron.parse("exec a in %s" % string)[0]["globals"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("exec a in %s" % string)[0]["globals"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "locals":
             if not self.globals:
@@ -606,7 +607,7 @@ class ExecNode(Node):
 
             if string:
                 self.fifth_formatting = [{"type": "space", "value": " "}]
-                return Node.from_fst(baron.parse("exec a in b, %s" % string)[0]["locals"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("exec a in b, %s" % string)[0]["locals"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -650,10 +651,10 @@ class ForNode(ElseAttributeNode):
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "target":
-            return Node.from_fst(baron.parse("for i in %s: pass" % string)[0]["target"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("for i in %s: pass" % string)[0]["target"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "iterator":
-            return Node.from_fst(baron.parse("for %s in i: pass" % string)[0]["iterator"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("for %s in i: pass" % string)[0]["iterator"], parent=parent, on_attribute=on_attribute)
 
         else:
             return super(ForNode, self)._string_to_node(string, parent, on_attribute)
@@ -712,11 +713,11 @@ class FromImportNode(Node):
 
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "targets":
-            fst = baron.parse("from a import %s" % string)[0]["targets"]
+            fst = parse_fragment("from a import %s" % string)[0]["targets"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         if on_attribute == "value":
-            fst = baron.parse("from %s import s" % string)[0]["value"]
+            fst = parse_fragment("from %s import s" % string)[0]["value"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         else:
@@ -735,7 +736,7 @@ class FromImportNode(Node):
 class GeneratorComprehensionNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "generators":
-            fst = baron.parse("(x %s)" % string)[0]["generators"]
+            fst = parse_fragment("(x %s)" % string)[0]["generators"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         else:
@@ -743,7 +744,7 @@ class GeneratorComprehensionNode(Node):
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "result":
-            return Node.from_fst(baron.parse("(%s for x in x)" % string)[0]["result"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("(%s for x in x)" % string)[0]["result"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -752,13 +753,13 @@ class GeneratorComprehensionNode(Node):
 class GetitemNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("a[%s]" % string)[0]["value"][1]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("a[%s]" % string)[0]["value"][1]["value"], parent=parent, on_attribute=on_attribute)
 
 
 class GlobalNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "value":
-            fst = baron.parse("global %s" % string)[0]["value"]
+            fst = parse_fragment("global %s" % string)[0]["value"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         else:
@@ -778,7 +779,7 @@ class HexaNode(Node, LiteralyEvaluable):
 class IfNode(IfElseBlockSiblingNode):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "test":
-            return Node.from_fst(baron.parse("if %s: pass" % string)[0]["value"][0]["test"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("if %s: pass" % string)[0]["value"][0]["test"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -803,7 +804,7 @@ class IfelseblockNode(Node):
         if indentation:
             string = "\n".join(map(lambda x: x[indentation:], string.split("\n")))
 
-        result = NodeList.from_fst(baron.parse(string)[0]["value"], parent=parent, on_attribute=on_attribute)
+        result = NodeList.from_fst(parse_fragment(string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         if self.indentation:
             result.increase_indentation(len(self.indentation))
@@ -823,7 +824,7 @@ class ImportNode(Node):
         return [x.target if x.target else x.value.dumps() for x in self('dotted_as_name')]
 
     def _string_to_node_list(self, string, parent, on_attribute):
-        fst = baron.parse("import %s" % string)[0]["value"]
+        fst = parse_fragment("import %s" % string)[0]["value"]
         return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
     def __setattr__(self, key, value):
@@ -858,7 +859,7 @@ class LambdaNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "arguments":
             self.first_formatting = [{"type": "space", "value": " "}] if string else []
-            fst = baron.parse("lambda %s: x" % string)[0]["arguments"]
+            fst = parse_fragment("lambda %s: x" % string)[0]["arguments"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         else:
@@ -866,7 +867,7 @@ class LambdaNode(Node):
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("lambda: %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("lambda: %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -885,7 +886,7 @@ class LeftParenthesisNode(Node):
 class ListArgumentNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("lambda *%s: x" % string)[0]["arguments"][0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("lambda *%s: x" % string)[0]["arguments"][0]["value"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "annotation":
             if not self.annotation_first_formatting:
@@ -894,7 +895,7 @@ class ListArgumentNode(Node):
             if not self.annotation_second_formatting:
                 self.annotation_second_formatting = [Node.from_fst({"type": "space", "value": " "}, on_attribute="annotation_second_formatting", parent=self)]
 
-            return Node.from_fst(baron.parse("def a(a:%s=b): pass" % string)[0]["arguments"][0]["annotation"], parent=parent, on_attribute=on_attribute) if string else ""
+            return Node.from_fst(parse_fragment("def a(a:%s=b): pass" % string)[0]["arguments"][0]["annotation"], parent=parent, on_attribute=on_attribute) if string else ""
 
         else:
             raise Exception("Unhandled case")
@@ -903,7 +904,7 @@ class ListArgumentNode(Node):
 class ListComprehensionNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "generators":
-            fst = baron.parse("[x %s]" % string)[0]["generators"]
+            fst = parse_fragment("[x %s]" % string)[0]["generators"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         else:
@@ -911,7 +912,7 @@ class ListComprehensionNode(Node):
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "result":
-            return Node.from_fst(baron.parse("[%s for x in x]" % string)[0]["result"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("[%s for x in x]" % string)[0]["result"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -919,7 +920,7 @@ class ListComprehensionNode(Node):
 
 class ListNode(Node, LiteralyEvaluable):
     def _string_to_node_list(self, string, parent, on_attribute):
-        fst = baron.parse("[%s]" % string)[0]["value"]
+        fst = parse_fragment("[%s]" % string)[0]["value"]
         return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
     def __setattr__(self, key, value):
@@ -961,7 +962,7 @@ class NameAsNameNode(Node):
 class NonlocalNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "value":
-            fst = baron.parse("global %s" % string)[0]["value"]
+            fst = parse_fragment("global %s" % string)[0]["value"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         else:
@@ -987,11 +988,11 @@ class PrintNode(Node):
         if on_attribute == "destination":
             if string and not self.value:
                 self.formatting = [{"type": "space", "value": " "}]
-                return Node.from_fst(baron.parse("print >>%s" % string)[0]["destination"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("print >>%s" % string)[0]["destination"], parent=parent, on_attribute=on_attribute)
 
             elif string and self.value:
                 self.formatting = [{"type": "space", "value": " "}]
-                result = Node.from_fst(baron.parse("print >>%s" % string)[0]["destination"], parent=parent, on_attribute=on_attribute)
+                result = Node.from_fst(parse_fragment("print >>%s" % string)[0]["destination"], parent=parent, on_attribute=on_attribute)
                 if len(self.value.node_list) and not self.value.node_list[0].type == "comma":
                     self.value = NodeList([Node.from_fst({"type": "comma", "second_formatting": [{"type": "space", "value": " "}], "first_formatting": []}, parent=parent, on_attribute=on_attribute)]) + self.value
                 return result
@@ -1012,7 +1013,7 @@ class PrintNode(Node):
             if string:
                 self.formatting = [{"type": "space", "value": " "}]
 
-                fst = baron.parse(("print %s" if not self.destination else "print >>a, %s") % string)[0]["value"]
+                fst = parse_fragment(("print %s" if not self.destination else "print >>a, %s") % string)[0]["value"]
                 return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
             else:
                 self.formatting = [] if not string and not self.destination else [{"type": "space", "value": " "}]
@@ -1033,7 +1034,7 @@ class RaiseNode(Node):
         if on_attribute == "value":
             self.first_formatting = [{"type": "space", "value": " "}] if string else []
             if string:
-                return Node.from_fst(baron.parse("raise %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("raise %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "instance":
             if not self.value:
@@ -1043,7 +1044,7 @@ class RaiseNode(Node):
                 self.third_formatting = [{"type": "space", "value": " "}]
                 if not self.comma_or_from:
                     self.comma_or_from = ","
-                return Node.from_fst(baron.parse("raise a, %s" % string)[0]["instance"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("raise a, %s" % string)[0]["instance"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "traceback":
             if not self.instance:
@@ -1051,7 +1052,7 @@ class RaiseNode(Node):
 
             if string:
                 self.fifth_formatting = [{"type": "space", "value": " "}]
-                return Node.from_fst(baron.parse("raise a, b, %s" % string)[0]["traceback"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("raise a, b, %s" % string)[0]["traceback"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -1085,7 +1086,7 @@ class RightParenthesisNode(Node):
 
 class ReprNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
-        fst = baron.parse("`%s`" % string)[0]["value"]
+        fst = parse_fragment("`%s`" % string)[0]["value"]
         return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
     def __setattr__(self, key, value):
@@ -1100,7 +1101,7 @@ class ReturnNode(Node):
         if on_attribute == "value":
             self.formatting = [{"type": "space", "value": " "}] if string else []
             if string:
-                return Node.from_fst(baron.parse("return %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("return %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -1112,7 +1113,7 @@ class SemicolonNode(Node):
 
 class SetNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
-        fst = baron.parse("{%s}" % string)[0]["value"]
+        fst = parse_fragment("{%s}" % string)[0]["value"]
         return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
     def __setattr__(self, key, value):
@@ -1125,7 +1126,7 @@ class SetNode(Node):
 class SetComprehensionNode(Node):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "generators":
-            fst = baron.parse("{x %s}" % string)[0]["generators"]
+            fst = parse_fragment("{x %s}" % string)[0]["generators"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         else:
@@ -1133,7 +1134,7 @@ class SetComprehensionNode(Node):
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "result":
-            return Node.from_fst(baron.parse("{%s for x in x}" % string)[0]["result"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("{%s for x in x}" % string)[0]["result"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -1143,16 +1144,16 @@ class SliceNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "lower":
             if string:
-                return Node.from_fst(baron.parse("a[%s:]" % string)[0]["value"][1]["value"]["lower"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("a[%s:]" % string)[0]["value"][1]["value"]["lower"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "upper":
             if string:
-                return Node.from_fst(baron.parse("a[:%s]" % string)[0]["value"][1]["value"]["upper"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("a[:%s]" % string)[0]["value"][1]["value"]["upper"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "step":
             self.has_two_colons = bool(string)
             if string:
-                return Node.from_fst(baron.parse("a[::%s]" % string)[0]["value"][1]["value"]["step"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("a[::%s]" % string)[0]["value"][1]["value"]["step"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -1160,7 +1161,7 @@ class SliceNode(Node):
 
 class SpaceNode(Node):
     def __repr__(self):
-        return repr(baron.dumps([self.fst()]))
+        return repr(self.dumps())
 
 
 class StandaloneAnnotationNode(Node):
@@ -1182,7 +1183,7 @@ class StringNode(Node, LiteralyEvaluable):
 class StringChainNode(Node, LiteralyEvaluable):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "value":
-            fst = baron.parse("a = %s" % string)[0]["value"]["value"]
+            fst = parse_fragment("a = %s" % string)[0]["value"]["value"]
             return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
         else:
@@ -1192,13 +1193,13 @@ class StringChainNode(Node, LiteralyEvaluable):
 class TernaryOperatorNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "first":
-            return Node.from_fst(baron.parse("%s if b else c" % string)[0]["first"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("%s if b else c" % string)[0]["first"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "second":
-            return Node.from_fst(baron.parse("a if b else %s" % string)[0]["second"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("a if b else %s" % string)[0]["second"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "value":
-            return Node.from_fst(baron.parse("a if %s else s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("a if %s else s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -1233,7 +1234,7 @@ class TryNode(ElseAttributeNode):
         elif self.next:
             string += "\n"
 
-        result = NodeList.from_fst(baron.parse("try:\n pass\n%sfinally:\n pass" % string)[0]["excepts"], parent=parent, on_attribute=on_attribute)
+        result = NodeList.from_fst(parse_fragment("try:\n pass\n%sfinally:\n pass" % string)[0]["excepts"], parent=parent, on_attribute=on_attribute)
 
         if self.indentation:
             result.increase_indentation(len(self.indentation))
@@ -1274,12 +1275,12 @@ class TryNode(ElseAttributeNode):
 
 class TupleNode(Node, LiteralyEvaluable):
     def _string_to_node_list(self, string, parent, on_attribute):
-        fst = baron.parse("(%s)" % string)[0]["value"]
+        fst = parse_fragment("(%s)" % string)[0]["value"]
 
         # I assume that I've got an AssociativeParenthesisNode here instead of a tuple
         # because string is only one single element
         if not isinstance(fst, list):
-            fst = baron.parse("(%s,)" % string)[0]["value"]
+            fst = parse_fragment("(%s,)" % string)[0]["value"]
 
         return NodeList.from_fst(fst, parent=parent, on_attribute=on_attribute)
 
@@ -1301,7 +1302,7 @@ class UnicodeRawStringNode(Node, LiteralyEvaluable):
 class UnitaryOperatorNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "target":
-            return Node.from_fst(baron.parse("-%s" % string)[0]["target"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("-%s" % string)[0]["target"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -1312,7 +1313,7 @@ class YieldNode(Node):
         if on_attribute == "value":
             self.formatting = [{"type": "space", "value": " "}] if string else []
             if string:
-                return Node.from_fst(baron.parse("yield %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("yield %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -1321,7 +1322,7 @@ class YieldNode(Node):
 class YieldFromNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("yield from %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("yield from %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -1332,7 +1333,7 @@ class YieldAtomNode(Node):
         if on_attribute == "value":
             self.second_formatting = [{"type": "space", "value": " "}] if string else []
             if string:
-                return Node.from_fst(baron.parse("yield %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("yield %s" % string)[0]["value"], parent=parent, on_attribute=on_attribute)
 
         else:
             raise Exception("Unhandled case")
@@ -1348,7 +1349,7 @@ class WhileNode(ElseAttributeNode):
 
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "test":
-            return Node.from_fst(baron.parse("while %s: pass" % string)[0]["test"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("while %s: pass" % string)[0]["test"], parent=parent, on_attribute=on_attribute)
 
         else:
             return super(WhileNode, self)._string_to_node(string, parent, on_attribute)
@@ -1364,13 +1365,13 @@ class WhileNode(ElseAttributeNode):
 class WithContextItemNode(Node):
     def _string_to_node(self, string, parent, on_attribute):
         if on_attribute == "value":
-            return Node.from_fst(baron.parse("with %s: pass" % string)[0]["contexts"][0]["value"], parent=parent, on_attribute=on_attribute)
+            return Node.from_fst(parse_fragment("with %s: pass" % string)[0]["contexts"][0]["value"], parent=parent, on_attribute=on_attribute)
 
         elif on_attribute == "as":
             if string:
                 self.first_formatting = [{"type": "space", "value": " "}]
                 self.second_formatting = [{"type": "space", "value": " "}]
-                return Node.from_fst(baron.parse("with a as %s: pass" % string)[0]["contexts"][0]["as"], parent=parent, on_attribute=on_attribute)
+                return Node.from_fst(parse_fragment("with a as %s: pass" % string)[0]["contexts"][0]["as"], parent=parent, on_attribute=on_attribute)
             else:
                 self.first_formatting = []
                 self.second_formatting = []
@@ -1395,7 +1396,7 @@ class WithContextItemNode(Node):
 class WithNode(CodeBlockNode):
     def _string_to_node_list(self, string, parent, on_attribute):
         if on_attribute == "contexts":
-            return NodeList.from_fst(baron.parse("with %s: pass" % string)[0]["contexts"], parent=parent, on_attribute=on_attribute)
+            return NodeList.from_fst(parse_fragment("with %s: pass" % string)[0]["contexts"], parent=parent, on_attribute=on_attribute)
 
         else:
             return super(WithNode, self)._string_to_node_list(string, parent, on_attribute)
@@ -0,0 +1,244 @@
+from __future__ import absolute_import
+
+import time
+import pickle
+import difflib
+import traceback
+
+from redbaron.cache import parse_cache
+from redbaron.redbaron import RedBaron
+
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+    # python 2 without the "futures" backport
+    ProcessPoolExecutor = None
+
+
+__all__ = ["load_many", "run_codemod", "LoadResult", "CodemodResult"]
+
+
+class LoadResult(object):
+    """
+    What load_many() got for one file: its path, its tree (red) or what the
+    callback returned for it (value), and error, the exception raised while
+    reading or parsing the file or in the callback (None if everything went
+    fine) with traceback, its formatted traceback.
+    """
+
+    def __init__(self, path, red=None, value=None, error=None, traceback=None):
+        self.path = path
+        self.red = red
+        self.value = value
+        self.error = error
+        self.traceback = traceback
+
+    def __repr__(self):
+        if self.error is not None:
+            return "<LoadResult %s, %s: %s>" % (self.path, type(self.error).__name__, self.error)
+        return "<LoadResult %s>" % self.path
+
+
+class CodemodResult(object):
+    """
+    What run_codemod() did on one file: its path, if the codemod changed its
+    code (changed), the unified diff of the change in dry run mode (diff),
+    what the codemod returned (value), the exception that stopped it (error,
+    None if there was none) with its formatted traceback, and timings, the
+    seconds spent to "parse" the file, to "transform" it with the codemod and
+    to "dump" it.
+    """
+
+    def __init__(self, path, changed=False, diff=None, value=None, error=None, traceback=None, timings=None):
+        self.path = path
+        self.changed = changed
+        self.diff = diff
+        self.value = value
+        self.error = error
+        self.traceback = traceback
+        self.timings = timings if timings is not None else {}
+
+    @property
+    def duration(self):
+        return sum(self.timings.values())
+
+    def __repr__(self):
+        if self.error is not None:
+            return "<CodemodResult %s, %s: %s>" % (self.path, type(self.error).__name__, self.error)
+        return "<CodemodResult %s, %s, %.3fs>" % (self.path, "changed" if self.changed else "unchanged", self.duration)
+
+
+def load_many(paths, workers=None, callback=None, lazy=False):
+    """
+    Load the python files of paths in a pool of worker processes (workers of
+    them, the number of processors by default). The workers read and parse
+    the files, which is most of the work, and send back their fst from which
+    the trees are built in this process.
+
+    With a callback, callback(red) is called in the worker on the tree of
+    each file instead and only its return value is sent back. Both have to be
+    picklable: the callback has to be defined at the top level of a module.
+
+    Return a list of LoadResult, one per path, in the same order. A file that
+    can't be read or parsed, or on which the callback fails, doesn't stop the
+    others, its LoadResult holds the error.
+
+    lazy is given to RedBaron (see RedBaron.__init__), workers=1 does
+    everything in this process.
+    """
+    if callback is not None and workers != 1:
+        # a lambda or a nested function would fail in every worker
+        pickle.dumps(callback)
+
+    results = []
+    for path, outcome, error, formatted_traceback in _in_workers(_load_file, paths, (callback, lazy), workers):
+        if error is not None:
+            outcome = (None, None, error, formatted_traceback)
+        results.append(_result(path, outcome, lazy))
+
+    return results
+
+
+def run_codemod(function, paths, jobs=None, dry_run=False, lazy=False):
+    """
+    Run function(red) on the tree of each file of paths and write the code of
+    the tree back to the file if it changed (atomically, see dump_to). The
+    files are handled in a pool of jobs worker processes (the number of
+    processors by default), function has to be picklable: defined at the top
+    level of a module.
+
+    With dry_run=True no file is written, the result of a changed file holds
+    the unified diff of the change instead.
+
+    Return a list of CodemodResult, one per path, in the same order. A file
+    that can't be read or parsed, or on which function fails, is left as it
+    is and doesn't stop the others, its CodemodResult holds the error.
+
+    lazy is given to RedBaron (see RedBaron.__init__), jobs=1 does
+    everything in this process.
+    """
+    if jobs != 1:
+        # a lambda or a nested function would fail in every worker
+        pickle.dumps(function)
+
+    results = []
+    for path, result, error, formatted_traceback in _in_workers(_codemod_file, paths, (function, dry_run, lazy), jobs):
+        if error is not None:
+            result = CodemodResult(path, error=error, traceback=formatted_traceback)
+        results.append(result)
+
+    return results
+
+
+def _in_workers(function, paths, arguments, workers):
+    """
+    Call function(path, *arguments) for each path in a pool of workers
+    processes (in this process for workers=1) and yield, in the order of
+    paths, (path, return value, None, None), or (path, None, exception,
+    formatted traceback) if the pool couldn't make the call (for example
+    because a worker died or the return value can't be pickled).
+    """
+    paths = list(paths)
+
+    if workers == 1:
+        for path in paths:
+            yield path, function(path, *arguments), None, None
+        return
+
+    if ProcessPoolExecutor is None:
+        raise ImportError("worker processes need concurrent.futures, install the 'futures' package on python 2")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(function, path, *arguments) for path in paths]
+        for index, path in enumerate(paths):
+            future = futures[index]
+            # the return value isn't kept once the caller is done with it
+            futures[index] = None
+            try:
+                outcome = future.result()
+            except Exception as exception:
+                yield path, None, exception, traceback.format_exc()
+            else:
+                yield path, outcome, None, None
+
+
+def _load_file(path, callback, lazy):
+    """
+    Load one file, in a worker. Return (fst, value, error, traceback): the
+    fst without callback, the return value of the callback otherwise.
+    """
+    try:
+        with open(path, "r") as file_object:
+            fst = parse_cache.parse(file_object.read())
+
+        if callback is None:
+            return fst, None, None, None
+
+        return None, callback(RedBaron.from_fst(fst, lazy=lazy)), None, None
+
+    except Exception as exception:
+        return None, None, _picklable(exception), traceback.format_exc()
+
+
+def _codemod_file(path, function, dry_run, lazy):
+    """
+    Run the codemod function on one file, in a worker.
+    """
+    result = CodemodResult(path)
+
+    try:
+        start = time.time()
+        with open(path, "r") as file_object:
+            source = file_object.read()
+        red = RedBaron(source, lazy=lazy)
+        # the code as baron gives it back, which can differ from source by a
+        # final newline: this is not a change made by the codemod, neither to
+        # report in changed nor in the diff
+        before = red.dumps()
+        result.timings["parse"] = time.time() - start
+
+        start = time.time()
+        result.value = function(red)
+        result.timings["transform"] = time.time() - start
+
+        start = time.time()
+        after = red.dumps()
+        result.changed = after != before
+        if result.changed:
+            if dry_run:
+                result.diff = "".join(difflib.unified_diff(before.splitlines(True), after.splitlines(True),
+                                                           path, path))
+            else:
+                red.dump_to(path, atomic=True)
+        result.timings["dump"] = time.time() - start
+
+    except Exception as exception:
+        result.error = _picklable(exception)
+        result.traceback = traceback.format_exc()
+
+    return result
+
+
+def _picklable(exception):
+    """
+    Return exception if it can be sent back from a worker, an Exception with
+    the same message otherwise.
+    """
+    try:
+        pickle.loads(pickle.dumps(exception))
+    except Exception:
+        return Exception("%s: %s" % (type(exception).__name__, exception))
+    return exception
+
+
+def _result(path, outcome, lazy):
+    fst, value, error, formatted_traceback = outcome
+    red = None
+
+    if fst is not None:
+        try:
+            red = RedBaron.from_fst(fst, lazy=lazy)
+        except Exception as exception:
+            error, formatted_traceback = exception, traceback.format_exc()
+
+    return LoadResult(path, red=red, value=value, error=error, traceback=formatted_traceback)
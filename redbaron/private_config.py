@@ -1,8 +1,24 @@
 from __future__ import absolute_import
 
+import os
+
 import redbaron
 
 
+# compact mode: node classes get __slots__ instead of a __dict__, this is
+# decided once at import time since it changes the classes themselves
+compact_nodes = os.environ.get("REDBARON_COMPACT_NODES", "") not in ("", "0")
+
+# initial size of redbaron.fragment_cache, the cache of the parsed pieces of
+# code given to node attributes, 0 disables it
+fragment_cache_size = int(os.environ.get("REDBARON_FRAGMENT_CACHE_SIZE", "512"))
+
+# directory of redbaron.parse_cache, the cache on disk of the parsed source
+# codes, disabled when not set, and the size it can take in megabytes
+parse_cache_directory = os.environ.get("REDBARON_PARSE_CACHE") or None
+parse_cache_size = int(os.environ.get("REDBARON_PARSE_CACHE_SIZE", "256")) * 1024 * 1024
+
+
 def runned_from_ipython():
     # for testing
     if redbaron.force_ipython_behavior:
@@ -1,10 +1,14 @@
 from __future__ import absolute_import
 
+import bisect
+
 import baron
 import baron.path
 from baron.utils import string_instance
 
-from redbaron import nodes, base_nodes
+from redbaron import base_nodes
+from redbaron.cache import parse_cache
+from redbaron.utils import common_prefix_length, common_suffix_length
 
 
 # TODO
@@ -29,33 +33,162 @@ from redbaron import nodes, base_nodes
 
 
 class RedBaron(base_nodes.GenericNodesUtils, base_nodes.LineProxyList):
-    def __init__(self, source_code):
-        self.first_blank_lines = []  # XXX might need changes
+    _middle_separator_fst = {"type": "endl", "formatting": [], "value": "\n", "indent": ""}
+    _lazy = False
+
+    def __init__(self, source_code, lazy=False):
+        """
+        The source code is parsed by baron, or loaded from redbaron.parse_cache
+        when it is enabled.
 
+        With lazy=True, the bodies of the functions and classes are kept as
+        fst and only turned into nodes when they are accessed: the rendering
+        and the fst of the tree don't need them and find() only goes in the
+        bodies that may hold what it is looking for.
+        """
         if isinstance(source_code, string_instance):
-            self.node_list = base_nodes.NodeList.from_fst(baron.parse(source_code), parent=self, on_attribute="root")
-            self.middle_separator = nodes.DotNode({"type": "endl", "formatting": [], "value": "\n", "indent": ""})
-
-            self.data = []
-            previous = None
-            for i in self.node_list:
-                if i.type != "endl":
-                    self.data.append([i, []])
-                elif previous and previous.type == "endl":
-                    self.data.append([previous, []])
-                elif previous is None and i.type == "endl":
-                    self.data.append([i, []])
-                elif self.data:
-                    self.data[-1][1].append(i)
-
-                previous = i
-            self.node_list.parent = None
+            self._init_from_fst(parse_cache.parse(source_code), lazy)
         else:
+            self.first_blank_lines = []  # XXX might need changes
             # Might be init from same object, or slice
             super(RedBaron, self).__init__(source_code)
+            self.on_attribute = None
+            self.parent = None
+
+    @classmethod
+    def from_fst(klass, fst, lazy=False):
+        """
+        Build the tree of a module from its fst, as returned by baron.parse,
+        instead of from its source code.
+        """
+        red = klass.__new__(klass)
+        red._init_from_fst(fst, lazy)
+        return red
+
+    def _init_from_fst(self, fst, lazy):
+        self.first_blank_lines = []  # XXX might need changes
+        self._lazy = lazy
+        self.node_list = base_nodes.NodeList.from_fst(fst, parent=self, on_attribute="root", lazy=lazy)
+        self.data = self._build_root_list(self.node_list)
+        self.node_list.parent = None
         self.on_attribute = None
         self.parent = None
 
+    def _build_root_list(self, node_list):
+        data = []
+        previous = None
+        for i in node_list:
+            if i.type != "endl":
+                data.append([i, []])
+            elif previous and previous.type == "endl":
+                data.append([previous, []])
+            elif previous is None and i.type == "endl":
+                data.append([i, []])
+            elif data:
+                data[-1][1].append(i)
+
+            previous = i
+        return data
+
+    def reparse(self, new_source):
+        """
+        Make this tree the tree of new_source, a modified version of its
+        code, by only parsing again the top level statements touched by the
+        modification: the other statements are kept as they are (same nodes,
+        same caches). Meant for editors, where the code changes a few
+        characters at a time.
+
+        If the modified part can't be parsed on its own, the whole code is
+        parsed again (and its exceptions are raised, the tree is left as it
+        was).
+        """
+        old_source = self.dumps()
+        if new_source == old_source:
+            return
+
+        nodes = self.node_list.data
+        offsets = []
+        offset = 0
+        for node in nodes:
+            offsets.append(offset)
+            offset += len(node.dumps())
+
+        prefix = common_prefix_length(old_source, new_source)
+        suffix = common_suffix_length(old_source, new_source, min(len(old_source), len(new_source)) - prefix)
+
+        # the statements from the one before the modification to the one
+        # after it, extended to statements that start a line at the top level
+        # and that would be parsed the same way whatever comes before them
+        def starts_a_statement(index):
+            if index == 0 or index == len(nodes):
+                return True
+            return nodes[index].type not in ("endl", "comment") and old_source[offsets[index] - 1] == "\n"
+
+        start = max(bisect.bisect_right(offsets, prefix - 1) - 1, 0)
+        while not starts_a_statement(start):
+            start -= 1
+
+        stop = bisect.bisect_right(offsets, max(len(old_source) - suffix, prefix + 1) - 1)
+        while not starts_a_statement(stop):
+            stop += 1
+
+        begin = offsets[start] if start < len(nodes) else len(old_source)
+        end = (offsets[stop] if stop < len(nodes) else len(old_source)) + len(new_source) - len(old_source)
+
+        # when there is code after the modified part, it starts with a
+        # statement at the beginning of a line: the modified part is parsed
+        # followed by such a statement ("pass") to be parsed as in the whole
+        # code and not as the end of a module (where baron accepts, for
+        # example, an "if" without body)
+        following = "pass\n" if stop < len(nodes) else ""
+        old_end = end + len(old_source) - len(new_source)
+
+        # baron parses "print" as a statement or as a function for the whole
+        # module at once (the function if the statement doesn't parse
+        # somewhere): the modified part can only be parsed alone if it
+        # doesn't involve print or if the rest of the code doesn't
+        print_elsewhere = old_source.find("print", 0, begin) != -1 or old_source.find("print", old_end) != -1
+        print_modified = "print" in old_source[begin:old_end] or "print" in new_source[begin:end]
+
+        new_nodes = None
+        if not (print_elsewhere and print_modified):
+            try:
+                fst = baron.parse(new_source[begin:end] + following)
+                if following:
+                    if [x["type"] for x in fst[-2:]] != ["pass", "endl"]:
+                        raise ValueError()
+                    fst = fst[:-2]
+                new_nodes = base_nodes.NodeList.from_fst(fst, parent=self, on_attribute="root", lazy=self._lazy)
+            except Exception:
+                new_nodes = None
+
+        if new_nodes is None or new_nodes.dumps() != new_source[begin:end]:
+            # the parse of the modified part depends on the rest of the code
+            start, stop = 0, len(nodes)
+            new_nodes = base_nodes.NodeList.from_fst(parse_cache.parse(new_source), parent=self, on_attribute="root",
+                                                     lazy=self._lazy)
+
+        old_nodes = nodes[start:stop]
+        nodes[start:stop] = new_nodes.data
+        self.data = self._build_root_list(self.node_list)
+        self._positions_cache = None
+        self.node_list._tree_modified(old_nodes, new_nodes.data)
+
+    def enable_type_index(self):
+        """
+        Index the nodes of the tree by type: find/find_all on the root with a
+        plain node name (like "def" or "name") then only test the nodes of
+        this type instead of walking the whole tree. The index is kept up to
+        date on every modification of the tree, at a small cost.
+
+        On a lazy tree, the bodies left as fst aren't built to be indexed: a
+        query only builds the ones that can hold what it is looking for.
+        """
+        self.node_list._type_index = base_nodes.TypeIndex(self.node_list)
+
+    def disable_type_index(self):
+        self.node_list._type_index = None
+
     def _convert_input_to_node_object(self, value, parent, on_attribute):
         return base_nodes.GenericNodesUtils._convert_input_to_node_object(self, value, self, "root")
 
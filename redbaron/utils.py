@@ -61,3 +61,37 @@ def truncate(text, n):
     truncated[-3:-1] = ['.', '.', '.']
     del truncated[n-4 : -4]
     return "".join(truncated)
+
+
+def common_prefix_length(a, b):
+    """
+    Return the length of the longest common prefix of the strings a and b.
+
+    The search is a bisection on slices, so the characters are compared by
+    the string comparison instead of one by one in python.
+    """
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def common_suffix_length(a, b, limit=None):
+    """
+    Return the length of the longest common suffix of the strings a and b, at
+    most limit.
+    """
+    low, high = 0, min(len(a), len(b))
+    if limit is not None:
+        high = min(high, limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:len(a) - low] == b[len(b) - middle:len(b) - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
@@ -41,3 +41,46 @@ def test_decrease_indentation_single_node():
     red = RedBaron(test_indent_code)
     red.if_.value[0].decrease_indentation(3)
     assert len(red.if_.value[0].indentation) == 5
+
+
+def test_indentation_is_cached():
+    red = RedBaron(test_indent_code)
+    name = red.find("name", "plop")
+    assert name.indentation == "        "
+    assert name._indentation_cache is not None
+    assert name.get_indentation_node() is name._indentation_cache[1]
+    assert name.get_indentation_node().indent == "        "
+
+
+def test_cached_indentation_of_a_node_moved_to_another_tree():
+    a = RedBaron("def f():\n    x = 1\n")
+    b = RedBaron("def g():\n    y = 2\n")
+    for red in (a, b):
+        red.append("z = 3")
+    # the versions of the trees stamp the cached indentation
+    assert a[0]._get_tree_version() != b[0]._get_tree_version()
+
+    x = a.find("assignment")
+    assert x.indentation == "    "
+    b.append(x)
+    assert b[-1].indentation == ""
+
+
+def test_cached_indentation_follows_modifications():
+    red = RedBaron(test_indent_code)
+    plop = red.find("name", "plop")
+    pouf = red.find("name", "pouf")
+    assert plop.indentation == "        "
+    assert pouf.indentation == "    "
+
+    red.increase_indentation(4)
+    assert plop.indentation == "            "
+    assert pouf.indentation == "        "
+
+    red.find("def").value.insert(0, "a = 1")
+    assert red.find("def").value[0].indentation == "        "
+    assert red.find("def").value[0].value.indentation == "        "
+
+    red.find("def").value.pop(0)
+    del red.find("def").value[0]
+    assert pouf.indentation == "        "
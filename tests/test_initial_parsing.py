@@ -12,7 +12,8 @@ import redbaron
 from baron.render import nodes_rendering_order
 from redbaron import (RedBaron, NameNode, EndlNode, IntNode, AssignmentNode,
                       PassNode, NodeList, CommaNode, DotNode, CallNode,
-                      CommaProxyList, baron_type_to_redbaron_classname)
+                      CommaProxyList, DefNode, Query, baron_type_to_redbaron_classname)
+from redbaron.private_config import compact_nodes
 
 
 def test_all_class_are_declared():
@@ -182,6 +183,16 @@ def test_generate_helpers():
     ])
 
 
+def test_identifiers_computed_once_per_class():
+    assert DefNode._identifiers == frozenset(DefNode.generate_identifiers())
+    assert DefNode._identifiers is RedBaron("def a(): pass")[0]._identifiers
+
+    class MyNameNode(NameNode):
+        _other_identifiers = ["my_name"]
+
+    assert MyNameNode._identifiers == frozenset(["mynamenode", "myname", "my_name", "my_name_"])
+
+
 def test_assign_node_list():
     red = RedBaron("[1, 2, 3]")
     l = red[0]
@@ -311,6 +322,26 @@ def test_node_next():
     assert inner[4].next is None
 
 
+def test_node_next_previous_follow_modifications():
+    red = RedBaron("[1, 2, 3]")
+    inner = red[0].value.node_list
+    assert inner[2].next is inner[3]
+    assert red[0].value[1].index_on_parent == 1
+
+    red[0].value.insert(0, "0")
+    inner = red[0].value.node_list
+    assert inner[0].next is inner[1]
+    assert inner[2].previous is inner[1]
+    assert red[0].value[1].index_on_parent == 1
+    assert red[0].value[3].index_on_parent == 3
+
+    del red[0].value[1]
+    assert [x.index_on_parent for x in red[0].value[1:]] == [1, 2]
+    assert red[0].value.index(red[0].value[0]) == 0
+    assert red[0].value[0].next.next is red[0].value[1]
+    assert red[0].value[2].next is None
+
+
 def test_node_next_recursive():
     red = RedBaron("def a():\n    b = 1\ndef c():\n    d = 1")
     assert red[1].next is None
@@ -980,11 +1011,82 @@ def test_default_test_value_find_class():
     assert red.find("class", "b") == red.find("class", name="b")
 
 
+def test_find_compiled_query():
+    query = Query("name", value="g:po*")
+    red = RedBaron("plop\npop\npouf\nabcd")
+    assert red.find(query) is red[1]
+    assert red(query) == red("name", value="g:po*")
+    assert red[2].find(query) is red[2]
+    assert red.find_all(query, recursive=False) == red[1:3].node_list
+
+
+def test_compiled_query_reused_on_several_trees():
+    query = Query("def", "re:test_", lambda x: len(x.value) == 1)
+    assert len(RedBaron("def test_a(): pass\ndef b(): pass").find_all(query)) == 1
+    assert len(RedBaron("def test_c():\n    a\n    b\n").find_all(query)) == 0
+    assert RedBaron("class A:\n    def test_d(self): pass\n").find(query).name == "test_d"
+
+
+def test_compiled_query_classes():
+    assert Query("def").classes == frozenset([DefNode])
+    assert Query("DefNode").classes == frozenset([DefNode])
+    assert NameNode in Query("re:^[ni]").classes
+    assert Query(["def", "name"]).classes == frozenset([DefNode, NameNode])
+
+
+def test_compiled_query_doesnt_take_more_arguments():
+    red = RedBaron("a")
+    with pytest.raises(ValueError):
+        red.find(Query("name"), value="a")
+
+
+def test_find_skips_subtrees_without_the_type():
+    red = RedBaron("def a():\n    return 1\n\ndef b():\n    yield 2\n")
+    assert red[0]._subtree_types() & Query("yield").types_mask() == 0
+    assert red[1]._subtree_types() & Query("yield").types_mask() != 0
+    assert red.find("yield") is red[1].value[0]
+
+    red[0].value.append("yield 3")
+    assert red[0].find("yield") is not None
+    assert len(red.find_all("yield")) == 2
+
+    red[1].value[0].replace("pass")
+    assert red[1].find("yield") is None
+    assert len(red.find_all("yield")) == 1
+
+
 def test_copy_correct_isntance():
     red = RedBaron("a()")
     assert isinstance(red[0].value[1].copy(), CallNode)
 
 
+def test_copy_is_a_deep_copy():
+    red = RedBaron("def f(a, b=[1, 2]):\n    return a.b(c)  # d\n")
+    red.dumps()
+    copy = red[0].copy()
+    assert copy.dumps() == red[0].dumps()
+    assert copy.fst() == red[0].fst()
+    assert type(copy.arguments) is type(red[0].arguments)
+    assert type(copy.value) is type(red[0].value)
+    assert copy.arguments[1].parent is copy
+    assert copy.arguments[1].value.parent is copy.arguments[1]
+    assert copy.find("call").parent is copy.find("atomtrailers")
+
+    copy.arguments[1].value.value.append("3")
+    copy.value[0].value = "x"
+    assert copy.dumps() == "def f(a, b=[1, 2, 3]):\n    return x  # d\n"
+    assert red.dumps() == "def f(a, b=[1, 2]):\n    return a.b(c)  # d\n"
+
+
+def test_node_list_copy():
+    red = RedBaron("a = 1\nb = [2]\n")
+    copy = red.node_list.copy()
+    assert copy.dumps() == red.dumps()
+    assert copy.parent is None
+    assert all(x.parent is None for x in copy)
+    assert copy[2] is not red[1] and copy[2].value.parent is copy[2]
+
+
 def test_indentation_no_parent():
     red = RedBaron("a")
     assert red[0].copy().get_indentation_node() is None
@@ -998,6 +1100,31 @@ def test_replace():
     assert red.dumps() == "caramba"
 
 
+def test_replace_takes_the_new_children():
+    red = RedBaron("x = a\n")
+    name = red[0].value
+    replaced = name.replace("f(b, c)")
+    assert red.dumps() == "x = f(b, c)\n"
+    assert replaced.value.parent is replaced
+    assert replaced.value.node_list.parent is replaced
+    assert all(x.parent is replaced for x in replaced.value)
+    assert replaced.value[1].value.parent is replaced.value[1]
+    replaced.value[1].value.append("d")
+    assert red.dumps() == "x = f(b, c, d)\n"
+
+
+def test_replace_by_a_node_keeps_it_independent():
+    red = RedBaron("x = a\ny = b\n")
+    new_node = RedBaron("[1]")[0]
+    red[0].value.replace(new_node)
+    red[1].value.replace(new_node)
+    assert red.dumps() == "x = [1]\ny = [1]\n"
+    red[0].value.value.append("2")
+    new_node.value.append("3")
+    assert red.dumps() == "x = [1, 2]\ny = [1]\n"
+    assert new_node.dumps() == "[1, 3]"
+
+
 def test_insert_before():
     red = RedBaron("a = 1\nprint(pouet)\n")
     red.print_.insert_before("chocolat")
@@ -1024,3 +1151,25 @@ def test_insert_after_offset():
 
 def test_kwargs_only_marker_node():
     RedBaron("def a(*): pass")
+
+
+def test_key_tables_are_shared_between_instances():
+    red = RedBaron("a = 1\nb = 2\n")
+    assert red[0]._str_keys is red[1]._str_keys
+    assert red[0]._list_keys is red[1]._list_keys
+    assert red[0]._dict_keys is red[1]._dict_keys
+    assert red[0]._dict_keys == ["target", "annotation", "value"]
+
+
+@pytest.mark.skipif(compact_nodes, reason="compact nodes only hold the keys of their own type")
+def test_key_tables_of_node_built_with_another_type():
+    endl = DotNode({"type": "endl", "formatting": [], "value": "\n", "indent": ""})
+    assert endl._str_keys == ["type", "value", "indent"]
+    assert RedBaron("a.b")[0].value.node_list[1]._str_keys == ["type"]
+
+
+def test_initial_parsing_keeps_formatting_of_as():
+    assert RedBaron("import a  as  b\n").dumps() == "import a  as  b\n"
+    assert RedBaron("from a import b  as  c\n").dumps() == "from a import b  as  c\n"
+    assert RedBaron("try: pass\nexcept A  as  b: pass\n").dumps() == "try: pass\nexcept A  as  b: pass\n"
+    assert RedBaron("raise a  from  b\n").dumps() == "raise a  from  b\n"
@@ -0,0 +1,151 @@
+#!/usr/bin/python
+# -*- coding:Utf-8 -*-
+
+""" Tests load_many() and run_codemod(), several files in worker processes """
+
+import os
+
+import pytest
+
+from redbaron import RedBaron, load_many, run_codemod
+
+
+def count_defs(red):
+    return len(red.find_all("def"))
+
+
+def rename_a(red):
+    names = red.find_all("name", "a")
+    for name in names:
+        name.value = "z"
+    return len(names)
+
+
+def rename_a_and_fail(red):
+    rename_a(red)
+    raise ValueError("failed")
+
+
+@pytest.fixture
+def paths(tmpdir):
+    sources = ["def a():\n    pass\n", "x = (\n", "def b(): pass\ndef c(): pass\n"]
+    paths = []
+    for index, source in enumerate(sources):
+        path = tmpdir.join("%d.py" % index)
+        path.write(source)
+        paths.append(str(path))
+    return paths + [str(tmpdir.join("missing.py"))]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_many(paths, workers):
+    results = load_many(paths, workers=workers)
+    assert [x.path for x in results] == paths
+
+    assert results[0].error is None
+    assert results[0].red.dumps() == "def a():\n    pass\n"
+    assert results[0].red.fst() == RedBaron("def a():\n    pass\n").fst()
+    assert [x.name for x in results[2].red.find_all("def")] == ["b", "c"]
+
+    assert results[1].red is None
+    assert results[1].error is not None
+    assert "Error" in results[1].traceback
+    assert isinstance(results[3].error, (IOError, OSError))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_many_callback(paths, workers):
+    results = load_many(paths, workers=workers, callback=count_defs)
+    assert [x.value for x in results] == [1, None, 2, None]
+    assert [x.red for x in results] == [None] * 4
+    assert [x.error is None for x in results] == [True, False, True, False]
+
+
+def test_load_many_lazy(paths):
+    red = load_many(paths[:1], workers=2, lazy=True)[0].red
+    assert red[0]._unmaterialized("value") is not None
+    assert red.dumps() == "def a():\n    pass\n"
+
+
+def test_only_the_api_is_exported():
+    import redbaron
+    for name in ("load_many", "run_codemod", "LoadResult", "CodemodResult"):
+        assert hasattr(redbaron, name)
+    for name in ("difflib", "traceback", "ProcessPoolExecutor"):
+        assert not hasattr(redbaron, name)
+
+
+def test_load_many_unpicklable_callback(paths):
+    with pytest.raises(Exception):
+        load_many(paths, workers=2, callback=lambda red: None)
+
+
+@pytest.fixture
+def codemod_paths(tmpdir):
+    sources = ["a = f(a)\n", "x = (\n", "b = 1\n", "x = a  # no final newline"]
+    paths = []
+    for index, source in enumerate(sources):
+        path = tmpdir.join("%d.py" % index)
+        path.write(source)
+        paths.append(str(path))
+    return paths
+
+
+def read(path):
+    with open(path) as file_object:
+        return file_object.read()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_codemod(codemod_paths, jobs):
+    untouched = os.stat(codemod_paths[2]).st_mtime
+    results = run_codemod(rename_a, codemod_paths, jobs=jobs)
+    assert [x.path for x in results] == codemod_paths
+    assert [x.changed for x in results] == [True, False, False, True]
+    assert [x.value for x in results] == [2, None, 0, 1]
+    assert [x.diff for x in results] == [None] * 4
+
+    assert read(codemod_paths[0]) == "z = f(z)\n"
+    assert read(codemod_paths[1]) == "x = (\n"
+    assert read(codemod_paths[3]) == "x = z  # no final newline"
+    assert os.stat(codemod_paths[2]).st_mtime == untouched
+
+    assert results[1].error is not None
+    assert "Error" in results[1].traceback
+    assert sorted(results[0].timings) == ["dump", "parse", "transform"]
+    assert results[0].duration == sum(results[0].timings.values())
+
+
+def test_run_codemod_dry_run(codemod_paths):
+    results = run_codemod(rename_a, codemod_paths, jobs=2, dry_run=True)
+    assert [x.changed for x in results] == [True, False, False, True]
+    assert read(codemod_paths[0]) == "a = f(a)\n"
+    assert results[0].diff.splitlines() == [
+        "--- %s" % codemod_paths[0],
+        "+++ %s" % codemod_paths[0],
+        "@@ -1 +1 @@",
+        "-a = f(a)",
+        "+z = f(z)",
+    ]
+    assert results[2].diff is None
+
+
+def test_run_codemod_dry_run_diff_of_the_codemod_only(tmpdir):
+    # baron adds a final newline after the comment, this isn't in the diff
+    path = tmpdir.join("a.py")
+    path.write("if a:\n    pass\n# a")
+    result = run_codemod(rename_a, [str(path)], jobs=1, dry_run=True)[0]
+    assert result.changed
+    assert result.diff.splitlines()[2:] == [
+        "@@ -1,3 +1,3 @@",
+        "-if a:",
+        "+if z:",
+        "     pass",
+        " # a",
+    ]
+
+
+def test_run_codemod_failure_leaves_the_file(codemod_paths):
+    results = run_codemod(rename_a_and_fail, codemod_paths[:1], jobs=1)
+    assert isinstance(results[0].error, ValueError)
+    assert read(codemod_paths[0]) == "a = f(a)\n"
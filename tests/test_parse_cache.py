@@ -0,0 +1,158 @@
+#!/usr/bin/python
+# -*- coding:Utf-8 -*-
+
+""" Tests the cache on disk of the parsed source codes """
+
+import os
+import sys
+
+import baron
+import pytest
+
+from redbaron import RedBaron, ParseCache, cache
+
+
+@pytest.fixture
+def parse_cache(tmpdir, monkeypatch):
+    parse_cache = ParseCache(str(tmpdir.join("cache")))
+    # redbaron.redbaron is the package, because of its star imports
+    monkeypatch.setattr(sys.modules["redbaron.redbaron"], "parse_cache", parse_cache)
+    return parse_cache
+
+
+def entries(parse_cache):
+    return sorted(x for x in os.listdir(parse_cache.directory) if x.endswith(".fst"))
+
+
+def test_parse_cache(parse_cache):
+    source = "def f(a):\n    return a\n"
+    assert parse_cache.parse(source) == baron.parse(source)
+    assert (parse_cache.hits, parse_cache.misses) == (0, 1)
+    assert len(entries(parse_cache)) == 1
+
+    assert parse_cache.parse(source) == baron.parse(source)
+    assert parse_cache.parse(source) is not parse_cache.parse(source)
+    assert (parse_cache.hits, parse_cache.misses) == (3, 1)
+
+    parse_cache.parse("a = 1\n")
+    assert len(entries(parse_cache)) == 2
+
+    parse_cache.clear()
+    assert entries(parse_cache) == []
+    assert (parse_cache.hits, parse_cache.misses) == (0, 0)
+
+
+def test_parse_cache_redbaron(parse_cache):
+    source = "class A(object):\n    def f(self):\n        pass\n"
+    red = RedBaron(source)
+    cached = RedBaron(source)
+    assert parse_cache.hits == 1
+    assert cached.fst() == red.fst()
+    assert cached.dumps() == source
+
+    cached[0].name = "B"
+    assert RedBaron(source).dumps() == source
+
+
+def test_only_the_api_is_exported():
+    import redbaron
+    assert redbaron.parse_cache is cache.parse_cache
+    for name in ("zlib", "hashlib", "errno", "parse_cache_directory", "parse_cache_size"):
+        assert not hasattr(redbaron, name)
+
+
+def test_parse_cache_disabled(tmpdir):
+    parse_cache = ParseCache(None)
+    assert not parse_cache.enabled
+    assert parse_cache.parse("a = 1\n") == baron.parse("a = 1\n")
+
+    parse_cache = ParseCache(str(tmpdir), maxsize=0)
+    parse_cache.parse("a = 1\n")
+    assert os.listdir(str(tmpdir)) == []
+    assert parse_cache.misses == 0
+
+
+def test_parse_cache_syntax_error(parse_cache):
+    with pytest.raises(Exception):
+        parse_cache.parse("a = (\n")
+    assert not os.path.exists(parse_cache.directory)
+
+
+def test_parse_cache_versions(parse_cache, monkeypatch):
+    parse_cache.parse("a = 1\n")
+
+    other = ParseCache(parse_cache.directory)
+    monkeypatch.setattr(cache, "_version", lambda package: "0.0.0")
+    other.parse("a = 1\n")
+    assert other.misses == 1
+    assert len(entries(parse_cache)) == 2
+
+
+def test_parse_cache_code_of_baron(parse_cache, monkeypatch):
+    parse_cache.parse("a = 1\n")
+
+    # baron used from a checkout keeps the same version when its code changes
+    other = ParseCache(parse_cache.directory)
+    fingerprint = cache._fingerprint
+    monkeypatch.setattr(cache, "_fingerprint", lambda path: fingerprint(path) + "changed")
+    other.parse("a = 1\n")
+    assert other.misses == 1
+    assert len(entries(parse_cache)) == 2
+
+
+def test_parse_cache_broken_entry(parse_cache):
+    parse_cache.parse("a = 1\n")
+    path = os.path.join(parse_cache.directory, entries(parse_cache)[0])
+    with open(path, "wb") as file_object:
+        file_object.write(b"broken")
+
+    assert parse_cache.parse("a = 1\n") == baron.parse("a = 1\n")
+    assert parse_cache.misses == 2
+    assert parse_cache.parse("a = 1\n") == baron.parse("a = 1\n")
+    assert parse_cache.hits == 1
+
+
+def test_parse_cache_eviction(parse_cache):
+    sources = ["a%d = %d\n" % (x, x) for x in range(10)]
+    parse_cache.parse(sources[0])
+    size = os.path.getsize(os.path.join(parse_cache.directory, entries(parse_cache)[0]))
+    parse_cache.configure(parse_cache.directory, maxsize=size * 4)
+
+    for index, source in enumerate(sources[1:] + sources[:1]):
+        parse_cache.parse(source)
+        # the modification time is the last use of an entry
+        os.utime(parse_cache._path(source), (index, index))
+
+    remaining = entries(parse_cache)
+    assert 0 < len(remaining) <= 4
+    assert sum(os.path.getsize(os.path.join(parse_cache.directory, x)) for x in remaining) <= size * 4
+
+    hits = parse_cache.hits
+    parse_cache.parse(sources[0])
+    parse_cache.parse(sources[-1])
+    assert parse_cache.hits == hits + 2
+    parse_cache.parse(sources[1])
+    assert parse_cache.hits == hits + 2
+
+
+def test_parse_cache_shared_directory(parse_cache):
+    other = ParseCache(parse_cache.directory)
+    parse_cache.parse("a = 1\n")
+    assert other.parse("a = 1\n") == baron.parse("a = 1\n")
+    assert other.hits == 1
+
+    other.clear()
+    assert parse_cache.parse("a = 1\n") == baron.parse("a = 1\n")
+    assert parse_cache.misses == 2
+
+
+def test_parse_cache_stale_temporary_file(parse_cache):
+    parse_cache.parse("a = 1\n")
+    temporary = os.path.join(parse_cache.directory, ".left.tmp")
+    fresh = os.path.join(parse_cache.directory, ".writing.tmp")
+    for path in (temporary, fresh):
+        open(path, "w").close()
+    os.utime(temporary, (0, 0))
+
+    parse_cache.clear()
+    assert os.listdir(parse_cache.directory) == [".writing.tmp"]
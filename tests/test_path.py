@@ -211,3 +211,21 @@ def test_path_value_second_endl(red):
             [0, "value", 2]
         )
 
+
+def test_path_follows_modifications():
+    red = RedBaron("a = [1, 2, 3]\nb = 4\n")
+    three = red[0].value.value[2]
+    assert three.path().to_baron_path() == [0, "value", "value", 4]
+    red[0].value.value.insert(0, "0")
+    assert three.path().to_baron_path() == [0, "value", "value", 6]
+    red.insert(0, "c = 5")
+    assert three.path().to_baron_path() == [2, "value", "value", 6]
+
+
+def test_path_of_node_list_does_not_search(red, monkeypatch):
+    node_list = red.def_.value.node_list
+    monkeypatch.setattr("redbaron.base_nodes.Node.find_iter", None)
+    monkeypatch.setattr("redbaron.base_nodes.NodeList.find_iter", None)
+    assert node_list.path().to_baron_path() == [0, "value"]
+    assert node_list[1].value.first.path().to_baron_path() == [0, "value", 1, "value", "first"]
+
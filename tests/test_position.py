@@ -66,3 +66,26 @@ def test_find_by_position(position_fixture):
 def test_path_str():
     red = RedBaron("name")
     assert str(Path(red[0]))
+
+
+def test_find_by_position_uses_the_index(monkeypatch):
+    red = RedBaron("a = 1\nb = 2\n")
+    red.find_by_position((1, 1))
+    monkeypatch.setattr("baron.path.position_to_path", None)
+    monkeypatch.setattr("baron.path.path_to_bounding_box", None)
+    assert red.find_by_position((2, 1)) is red[1].target
+    assert red.find_by_position((2, 7)) is red
+    assert red.at(2) is red[1]
+    assert red[1].absolute_bounding_box == ((2, 1), (2, 5))
+
+
+def test_find_by_position_after_modification():
+    red = RedBaron("a = 1\nb = 2\n")
+    assert red.find_by_position((2, 1)) is red[1].target
+    red[0].value = "[\n    1,\n]"
+    assert red.find_by_position((2, 5)) is red[0].value.value[0]
+    assert red.find_by_position((4, 1)) is red[1].target
+    assert red[1].absolute_bounding_box == ((4, 1), (4, 5))
+    red[1].target.value = "long_name"
+    assert red.find_by_position((4, 9)) is red[1].target
+    assert red.find_by_position((4, 13)) is red[1].value
@@ -1226,3 +1226,64 @@ def test_regression_first_method_of_a_class_decorators_append():
     red = RedBaron("class A:\n    def foo():\n        pass")
     red.def_.decorators.append("@staticmethod")
     assert red.dumps() == "class A:\n    @staticmethod\n    def foo():\n        pass\n"
+
+
+def test_comma_proxy_list_batch():
+    red = RedBaron("[1, 2, 3]")
+    comma_proxy_list = red[0].value
+    with comma_proxy_list.batch() as batch:
+        assert batch is comma_proxy_list
+        for i in range(4, 7):
+            comma_proxy_list.append(str(i))
+        del comma_proxy_list[0]
+        comma_proxy_list[0] = "a"
+        assert len(comma_proxy_list) == 5
+        assert red.dumps() == "[1, 2, 3]"
+    assert red.dumps() == "[a, 3, 4, 5, 6]"
+    assert len(comma_proxy_list.node_list) == 9
+
+
+def test_line_proxy_list_batch():
+    red = RedBaron("def a():\n    pass\n")
+    line_proxy_list = red[0].value
+    with line_proxy_list.batch():
+        line_proxy_list.append("b")
+        line_proxy_list.insert(0, "c")
+    assert red.dumps() == "def a():\n    c\n    pass\n    b\n"
+
+
+def test_proxy_list_batch_nested():
+    red = RedBaron("[1]")
+    comma_proxy_list = red[0].value
+    with comma_proxy_list.batch():
+        with comma_proxy_list.batch():
+            comma_proxy_list.append("2")
+        assert red.dumps() == "[1]"
+        comma_proxy_list.append("3")
+    assert red.dumps() == "[1, 2, 3]"
+
+
+def test_proxy_list_batch_synchronise_on_exception():
+    red = RedBaron("[1]")
+    comma_proxy_list = red[0].value
+    try:
+        with comma_proxy_list.batch():
+            comma_proxy_list.append("2")
+            raise ValueError()
+    except ValueError:
+        pass
+    assert red.dumps() == "[1, 2]"
+    comma_proxy_list.append("3")
+    assert red.dumps() == "[1, 2, 3]"
+
+
+def test_comma_proxy_list_bulk_insert():
+    red = RedBaron("[1, 2, 3]")
+    red[0].value.bulk_insert([(0, "a"), (2, "b"), (0, "c"), (3, "d"), (-1, "e")])
+    assert red.dumps() == "[a, c, 1, 2, b, e, 3, d]"
+
+
+def test_root_as_line_proxy_list_bulk_insert():
+    red = RedBaron("a\nb\n")
+    red.bulk_insert([(2, "d"), (1, "c")])
+    assert red.dumps() == "a\nc\nb\nd\n"
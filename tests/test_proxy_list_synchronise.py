@@ -0,0 +1,127 @@
+#!/usr/bin/python
+# -*- coding:Utf-8 -*-
+
+""" Tests that the partial synchronisation of the proxy lists gives the same
+result than regenerating the whole list """
+
+import pytest
+
+from redbaron import RedBaron
+
+
+def modifications():
+    return [
+        lambda x: x.append("z"),
+        lambda x: x.insert(0, "z"),
+        lambda x: x.insert(1, "z"),
+        lambda x: x.insert(-1, "z"),
+        lambda x: x.insert(100, "z"),
+        lambda x: x.extend(["y", "z"]),
+        lambda x: x.pop(),
+        lambda x: x.pop(0),
+        lambda x: x.pop(1),
+        lambda x: x.pop(-2),
+        lambda x: x.__delitem__(1),
+        lambda x: x.__delitem__(slice(1, 3)),
+        lambda x: x.__delitem__(slice(-2, None)),
+        lambda x: x.__setitem__(1, "z"),
+        lambda x: x.__setitem__(-1, "z"),
+        lambda x: x.__setitem__(slice(1, 2), ["y", "z"]),
+        lambda x: x.__setitem__(slice(1, 3), []),
+        lambda x: x.__setitem__(slice(2, None), ["z"]),
+        lambda x: x.remove(x[1]),
+    ]
+
+
+def lists():
+    return [
+        ("f(a, b, c)\n", lambda red: red.find("call").value),
+        ("[1, 2, 3, 4]\n", lambda red: red[0].value),
+        ("[1, 2, 3,]\n", lambda red: red[0].value),
+        ("{a, b, c}\n", lambda red: red[0].value),
+        ("def f(a, b=2, *c): pass\n", lambda red: red[0].arguments),
+        ("from m import a, b, c\n", lambda red: red[0].targets),
+        ("x = 1, 2, 3\n", lambda red: red[0].value.value),
+        ("a.b.c.d.e\n", lambda red: red[0].value),
+        ("a.b(1).c[2].d\n", lambda red: red[0].value),
+        ("a(1)[2].b(3)\n", lambda red: red[0].value),
+        ("def f():\n    a\n    b\n    c\n", lambda red: red[0].value),
+    ]
+
+
+def state(red, proxy_list):
+    return (red.dumps(),
+            [x.type for x in proxy_list.node_list],
+            [(x.type, [y.type for y in formatting]) for x, formatting in proxy_list.data])
+
+
+def modify(source, get_list, modification, full):
+    red = RedBaron(source)
+    proxy_list = get_list(red)
+    if full:
+        proxy_list._synchronisation_window = lambda start, stop: None
+
+    modification(proxy_list)
+    # and one more to work on the result of the first one
+    proxy_list.insert(1, "w")
+    return state(red, proxy_list)
+
+
+@pytest.mark.parametrize("source,get_list", lists())
+def test_partial_synchronise_like_full_synchronise(source, get_list):
+    for modification in modifications():
+        assert modify(source, get_list, modification, full=False) == modify(source, get_list, modification, full=True)
+
+
+def test_partial_synchronise_successive_appends():
+    red = RedBaron("f(a)\n")
+    arguments = red.find("call").value
+    for i in range(10):
+        arguments.append("b%s" % i)
+    assert red.dumps() == "f(a, %s)\n" % ", ".join("b%s" % i for i in range(10))
+    assert len(arguments.node_list) == 21
+    assert arguments.index(arguments[5]) == 5
+
+
+def test_partial_synchronise_keeps_type_index():
+    red = RedBaron("f(a, b, c)\n")
+    red.enable_type_index()
+    arguments = red.find("call").value
+    arguments.insert(1, "[x]")
+    arguments.pop(2)
+    assert red.find_all("list")[0] is arguments[1].value
+    assert [x.value for x in red.find_all("name")] == ["f", "a", "x", "c"]
+
+
+def test_partial_synchronise_pop_negative_index():
+    red = RedBaron("f(a, b, c, d)\n")
+    arguments = red.find("call").value
+    synchronised = []
+    synchronise = arguments._synchronise
+    arguments._synchronise = lambda start, stop: synchronised.append((start, stop)) or synchronise(start, stop)
+
+    arguments.pop(-2)
+    arguments.pop()
+    arguments.pop(-1)
+    assert synchronised == [(2, 2), (2, 2), (1, 1)]
+    assert red.dumps() == "f(a)\n"
+
+    with pytest.raises(IndexError):
+        arguments.pop(-5)
+
+
+@pytest.mark.parametrize("index", [-4, -6, 3, 10])
+def test_pop_index_out_of_range(index):
+    red = RedBaron("f(a, b, c)\n")
+    arguments = red.find("call").value
+    with pytest.raises(IndexError):
+        arguments.pop(index)
+    assert red.dumps() == "f(a, b, c)\n"
+    assert len(arguments) == 3
+
+
+def test_pop_index_out_of_range_on_root():
+    red = RedBaron("a = 1\nb = 2\n")
+    with pytest.raises(IndexError):
+        red.pop(-3)
+    assert red.dumps() == "a = 1\nb = 2\n"
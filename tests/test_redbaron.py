@@ -3,6 +3,11 @@
 
 """ Main redbaron test module """
 
+import os
+import subprocess
+import sys
+
+import pytest
 from redbaron import RedBaron, truncate
 
 
@@ -36,3 +41,136 @@ def test_truncate():
     assert "1...6" == truncate("123456", 5)
     assert "123456...0" == truncate("12345678901234567890", 10)
 
+
+REPARSE_SOURCE = """\
+import os
+
+def f(a):
+    return a
+
+x = 1
+class A:
+    pass
+"""
+
+
+def test_reparse_keeps_untouched_statements():
+    red = RedBaron(REPARSE_SOURCE)
+    import_, function, class_ = red.find("import"), red.find("def"), red.find("class")
+    red.reparse(REPARSE_SOURCE.replace("x = 1", "x = [1,\n     2]"))
+    assert red.dumps() == REPARSE_SOURCE.replace("x = 1", "x = [1,\n     2]")
+    assert red.find("import") is import_
+    assert red.find("def") is function
+    assert red.find("class") is class_
+    assert red.find("assignment").value.dumps() == "[1,\n     2]"
+    assert red.find("assignment").parent is red
+    assert red.fst() == RedBaron(red.dumps()).fst()
+
+
+def test_reparse_inside_a_function():
+    red = RedBaron(REPARSE_SOURCE)
+    x = red.find("assignment")
+    red.reparse(REPARSE_SOURCE.replace("return a", "return a + 1\n# done"))
+    assert red.find("def").value.dumps() == "\n    return a + 1\n# done\n\n"
+    assert red.find("assignment") is x
+    assert red.find_by_position((4, 16)) is red.find("int")
+    assert red.fst() == RedBaron(red.dumps()).fst()
+
+
+def test_reparse_needing_the_whole_code():
+    red = RedBaron(REPARSE_SOURCE)
+    red.reparse(REPARSE_SOURCE.replace("x = 1", "x = '''").replace("pass", "pass'''"))
+    assert red.find("assignment").value.type == "string"
+    assert red.find("class") is None
+
+
+def test_reparse_print_function():
+    # print(..., file=...) makes baron parse every print of the module as a
+    # function
+    source = "def f():\n    print(a)\n\ndef g():\n    print(b, file=c)\n"
+    red = RedBaron(source)
+    red.reparse(source.replace("print(a)", "print(a + 1)"))
+    assert red.find("print") is None
+    red.reparse(source.replace("print(b, file=c)", "pass"))
+    assert red.find("print") is not None
+    assert red.fst() == RedBaron(source.replace("print(b, file=c)", "pass")).fst()
+
+
+def test_reparse_invalid_code():
+    red = RedBaron(REPARSE_SOURCE)
+    with pytest.raises(Exception):
+        red.reparse(REPARSE_SOURCE.replace("x = 1", "x = (1"))
+    with pytest.raises(Exception):
+        red.reparse(REPARSE_SOURCE.replace("x = 1", "if x:\n"))
+    assert red.dumps() == REPARSE_SOURCE
+
+
+LAZY_SOURCE = """\
+import os
+
+class A(object):
+    def f(self, a):
+        return a + 1  # one
+
+def g(b=None):
+    if b:
+        return [b]
+"""
+
+
+def test_lazy_bodies_are_built_on_access():
+    red = RedBaron(LAZY_SOURCE, lazy=True)
+    def_node = red.find("def", "g")
+    assert def_node._unmaterialized("value") is not None
+    assert red.dumps() == LAZY_SOURCE
+    assert red.fst() == RedBaron(LAZY_SOURCE).fst()
+    assert def_node._unmaterialized("value") is not None
+
+    assert def_node.value[0].type == "ifelseblock"
+    assert def_node._unmaterialized("value") is None
+    assert def_node.value.parent is def_node
+    assert def_node.value[0].parent is def_node
+
+
+def test_lazy_find_only_builds_the_bodies_that_can_match():
+    red = RedBaron(LAZY_SOURCE, lazy=True)
+    assert red.find("import").dumps() == "import os"
+    assert red.find("class")._unmaterialized("value") is not None
+    assert red.find("def", "g")._unmaterialized("value") is not None
+
+    # every body can hold a return: the class, its method and g are built
+    assert [x.dumps() for x in red.find_all("return")] == ["return a + 1", "return [b]"]
+    assert red.find("class")._unmaterialized("value") is None
+    assert red.find("def", "f")._unmaterialized("value") is None
+    assert red.find("def", "g")._unmaterialized("value") is None
+    assert red.find("list").dumps() == "[b]"
+
+
+def test_lazy_modifications():
+    red = RedBaron(LAZY_SOURCE, lazy=True)
+    eager = RedBaron(LAZY_SOURCE)
+    for tree in (red, eager):
+        copy = tree.find("def", "g").copy()
+        tree.find("class").replace(copy)
+        tree.find("def").value.append("return 42")
+        tree.find("name", "b").value = "c"
+    assert red.dumps() == eager.dumps()
+    assert red.fst() == eager.fst()
+
+
+COMPACT_NODES_SCRIPT = """
+from redbaron import RedBaron
+red = RedBaron("def f(a, b):\\n    return a.b\\n")
+assert not hasattr(red.find("name"), "__dict__")
+red.find("return").value = "c"
+red.find("def").arguments.append("d")
+red.find("name", "c").replace("d + 1")
+red.find("def").value.append("pass")
+print(red.dumps())
+"""
+
+
+def test_compact_nodes():
+    env = dict(os.environ, REDBARON_COMPACT_NODES="1")
+    output = subprocess.check_output([sys.executable, "-W", "ignore", "-c", COMPACT_NODES_SCRIPT], env=env)
+    assert output.decode("Utf-8") == "def f(a, b, d):\n    return d + 1\n    pass\n\n"
@@ -3,8 +3,16 @@
 
 """ Tests the rendering feature """
 
+import pytest
+import baron
+
 from redbaron import RedBaron
 
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
 
 def test_rendering_iter():
     red = RedBaron("a + 2")
@@ -78,3 +86,149 @@ def a():
 def test_next_rendered_trapped():
     red = RedBaron(test_indent_code)
     assert red("endl")[5].next_rendered is red.find("name", "pouf")
+
+
+def test_rendered_neighbours_like_a_walk_of_the_parent():
+    red = RedBaron(test_indent_code + "b = (z * 4)\nc = [1]\n")
+    for node in red.find_all(lambda x: True):
+        assert node.next_rendered is node._next_rendered_by_walk()
+        assert node.previous_rendered is node._previous_rendered_by_walk()
+
+
+def test_rendered_neighbours_after_modification():
+    red = RedBaron("a = 1\nb = 2\n")
+    red.insert(1, "def f():\n    pass\n")
+    assert red.find("def").previous_rendered is red.find("endl")
+    assert red.find("pass").indentation == "    "
+    assert red[2].previous_rendered.next_rendered is red[2]
+
+
+def test_dumps_is_cached():
+    red = RedBaron("a = 1\nb = 2\n")
+    assert red[0].dumps() is red[0].dumps()
+    assert red.dumps() is red.dumps()
+    assert red[0].fst() is red[0].fst()
+
+
+def test_dumps_cache_invalidated_by_setattr():
+    red = RedBaron("def f():\n    return a + 1\n")
+    red.dumps()
+    red.find("return").dumps()
+    red.find("int").value = "2"
+    assert red.find("return").dumps() == "return a + 2"
+    assert red.dumps() == "def f():\n    return a + 2\n"
+    assert red.find("binary_operator").fst()["second"]["value"] == "2"
+
+
+def test_dumps_cache_invalidated_by_proxy_list():
+    red = RedBaron("a = [1, 2]\n")
+    red.dumps()
+    red.find("list").value.append("3")
+    assert red.dumps() == "a = [1, 2, 3]\n"
+    del red.find("list").value[0]
+    assert red.dumps() == "a = [2, 3]\n"
+    red.append("b = 4")
+    assert red.dumps() == "a = [2, 3]\nb = 4\n"
+
+
+def test_dumps_cache_invalidated_by_node_list():
+    red = RedBaron("a(b, c)\n")
+    red.dumps()
+    red.find("call").value.node_list.pop()
+    red.find("call").value.node_list.pop()
+    assert red.dumps() == "a(b)\n"
+
+
+def test_dumps_cache_of_inner_node_list_invalidated():
+    red = RedBaron("def f():\n    a = 1\n")
+    red[0].value.dumps()
+    red[0].value.node_list.fst()
+    red.find("int").value = "5"
+    assert red[0].value.dumps() == "\n    a = 5\n"
+    assert red[0].value.node_list.fst()[1]["value"]["value"] == "5"
+
+    red = RedBaron("f(a, b)\n")
+    node_list = red.find("call").value.node_list
+    node_list.dumps()
+    node_list.fst()
+    red.find("name", "b").value = "c"
+    assert node_list.dumps() == "a, c"
+    assert node_list.fst()[-1]["value"]["value"] == "c"
+
+
+def test_dumps_cache_invalidated_for_imports():
+    red = RedBaron("from a.b import c, d\nimport x.y\n")
+    assert red[0].full_path_modules() == ["a.b.c", "a.b.d"]
+    assert red[1].modules() == ["x.y"]
+    red[0].targets[0].value = "k"
+    red.find("name", "y").value = "w"
+    assert red[0].full_path_modules() == ["a.b.k", "a.b.d"]
+    assert red[0].names() == ["k", "d"]
+    assert red[1].modules() == ["x.w"]
+
+
+def test_dumps_cache_invalidated_by_replace():
+    red = RedBaron("a = b\n")
+    red.dumps()
+    red.find("name", "b").replace("c + d")
+    assert red.dumps() == "a = c + d\n"
+
+
+def test_dumps_renders_like_baron():
+    source = ("@decorator(a)\n"
+              "def f(a, b=1, *args, **kwargs) -> int:\n"
+              "    return a[1:2:3], a[::], not b, lambda: (yield)\n\n"
+              "class A(B, metaclass=C):\n"
+              "    '''doc'''\n"
+              "    x: int = 1\n"
+              "    try:\n"
+              "        pass\n"
+              "    except (A, B) as e:\n"
+              "        raise C from e\n"
+              "    finally:\n"
+              "        print(f'{a!r}', *b, sep='')\n")
+    red = RedBaron(source)
+    assert red.dumps() == source
+    for node in red.find_all(lambda x: True):
+        assert node.dumps() == baron.dumps(node.fst())
+
+
+def test_dump_to_file_object():
+    red = RedBaron("a = 1\nb = [1, 2]\n")
+    output = StringIO()
+    red.dump_to(output)
+    assert output.getvalue() == "a = 1\nb = [1, 2]\n"
+
+    output = StringIO()
+    red[1].value.dump_to(output, chunk_size=1)
+    assert output.getvalue() == "[1, 2]"
+
+
+def test_dump_to_path(tmpdir):
+    red = RedBaron("a = 1\n")
+    path = str(tmpdir.join("a.py"))
+    red.dump_to(path)
+    assert open(path).read() == "a = 1\n"
+
+    red[0].value = "2"
+    red.dump_to(path, atomic=True)
+    assert open(path).read() == "a = 2\n"
+    assert tmpdir.listdir() == [tmpdir.join("a.py")]
+
+
+def test_dump_to_atomic_keeps_target_on_error(tmpdir):
+    red = RedBaron("a = 1\n")
+    path = tmpdir.join("a.py")
+    path.write("old content")
+    red[0].value.value = 1  # an int can't be rendered
+
+    with pytest.raises(TypeError):
+        red.dump_to(str(path), atomic=True)
+
+    assert path.read() == "old content"
+    assert tmpdir.listdir() == [path]
+
+
+def test_dump_to_atomic_needs_a_path():
+    with pytest.raises(ValueError):
+        RedBaron("a = 1\n").dump_to(StringIO(), atomic=True)
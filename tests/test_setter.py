@@ -2053,3 +2053,79 @@ def test_ifelseblock_setattr_indented_followed():
     red = RedBaron("def a():\n    if a:\n        pass\n\n\n    pouet\n")
     red[0].value.node_list[1].value = "if 1 + 1:\n    qsd\n"
     assert red.dumps() == "def a():\n    if 1 + 1:\n        qsd\n\n    pouet\n"
+
+
+def test_bulk_setattr():
+    from redbaron import bulk_setattr
+    red = RedBaron("a = 1\nb = 2\ndef c(x):\n    d = 3\n")
+    bulk_setattr([(red[0], "value", "None"), (red[1], "target", "e"), (red.find("def"), "arguments", "self, y")])
+    assert red.dumps() == "a = None\ne = 2\ndef c(self, y):\n    d = 3\n"
+
+
+def test_bulk_setattr_parses_each_fragment_once(monkeypatch):
+    import baron
+    from redbaron import bulk_setattr, fragment_cache
+    red = RedBaron("def a():\n    x = 1\n    def b():\n        y = 2\n")
+    monkeypatch.setattr(fragment_cache, "maxsize", 0)
+
+    parsed = []
+
+    def parse(source):
+        parsed.append(source)
+        return original_parse(source)
+
+    original_parse = baron.parse
+    monkeypatch.setattr(baron, "parse", parse)
+
+    bulk_setattr([(x, "value", "None") for x in red.find_all("assignment")]
+                 + [(x, "decorators", "@staticmethod") for x in red.find_all("def")])
+    assert len(parsed) == len(set(parsed)) == 2
+    # each node gets its own fst, modified by the decorators to its indentation
+    assert red.dumps() == "@staticmethod\ndef a():\n    x = None\n    @staticmethod\n    def b():\n        y = None\n"
+    first, second = red.find_all("assignment")
+    assert first.value is not second.value
+
+
+def test_fragment_cache(monkeypatch):
+    from redbaron import FragmentCache
+    from redbaron import base_nodes
+    cache = FragmentCache(2)
+    monkeypatch.setattr(base_nodes, "fragment_cache", cache)
+
+    red = RedBaron("a = 1\nb = 2\nc = 3\n")
+    red[0].value = "x"
+    red[1].value = "x"
+    red[2].value = "y"
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+    assert red.dumps() == "a = x\nb = x\nc = y\n"
+    assert red[0].value is not red[1].value
+    red[0].value.value = "z"
+    assert red.dumps() == "a = z\nb = x\nc = y\n"
+
+    # the least recently used one is dropped
+    red[0].value = "x"
+    red[1].value = "w"
+    red[2].value = "y"
+    assert (cache.hits, cache.misses, len(cache)) == (2, 4, 2)
+
+    cache.resize(0)
+    red[0].value = "x"
+    assert (cache.hits, cache.misses, len(cache)) == (2, 4, 0)
+    assert red.dumps() == "a = x\nb = w\nc = y\n"
+
+
+def test_fragment_cache_skips_long_fragments(monkeypatch):
+    from redbaron import FragmentCache
+    from redbaron import base_nodes
+    cache = FragmentCache(2, max_length=20)
+    monkeypatch.setattr(base_nodes, "fragment_cache", cache)
+
+    red = RedBaron("def f():\n    pass\n")
+    body = "\n".join("a%d = %d" % (x, x) for x in range(5))
+    red[0].value = body
+    red[0].value = body
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+    assert red.dumps() == "def f():\n%s\n" % "\n".join("    a%d = %d" % (x, x) for x in range(5))
+
+    red[0].value[0].value = "x"
+    assert (cache.hits, cache.misses, len(cache)) == (0, 1, 1)
@@ -0,0 +1,96 @@
+#!/usr/bin/python
+# -*- coding:Utf-8 -*-
+
+""" Tests the type index of the root """
+
+from redbaron import RedBaron
+
+
+code = """\
+def a(x):
+    return x + 1
+
+
+class B(object):
+    def c(self):
+        return [a(y) for y in z]
+
+d = a(2)
+"""
+
+
+def assert_same_as_without_index(red, *args, **kwargs):
+    type_index = red.node_list._type_index
+    assert type_index is not None
+
+    with_index = red.find_all(*args, **kwargs)
+    red.disable_type_index()
+    without_index = red.find_all(*args, **kwargs)
+    red.node_list._type_index = type_index
+
+    assert [id(x) for x in with_index] == [id(x) for x in without_index]
+    return with_index
+
+
+def test_type_index_find_all():
+    red = RedBaron(code)
+    red.enable_type_index()
+    assert len(assert_same_as_without_index(red, "def")) == 2
+    assert len(assert_same_as_without_index(red, "name")) == 10
+    assert len(assert_same_as_without_index(red, "DefNode")) == 2
+    assert len(assert_same_as_without_index(red, "name", "a")) == 2
+    assert len(assert_same_as_without_index(red, "call", value=lambda x: len(x) == 1)) == 2
+    assert red.find("return") is red.find("def").value[0]
+    assert red.find("yield") is None
+
+
+def test_type_index_not_used_for_patterns():
+    red = RedBaron(code)
+    red.enable_type_index()
+    assert red.node_list._type_index.candidates("re:de.") is None
+    assert red.node_list._type_index.candidates("g:d*") is None
+    assert red.node_list._type_index.candidates(["def", "class"]) is None
+    assert len(assert_same_as_without_index(red, "re:def")) == 4
+
+
+def test_type_index_follows_modifications():
+    red = RedBaron(code)
+    red.enable_type_index()
+
+    red.find("def").value.append("yield x")
+    assert len(assert_same_as_without_index(red, "yield")) == 1
+
+    red.find("class").value[0].name = "e"
+    red.find("list_comprehension").replace("f(x)")
+    assert len(assert_same_as_without_index(red, "list_comprehension")) == 0
+    assert len(assert_same_as_without_index(red, "call")) == 2
+
+    red[-1].value = "lambda: 4"
+    assert len(assert_same_as_without_index(red, "lambda")) == 1
+
+    del red[0]
+    assert len(assert_same_as_without_index(red, "yield")) == 0
+    assert len(assert_same_as_without_index(red, "def")) == 1
+
+    red.insert(0, "def g(): pass")
+    red.append("del g")
+    assert len(assert_same_as_without_index(red, "def")) == 2
+    assert len(assert_same_as_without_index(red, "endl")) == len(red.find_all("endl"))
+
+
+def test_type_index_keeps_lazy_bodies_unbuilt():
+    red = RedBaron(code, lazy=True)
+    red.enable_type_index()
+    a, b = red[0], red.find("class")
+    assert a._unmaterialized("value") is not None
+    assert b._unmaterialized("value") is not None
+
+    # only the bodies that can hold a list comprehension are built
+    assert len(assert_same_as_without_index(red, "list_comprehension")) == 1
+    assert a._unmaterialized("value") is not None
+    assert b._unmaterialized("value") is None
+
+    # a body built by an access is indexed
+    assert a.value[0].type == "return"
+    assert len(assert_same_as_without_index(red, "binary_operator")) == 1
+    assert len(assert_same_as_without_index(red, "name")) == 10
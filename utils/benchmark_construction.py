@@ -0,0 +1,52 @@
+"""
+Compare the time spent by baron to parse a module with the time spent by
+RedBaron to build its tree on top of the resulting FST.
+
+Usage: python benchmark_construction.py [file.py ...]
+
+Without arguments, redbaron's own sources are used, repeated to get a large
+module.
+"""
+
+import os
+import sys
+import time
+
+import baron
+
+from redbaron.base_nodes import NodeList
+
+
+def load_source(paths):
+    if not paths:
+        here = os.path.dirname(os.path.abspath(__file__))
+        package = os.path.join(here, "..", "redbaron")
+        paths = [os.path.join(package, x) for x in ("base_nodes.py", "nodes.py")] * 3
+
+    return "".join(open(path, "r").read() for path in paths)
+
+
+def best_of(function, times=3):
+    timings = []
+    for _ in range(times):
+        start = time.time()
+        function()
+        timings.append(time.time() - start)
+    return min(timings)
+
+
+def main(paths):
+    source = load_source(paths)
+    fst = baron.parse(source)
+
+    parse_time = best_of(lambda: baron.parse(source), times=1)
+    build_time = best_of(lambda: NodeList.from_fst(fst))
+
+    print("lines:            %d" % len(source.split("\n")))
+    print("baron.parse:      %.3fs" % parse_time)
+    print("tree construction: %.3fs" % build_time)
+    print("construction/parse: %.2f" % (build_time / parse_time))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
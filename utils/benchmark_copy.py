@@ -0,0 +1,60 @@
+"""
+Time .copy() of a big function body against the round trip through the fst
+that it used to do (Node.from_fst(node.fst())), without the rendering caches
+(so .fst() has to be computed) and with them.
+
+Usage: python benchmark_copy.py [number of lines]
+"""
+
+import gc
+import sys
+import time
+
+from redbaron import RedBaron, Node, NodeList
+
+
+LINES = """\
+    x%(i)d = f(a, b[%(i)d], c="s")  # comment
+    if x%(i)d:
+        y.z(x%(i)d, 1 + 2)
+"""
+
+
+def best_time(function, before=None, repeat=9):
+    durations = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        gc.collect()
+        gc.disable()
+        start = time.time()
+        function()
+        durations.append(time.time() - start)
+        gc.enable()
+    return min(durations)
+
+
+def main(lines=1000):
+    red = RedBaron("def f():\n" + "".join(LINES % {"i": i} for i in range(lines // 3)))
+    body = red[0].value
+    nodes = list(red.node_list.find_iter(lambda x: True))
+
+    def clear_caches():
+        for node in nodes:
+            node._invalidate_render_cache()
+
+    def through_fst():
+        return NodeList([Node.from_fst(x) for x in body.node_list.fst()])
+
+    assert through_fst().dumps() == body.copy().dumps() == body.dumps()
+
+    print("lines:                     %d" % len(red.dumps().split("\n")))
+    print("through the fst, no cache: %.3fs" % best_time(through_fst, clear_caches))
+    print("copy(), no cache:          %.3fs" % best_time(body.copy, clear_caches))
+    red.dumps()
+    print("through the fst, cached:   %.3fs" % best_time(through_fst))
+    print("copy(), cached:            %.3fs" % best_time(body.copy))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
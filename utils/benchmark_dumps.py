@@ -0,0 +1,58 @@
+"""
+Compare rendering a RedBaron tree by going through the fst with
+baron.dumps(red.fst()) to the direct rendering of red.dumps(), in time and
+in peak memory.
+
+Usage: python benchmark_dumps.py [file.py ...]
+
+Without arguments, redbaron's own sources are used, repeated to get a large
+module.
+"""
+
+import sys
+import time
+import tracemalloc
+
+import baron
+
+from redbaron import RedBaron
+from benchmark_memory import load_source
+
+
+def clear_caches(red):
+    # rendering results are cached, start from a cold tree every time
+    for node in red.node_list.find_iter(lambda x: True):
+        node._invalidate_render_cache()
+
+
+def measure(red, function):
+    clear_caches(red)
+    start = time.time()
+    result = function()
+    duration = time.time() - start
+
+    clear_caches(red)
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return result, duration, peak
+
+
+def main(paths):
+    source = load_source(paths)
+    red = RedBaron(source)
+
+    through_fst, fst_time, fst_peak = measure(red, lambda: baron.dumps(red.fst()))
+    direct, direct_time, direct_peak = measure(red, red.dumps)
+
+    assert through_fst == direct == source
+
+    print("lines:             %d" % len(source.split("\n")))
+    print("baron.dumps(fst):  %.3fs, peak %.1f MB" % (fst_time, fst_peak / 1024.0 / 1024))
+    print("direct rendering:  %.3fs, peak %.1f MB" % (direct_time, direct_peak / 1024.0 / 1024))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,84 @@
+"""
+Time find_all() on large trees:
+
+* with queries given as arguments, compiled again at every call, and with the
+  same queries compiled once in a redbaron.Query reused for every call
+* for rare node types, the first search (that computes the summaries of the
+  node types present in each subtree) and the next ones (that skip the
+  subtrees that can't contain a match)
+
+Usage: python benchmark_find.py [file.py ...]
+
+Without arguments, redbaron's own sources are used, repeated to get a large
+module. Give a list of real-world modules (the standard library for example)
+to measure on a corpus, each file is parsed in its own tree.
+"""
+
+import sys
+import time
+
+from redbaron import RedBaron, Query
+from benchmark_memory import load_source
+
+
+QUERIES = [
+    (("def",), {}),
+    (("name", "re:^_"), {}),
+    (("call",), {"value": lambda x: len(x) > 2}),
+    (("g:*assign*",), {}),
+    (("string",), {"value": "g:*node*"}),
+]
+
+RARE_QUERIES = ["yield_from", "global", "lambda", "with"]
+
+
+def load_trees(paths):
+    if not paths:
+        return [RedBaron(load_source(paths))]
+
+    trees = []
+    for path in paths:
+        try:
+            trees.append(RedBaron(open(path, "r").read()))
+        except Exception:
+            # baron doesn't handle every syntax
+            continue
+    return trees
+
+
+def run(trees, queries, repeat=1):
+    """
+    Return the number of matches of each query, (args, kwargs) couples, in
+    all the trees and the time spent.
+    """
+    start = time.time()
+    for _ in range(repeat):
+        found = [sum(len(red.find_all(*args, **kwargs)) for red in trees) for args, kwargs in queries]
+    return found, time.time() - start
+
+
+def main(paths, repeat=3):
+    trees = load_trees(paths)
+
+    rare_queries = [((x,), {}) for x in RARE_QUERIES]
+    rare, cold_time = run(trees, rare_queries)
+    _, warm_time = run(trees, rare_queries)
+
+    found, arguments_time = run(trees, QUERIES, repeat)
+
+    compiled_queries = [((Query(*args, **kwargs),), {}) for args, kwargs in QUERIES]
+    compiled_found, compiled_time = run(trees, compiled_queries, repeat)
+
+    assert found == compiled_found
+
+    print("trees:                    %d" % len(trees))
+    print("matches:                  %s" % found)
+    print("arguments:                %.3fs" % arguments_time)
+    print("compiled Query:           %.3fs" % compiled_time)
+    print("rare matches:             %s" % rare)
+    print("rare, first search:       %.3fs" % cold_time)
+    print("rare, next searches:      %.3fs" % warm_time)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
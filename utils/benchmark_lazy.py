@@ -0,0 +1,58 @@
+"""
+Time a tool that only looks at the imports of a large module and rewrites
+one line: parse, find_all("import"), modify the first import, dumps(). With
+RedBaron(source) and with RedBaron(source, lazy=True) where the bodies of the
+functions and classes are only built if they are accessed. The parse by
+baron is done once, outside of the timings.
+
+Usage: python benchmark_lazy.py [file.py ...]
+
+Without arguments, redbaron's own sources are used, repeated to get a large
+module.
+"""
+
+import gc
+import sys
+import time
+
+import baron
+
+from redbaron import RedBaron
+from benchmark_memory import load_source
+
+
+def build(source, fst, lazy):
+    # RedBaron() parses the code, it is given the fst already parsed instead
+    original_parse = baron.parse
+    baron.parse = lambda source_code: fst
+    try:
+        return RedBaron(source, lazy=lazy)
+    finally:
+        baron.parse = original_parse
+
+
+def rewrite_an_import(red):
+    imports = red.find_all("import")
+    imports[0].value = "os, re"
+    return len(imports), red.dumps()
+
+
+def main(paths):
+    source = load_source(paths)
+    fst = baron.parse(source)
+    print("%d lines" % len(source.split("\n")))
+
+    results = []
+    for lazy in (False, True):
+        gc.collect()
+        gc.disable()
+        start = time.time()
+        results.append(rewrite_an_import(build(source, fst, lazy)))
+        print("lazy=%-5s %d imports, %.3fs" % (lazy, results[-1][0], time.time() - start))
+        gc.enable()
+
+    assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,45 @@
+"""
+Time redbaron.load_many() on a list of files with one worker (everything in
+this process) and with one worker per processor: building the trees here
+from the fst sent by the workers, with lazy=True, and running a callback in
+the workers.
+
+Usage: python benchmark_load_many.py [file.py ...]
+
+Without arguments, redbaron's own source files are used, 4 times each.
+"""
+
+import glob
+import multiprocessing
+import os
+import sys
+import time
+
+from redbaron import load_many
+
+
+def count_defs(red):
+    return len(red.find_all("def"))
+
+
+def main(paths):
+    if not paths:
+        here = os.path.dirname(os.path.abspath(__file__))
+        paths = sorted(glob.glob(os.path.join(here, "..", "redbaron", "*.py"))) * 4
+
+    processors = multiprocessing.cpu_count()
+    print("%d files, %d processors" % (len(paths), processors))
+
+    for name, kwargs in (("trees:", {}), ("lazy trees:", {"lazy": True}), ("callback:", {"callback": count_defs})):
+        durations = []
+        for workers in (1, processors):
+            start = time.time()
+            results = load_many(paths, workers=workers, **kwargs)
+            durations.append(time.time() - start)
+        errors = len([x for x in results if x.error is not None])
+        print("%-12s 1 worker %.3fs, %d workers %.3fs (x%.1f), %d errors" % (
+            name, durations[0], processors, durations[1], durations[0] / durations[1], errors))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
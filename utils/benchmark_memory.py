@@ -0,0 +1,50 @@
+"""
+Measure the memory held by a RedBaron tree, in bytes per line of source.
+
+Usage: python benchmark_memory.py [file.py ...]
+
+Without arguments, redbaron's own sources are used, repeated to get a large
+module. Run it a second time with REDBARON_COMPACT_NODES=1 in the environment
+to compare with the compact (__slots__ based) nodes.
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+from redbaron import RedBaron
+from redbaron.private_config import compact_nodes
+
+
+def load_source(paths):
+    if not paths:
+        here = os.path.dirname(os.path.abspath(__file__))
+        package = os.path.join(here, "..", "redbaron")
+        paths = [os.path.join(package, x) for x in ("base_nodes.py", "nodes.py")] * 3
+
+    return "".join(open(path, "r").read() for path in paths)
+
+
+def main(paths):
+    source = load_source(paths)
+    lines = len(source.split("\n"))
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    red = RedBaron(source)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print("compact nodes:  %s" % ("yes" if compact_nodes else "no"))
+    print("lines:          %d" % lines)
+    print("tree size:      %.1f MB" % ((after - before) / 1024.0 / 1024))
+    print("bytes per line: %d" % ((after - before) / lines))
+
+    return red
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
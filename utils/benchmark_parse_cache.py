@@ -0,0 +1,52 @@
+"""
+Time RedBaron(source) on a list of files without redbaron.parse_cache, with
+an empty cache (parse and write the entries) and with a cache holding them
+all (load the entries).
+
+Usage: python benchmark_parse_cache.py [file.py ...]
+
+Without arguments, redbaron's own source files are used.
+"""
+
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from redbaron import RedBaron, parse_cache
+
+
+def build(sources):
+    start = time.time()
+    for source in sources:
+        RedBaron(source)
+    return time.time() - start
+
+
+def main(paths):
+    if not paths:
+        here = os.path.dirname(os.path.abspath(__file__))
+        paths = sorted(glob.glob(os.path.join(here, "..", "redbaron", "*.py")))
+
+    sources = []
+    for path in paths:
+        with open(path, "r") as file_object:
+            sources.append(file_object.read())
+
+    directory = tempfile.mkdtemp()
+    try:
+        parse_cache.configure(None)
+        print("no cache:    %.3fs" % build(sources))
+
+        parse_cache.configure(directory)
+        print("empty cache: %.3fs" % build(sources))
+        print("full cache:  %.3fs" % build(sources))
+        print(parse_cache)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,54 @@
+"""
+Time the lookups of an editor following the cursor in a module: for each
+line, find_by_position() in the middle of the line, the
+absolute_bounding_box of the node found and at(). First on an unmodified
+tree (the positions are indexed once), then with a modification of the tree
+before every lookup (the index is rebuilt every time).
+
+Usage: python benchmark_position.py [number of lines]
+"""
+
+import gc
+import sys
+import time
+
+from redbaron import RedBaron
+
+
+LINES = """\
+def f%(i)d(a, b=%(i)d):
+    x = [a, b, "s"]  # comment
+    return g(x, a + b)
+"""
+
+
+def lookups(red, lines, modify=None):
+    for line in range(1, len(lines)):
+        if modify is not None:
+            modify(red)
+        node = red.find_by_position((line, len(lines[line - 1]) // 2 + 1))
+        if node is not red:
+            node.absolute_bounding_box
+        red.at(line)
+
+
+def rename(red):
+    red[0].name = red[0].name + "_"
+
+
+def main(lines=300):
+    source = "".join(LINES % {"i": i} for i in range(lines // 3))
+    lines = source.split("\n")
+    red = RedBaron(source)
+
+    for name, modify in (("unmodified tree:", None), ("modified tree:", rename)):
+        gc.collect()
+        gc.disable()
+        start = time.time()
+        lookups(red, lines, modify)
+        print("%-17s %d lines, %.3fs" % (name, len(lines), time.time() - start))
+        gc.enable()
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
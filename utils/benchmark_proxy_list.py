@@ -0,0 +1,58 @@
+"""
+Time building a list element by element: with .append() and with the same
+appends done in a proxy_list.batch() block (or with .bulk_insert()), for
+several sizes to see how each one grows.
+
+Usage: python benchmark_proxy_list.py [size ...]
+"""
+
+import sys
+import time
+
+from redbaron import RedBaron
+
+
+CASES = [
+    # (source, path to the proxy list, element to append)
+    ("d = {'start': 0}\n", lambda red: red[0].value.value, lambda i: "'key%d': %d" % (i, i)),
+    ("f(start)\n", lambda red: red.find("call").value, lambda i: "a%d" % i),
+    ("def f():\n    pass\n", lambda red: red[0].value, lambda i: "import module%d" % i),
+]
+
+
+def one_by_one(proxy_list, element, size):
+    for i in range(size):
+        proxy_list.append(element(i))
+
+
+def in_a_batch(proxy_list, element, size):
+    with proxy_list.batch():
+        for i in range(size):
+            proxy_list.append(element(i))
+
+
+def bulk_insert(proxy_list, element, size):
+    proxy_list.bulk_insert((len(proxy_list), element(i)) for i in range(size))
+
+
+def measure(function, source, get_list, element, size):
+    red = RedBaron(source)
+    start = time.time()
+    function(get_list(red), element, size)
+    duration = time.time() - start
+    return red.dumps(), duration
+
+
+def main(sizes):
+    sizes = list(map(int, sizes)) or [250, 500, 1000]
+
+    for source, get_list, element in CASES:
+        print(repr(source))
+        for size in sizes:
+            results = [measure(function, source, get_list, element, size) for function in (one_by_one, in_a_batch, bulk_insert)]
+            assert len(set(result for result, _ in results)) == 1
+            print("  %5d elements: append %.3fs, batch %.3fs, bulk_insert %.3fs" % ((size,) + tuple(duration for _, duration in results)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,47 @@
+"""
+Time RedBaron.reparse() after a one line modification of top level
+functions at several places of a large module, against parsing the whole
+modified module again.
+
+Usage: python benchmark_reparse.py [file.py ...]
+
+Without arguments, redbaron's own sources are used, repeated to get a large
+module.
+"""
+
+import sys
+import time
+
+from redbaron import RedBaron
+from benchmark_memory import load_source
+
+
+def main(paths):
+    source = load_source(paths)
+    lines = source.split("\n")
+    functions = [i for i, line in enumerate(lines) if line.startswith("def ")]
+    red = RedBaron(source)
+    print("%d lines" % len(lines))
+
+    # the first reparse() renders every top level statement, their rendering
+    # is then cached
+    for position in (0.1, 0.1, 0.5, 0.9):
+        # the first line of a top level function gets a comment
+        line = functions[int(len(functions) * position)]
+        modified = "\n".join(lines[:line] + [lines[line] + "  # modified"] + lines[line + 1:])
+
+        start = time.time()
+        red.reparse(modified)
+        reparse = time.time() - start
+        assert red.dumps() == modified
+
+        start = time.time()
+        RedBaron(modified)
+        parse = time.time() - start
+
+        print("line %5d: reparse() %.3fs, RedBaron() %.3fs" % (line + 1, reparse, parse))
+        red.reparse(source)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
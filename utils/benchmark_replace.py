@@ -0,0 +1,63 @@
+"""
+Time bulk .replace() on a large module:
+
+* renaming every name matching a pattern
+* replacing every call of a function by a bigger expression
+* replacing every "self" by a node given as a node
+
+Only the replacements are timed, not the search. They are the same strings
+over and over, so after the first one their parse comes from
+redbaron.fragment_cache and what is measured is the work of .replace()
+itself.
+
+Usage: python benchmark_replace.py [file.py ...]
+
+Without arguments, redbaron's own sources are used, repeated to get a large
+module.
+"""
+
+import gc
+import sys
+import time
+
+from redbaron import RedBaron
+from benchmark_memory import load_source
+
+
+# (description, nodes to replace, replacement)
+REPLACEMENTS = [
+    ("renaming names", lambda red: red.find_all("name", "re:^_"), lambda: "renamed"),
+    ("replacing calls", lambda red: red.find_all("atomtrailers", value=lambda x: x[0].type == "name" and x[0].value == "isinstance"),
+     lambda: "is_instance_of(node, [NodeList, ProxyList], strict=True) and not node.parent"),
+    ("replacing by a node", lambda red: red.find_all("name", "self"), lambda: RedBaron("this.that[0]")[0]),
+]
+
+
+def best_time(source, find, new_node, repeat=3):
+    """
+    Return the number of replaced nodes and the best time to replace them,
+    the search isn't part of it.
+    """
+    durations = []
+    for _ in range(repeat):
+        nodes = find(RedBaron(source))
+        value = new_node()
+        gc.collect()
+        gc.disable()
+        start = time.time()
+        for node in nodes:
+            node.replace(value)
+        durations.append(time.time() - start)
+        gc.enable()
+    return len(nodes), min(durations)
+
+
+def main(paths):
+    source = load_source(paths)
+
+    for name, find, new_node in REPLACEMENTS:
+        print("%-20s %5d nodes, %.3fs" % ((name + ":",) + best_time(source, find, new_node)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])